@@ -28,8 +28,11 @@ from pathlib import Path
 # Add parent directory for imports
 sys.path.insert(0, '/home/mind-protocol/strange-loop')
 
-from dreamer.lenses import LensExplorer, ExplorationResult, Finding
-from dreamer.synthesis import synthesize_context_object, SynthesisResult
+from graph.tools import GraphTools
+from dreamer.lenses import LensExplorer, ExplorationResult, Finding, extract_keywords
+from dreamer.session import WorkingMemory
+from dreamer.cache import UpwellingCache
+from dreamer.synthesis import synthesize_context_object, SynthesisResult, estimate_tokens
 
 
 # ============================================================================
@@ -51,6 +54,9 @@ class Stimulus:
     timestamp: str = ""                  # When (ISO format)
     channel: str = "unknown"             # telegram, cli, system
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Stimulus envelope (docs/schemas/stimulus_envelope.md)
+    session_id: Optional[str] = None     # Conversation the stimulus belongs to
+    last_driver_output: Optional[Dict[str, Any]] = None  # {"content", "timestamp"} of the Driver's last reply
 
     def to_dict(self) -> Dict:
         return {
@@ -58,7 +64,9 @@ class Stimulus:
             "content": self.content,
             "timestamp": self.timestamp or datetime.now().isoformat(),
             "channel": self.channel,
-            "metadata": self.metadata
+            "metadata": self.metadata,
+            "session_id": self.session_id,
+            "last_driver_output": self.last_driver_output
         }
 
 
@@ -84,6 +92,7 @@ class Upwelling:
     lenses_with_data: List[str] = field(default_factory=list)  # Node types that found data
     emotional_tone: str = "neutral"      # Dominant emotional state if found
     tensions_active: List[str] = field(default_factory=list)  # Unresolved contradictions
+    cache_hit: bool = False              # Served from the UpwellingCache (no exploration/synthesis)
 
 
 @dataclass
@@ -122,7 +131,14 @@ class DreamerAgent:
         self,
         port: int = 6380,
         max_tokens: int = 2500,
-        citizen: str = "felix"
+        citizen: str = "felix",
+        tools: GraphTools = None,
+        lens_timeout_ms: Optional[float] = None,
+        total_timeout_ms: Optional[float] = None,
+        speculative: bool = False,
+        follow_threads: bool = False,
+        working_memory: Optional[WorkingMemory] = None,
+        upwelling_cache: Optional[UpwellingCache] = None
     ):
         """
         Initialize the Dreamer.
@@ -131,10 +147,36 @@ class DreamerAgent:
             port: FalkorDB port (6380 for strange-loop)
             max_tokens: Token budget for Context Object
             citizen: Which citizen is dreaming
+            tools: Shared GraphTools, or AsyncGraphTools for dream_async()
+                   (default: GraphTools on the pooled connection for port)
+            lens_timeout_ms: Exploration budget per lens (None = unlimited)
+            total_timeout_ms: Exploration budget per dream (None = unlimited);
+                lenses cut off by either read as not found and are listed
+                in exploration_summary["timed_out"]
+            speculative: Run the technical lens alongside historical
+                (see LensExplorer)
+            follow_threads: Follow findings flagged for deeper exploration
+                (see LensExplorer); follow-ups are listed in
+                exploration_summary["threads"]
+            working_memory: Session working memory: stimuli with a session_id
+                recall what the session's previous turn queried (see
+                dreamer/session.py)
+            upwelling_cache: Serve repeated stimuli (same sender and queries
+                at the same graph version) without dreaming again (see
+                dreamer/cache.py)
         """
-        self.explorer = LensExplorer(port=port)
+        self.explorer = LensExplorer(
+            tools=tools,
+            port=port,
+            lens_timeout_ms=lens_timeout_ms,
+            total_timeout_ms=total_timeout_ms,
+            speculative=speculative,
+            follow_threads=follow_threads,
+            working_memory=working_memory
+        )
         self.max_tokens = max_tokens
         self.citizen = citizen
+        self.upwelling_cache = upwelling_cache
         self.state = DreamerState()
 
     def dream(self, stimulus: Stimulus) -> Upwelling:
@@ -154,22 +196,158 @@ class DreamerAgent:
         """
         start_time = time.time()
 
-        # Update state
-        self.state.stimulus = stimulus
-        self.state.state = "exploring"
-
         # ==================================================================
         # PHASE 1: INHALE - Receive the stimulus
         # ==================================================================
 
-        stimulus_dict = stimulus.to_dict()
+        stimulus_dict = self._inhale(stimulus)
+
+        # A repeat of a stimulus just dreamt: nothing to explore
+        cache_key, version = self._upwelling_key(stimulus_dict)
+        cached = self._cached_upwelling(stimulus, stimulus_dict, cache_key, version, start_time)
+        if cached is not None:
+            return cached
 
         # ==================================================================
         # PHASE 2: RUMINATE - Explore through 8 lenses
         # ==================================================================
 
+        answers = {} if cache_key is not None else None
+        exploration_result = self.explorer.explore_all(stimulus_dict, answers)
+
+        # ==================================================================
+        # PHASE 3: EXHALE - Synthesize Context Object
+        # ==================================================================
+
+        upwelling = self._exhale(stimulus, stimulus_dict, exploration_result, start_time)
+        self._cache_upwelling(cache_key, version, upwelling, stimulus, answers)
+        return upwelling
+
+    async def dream_async(self, stimulus: Stimulus) -> Upwelling:
+        """
+        Async dream(): same Upwelling, without blocking the event loop.
+
+        Exploration awaits each round trip (LensExplorer.explore_all_async),
+        so construct the Dreamer with AsyncGraphTools:
+
+            dreamer = DreamerAgent(tools=AsyncGraphTools(port=6380))
+            upwelling = await dreamer.dream_async(stimulus)
+
+        One Dreamer can run many dreams concurrently; get_state() then
+        reflects whichever dream updated it last.
+
+        Args:
+            stimulus: The external signal to process
+
+        Returns:
+            Upwelling containing Context Object for Driver
+        """
+        start_time = time.time()
+
+        stimulus_dict = self._inhale(stimulus)
+        cache_key, version = self._upwelling_key(stimulus_dict)
+        cached = self._cached_upwelling(stimulus, stimulus_dict, cache_key, version, start_time)
+        if cached is not None:
+            return cached
+
+        answers = {} if cache_key is not None else None
+        exploration_result = await self.explorer.explore_all_async(stimulus_dict, answers)
+
+        upwelling = self._exhale(stimulus, stimulus_dict, exploration_result, start_time)
+        self._cache_upwelling(cache_key, version, upwelling, stimulus, answers)
+        return upwelling
+
+    def _inhale(self, stimulus: Stimulus) -> Dict:
+        """Phase 1: receive the stimulus and enter the exploring state."""
+        self.state.stimulus = stimulus
         self.state.state = "exploring"
-        exploration_result = self.explorer.explore_all(stimulus_dict)
+        return stimulus.to_dict()
+
+    # ======================================================================
+    # UPWELLING CACHE
+    # ======================================================================
+
+    def _upwelling_key(self, stimulus_dict: Dict) -> tuple:
+        """
+        (cache key, graph version) of a stimulus, or (None, None) when not caching.
+
+        Tools without a graph version reader (AsyncGraphTools) can't tell a
+        stale entry from a fresh one, so nothing is cached for them.
+        """
+        tools = self.explorer.tools
+        if self.upwelling_cache is None or not hasattr(tools, "graph_version"):
+            return None, None
+        try:
+            version = tools.graph_version()
+        except Exception:
+            return None, None
+
+        content = stimulus_dict.get("content", "")
+        self.explorer.refresh_terms()
+        key = self.upwelling_cache.make_key(
+            self.citizen,
+            stimulus_dict.get("sender", "unknown"),
+            extract_keywords(content),
+            self.explorer.term_extractor.extract(content),
+            version
+        )
+        return key, version
+
+    def _cached_upwelling(self, stimulus: Stimulus, stimulus_dict: Dict, key: Optional[tuple],
+                          version: Optional[int], start_time: float) -> Optional[Upwelling]:
+        """
+        The cached Upwelling for a stimulus, or None on miss.
+
+        A hit needs every query of the stimulus among the answers the cached
+        dream read (LensExplorer.replay): same key, different queries (a lens
+        falling back to the message text) is a miss.
+
+        The Context Object quotes the new message; timing is this call's,
+        and the summary reports no queries (exploration_summary["cache_hit"]).
+        """
+        if key is None:
+            return None
+        hit = self.upwelling_cache.get(
+            key, version, lambda answers: self.explorer.replay(stimulus_dict, answers) is not None
+        )
+        if hit is None:
+            return None
+
+        upwelling, content, age_s = hit
+        upwelling.context_object = upwelling.context_object.replace(
+            f'{stimulus.sender} says: "{content}"', f'{stimulus.sender} says: "{stimulus.content}"', 1
+        )
+        upwelling.token_count = estimate_tokens(upwelling.context_object)
+        upwelling.processing_time_ms = (time.time() - start_time) * 1000
+        upwelling.exploration_summary = dict(
+            upwelling.exploration_summary,
+            total_time_ms=0.0,
+            queries_executed=0,
+            round_trips=0,
+            queries_skipped=0,
+            queries_recalled=0,
+            cache_hit=True,
+            cache_age_s=age_s
+        )
+        upwelling.cache_hit = True
+
+        self.state.state = "complete"
+        return upwelling
+
+    def _cache_upwelling(self, key: Optional[tuple], version: Optional[int],
+                         upwelling: Upwelling, stimulus: Stimulus, answers: Optional[Dict]):
+        """Keep a freshly dreamt Upwelling (and the answers it read) for repeats of its stimulus."""
+        if key is not None:
+            self.upwelling_cache.put(key, version, upwelling, stimulus.content, answers)
+
+    def _exhale(
+        self,
+        stimulus: Stimulus,
+        stimulus_dict: Dict,
+        exploration_result: ExplorationResult,
+        start_time: float
+    ) -> Upwelling:
+        """Phase 3: synthesize the Context Object from an exploration."""
         self.state.exploration_result = exploration_result
 
         if not exploration_result.success:
@@ -183,10 +361,6 @@ class DreamerAgent:
                 error=exploration_result.error
             )
 
-        # ==================================================================
-        # PHASE 3: EXHALE - Synthesize Context Object
-        # ==================================================================
-
         self.state.state = "synthesizing"
         synthesis_result = synthesize_context_object(
             findings=exploration_result.findings,
@@ -238,7 +412,17 @@ class DreamerAgent:
         summary = {
             "total_time_ms": result.total_time_ms,
             "queries_executed": result.queries_executed,
+            "round_trips": result.round_trips,
+            "queries_skipped": result.queries_skipped,
+            "queries_recalled": result.queries_recalled,
+            "cache_hit": False,
             "nodes_retrieved": result.nodes_retrieved,
+            "timed_out": result.timed_out,
+            "failed": result.failed,
+            "threads": [
+                {"lens": finding.lens, "from": finding.related_findings, "synthesis": finding.synthesis}
+                for finding in result.threads
+            ],
             "lenses": {}
         }
 
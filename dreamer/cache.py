@@ -0,0 +1,210 @@
+"""
+Upwelling Cache - Repeated Stimuli Answered Without Dreaming Again
+
+Purpose: Skip exploration and synthesis for a stimulus the Dreamer just answered
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-26
+
+Opt-in: DreamerAgent(upwelling_cache=UpwellingCache()).
+
+Partners repeat and paraphrase ("is the race condition fixed?" / "race
+condition fixed?") within minutes. The lenses only see a stimulus through
+the requests they send: two stimuli whose requests are the same get the same
+findings and the same Context Object.
+
+- Keyed by (citizen, sender, keywords, technical terms, graph version);
+  keywords and terms in stimulus order, since lenses query the first ones
+  ("energy quarterly budget review" is not "quarterly budget review energy")
+- Each entry keeps the answers its dream read (request key -> QueryResult);
+  a hit counts only if the new stimulus replays on them with nothing missing
+  (LensExplorer.replay), e.g. a lens falling back to the raw message text
+- Invalidated as a whole when the graph version moves (graph/version.py)
+- Bounded by entry count (least recently used evicted first) and per-entry TTL
+- Only complete upwellings are stored (no failed or timed-out lenses)
+- A hit returns a copy of the stored Upwelling with cache_hit=True; the
+  DreamerAgent quotes the new message in it and sets fresh timing
+"""
+
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+
+
+# Cache defaults
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_S = 300.0                  # 5 minutes
+
+
+class UpwellingCache:
+    """
+    LRU + TTL cache of Upwellings, invalidated by graph version.
+
+    Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_s: float = DEFAULT_TTL_S):
+        """
+        Args:
+            max_entries: Max cached upwellings
+            ttl_s: Seconds an entry stays valid (0 = no expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+
+        # key -> (upwelling, stimulus content it was built for, answers read, stored_at)
+        self._entries: "OrderedDict[Tuple, Tuple[Any, str, Dict, float]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.mismatches = 0     # Same key, but the stimulus asks for something else
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(citizen: str, sender: str, keywords: Iterable[str], terms: Iterable[str],
+                 version: int) -> Tuple:
+        """Cache key for one stimulus (keywords and terms in the order they were extracted)."""
+        return (citizen, sender, tuple(keywords), tuple(terms), version)
+
+    def _check_version(self, version: int):
+        """Drop everything if the graph moved since the entries were stored."""
+        if self._version != version:
+            if self._entries:
+                self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Tuple, version: int,
+            matches: Callable[[Dict], bool] = None) -> Optional[Tuple[Any, str, float]]:
+        """
+        Look up an upwelling.
+
+        Args:
+            key: From make_key()
+            version: Current graph version
+            matches: answers -> whether the new stimulus is answered by the
+                entry's answers (LensExplorer.replay); run outside the lock
+
+        Returns:
+            (copy of the Upwelling, content it was built for, age in seconds),
+            or None on miss
+        """
+        with self._lock:
+            self._check_version(version)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            upwelling, content, answers, stored_at = entry
+            age_s = time.monotonic() - stored_at
+            if self.ttl_s and age_s > self.ttl_s:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+        if matches is not None and not matches(answers):
+            with self._lock:
+                self.mismatches += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.deepcopy(upwelling), content, age_s
+
+    def put(self, key: Tuple, version: int, upwelling: Any, content: str, answers: Dict = None):
+        """
+        Store a complete Upwelling dreamt at graph version `version` for `content`.
+
+        answers: request key -> QueryResult its exploration read (for get(matches=...))
+        """
+        summary = upwelling.exploration_summary or {}
+        if not upwelling.success or summary.get("timed_out") or summary.get("failed"):
+            return
+
+        stored = copy.deepcopy(upwelling)
+        answers = copy.deepcopy(answers or {})
+        with self._lock:
+            self._check_version(version)
+
+            self._entries.pop(key, None)
+            self._entries[key] = (stored, content, answers, time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and occupancy snapshot."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "graph_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "mismatches": self.mismatches,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# ============================================================================
+# TEST / EXAMPLE
+# ============================================================================
+
+if __name__ == "__main__":
+    from graph.memory_tools import InMemoryGraphTools
+    from graph.synthetic import SyntheticConfig, SyntheticGraph
+    from dreamer.agent import DreamerAgent, Stimulus
+
+    tools = InMemoryGraphTools(SyntheticGraph(SyntheticConfig.for_nodes(3000, seed=1)).snapshot())
+    cache = UpwellingCache()
+    dreamer = DreamerAgent(tools=tools, upwelling_cache=cache)
+    fresh = DreamerAgent(tools=tools)
+
+    def check(content: str, hit: bool):
+        upwelling = dreamer.dream(Stimulus(sender="nicolas", content=content))
+        expected = fresh.dream(Stimulus(sender="nicolas", content=content))
+        assert upwelling.cache_hit == hit, content
+        assert upwelling.context_object == expected.context_object, content
+        print(f"✓ {'hit ' if hit else 'miss'} {content!r}")
+
+    # Same keyword set, different order: the technical lens queries other terms
+    check("quarterly budget review energy", hit=False)
+    check("energy quarterly budget review", hit=False)
+
+    # Paraphrase sending the same queries
+    check("is the race condition fixed?", hit=False)
+    check("Is the race condition FIXED??", hit=True)
+
+    # Same keywords, but lenses with nothing to go on query the message itself
+    check("hello there friend", hit=False)
+    check("Hello there, friend!", hit=False)
+
+    print(f"\n{cache.stats()}")
@@ -1,7 +1,7 @@
 """
 8-Lens Exploration System
 
-Purpose: Sequential exploration of graph memory through 8 distinct lenses
+Purpose: Dependency-ordered exploration of graph memory through 8 distinct lenses
 Owner: Felix (Mechanical shell) / Luca (Phenomenological tuning)
 Version: 1.0
 Date: 2024-11-20
@@ -17,18 +17,49 @@ The 8 Lenses:
 6. EXPERIENTIAL  → What failed before?
 7. CONSTRAINT    → What pressures exist?
 8. CONNECTIVE    → What else relates?
+
+Lenses only wait on the lenses whose findings they read (see LENS_DEPENDENCIES).
+Independent lenses run concurrently, so exploration time is set by the longest
+dependency chain (historical → technical → dependents), not the sum of all queries.
+
+Each lens is written as a step generator: it yields the (tool, params) requests
+it needs and receives their QueryResults. That lets explore_all send every
+request of a wave in one pipelined round trip (GraphTools.execute_batch).
+
+Exploration can run on a time budget (total_timeout_ms / lens_timeout_ms): lenses
+out of time are cancelled and come back as timeout markers next to the
+completed findings, lowest priority first (LENS_DROP_ORDER). A lens that fails
+is reported the same way instead of discarding the lenses after it.
+
+Technical terms come from one compiled scanner that also knows the graph's
+own component names and file paths (dreamer/terms.py), reloaded when the
+graph version moves.
+
+With follow_threads on, findings flagged needs_deeper_exploration are followed
+breadth-first after the lenses (dreamer/threads.py): one round trip per depth
+level, bounded by depth, queries and the time budget.
 """
 
 import re
+import copy
 import sys
+import time
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Generator, Callable, Tuple
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.insert(0, '/home/mind-protocol/strange-loop')
 
-from graph.tools import GraphTools, QueryResult
+from graph.tools import GraphTools, QueryResult, ToolRequest, rows_to_query_result
+from dreamer.neighborhood import Neighborhood
+from dreamer.terms import TermExtractor
+from dreamer.threads import ThreadFollower, DEFAULT_MAX_DEPTH, DEFAULT_MAX_QUERIES
+from dreamer.session import WorkingMemory, SessionTurn
 
 
 @dataclass
@@ -42,6 +73,8 @@ class Finding:
     needs_deeper_exploration: bool      # Should we follow threads?
     query_time_ms: float = 0.0          # Time to execute query
     related_findings: List[str] = field(default_factory=list)
+    timed_out: bool = False             # Cancelled by the time budget (not explored)
+    error: Optional[str] = None         # Lens failed (not explored)
 
     def __bool__(self):
         """Finding is truthy if data was found."""
@@ -56,8 +89,211 @@ class ExplorationResult:
     total_time_ms: float                # Total exploration time
     queries_executed: int               # Number of queries run
     nodes_retrieved: int                # Total nodes touched
-    success: bool                       # Did exploration complete?
+    success: bool                       # False only if every lens failed
     error: Optional[str] = None         # Error message if failed
+    round_trips: int = 0                # Network round trips to FalkorDB
+    timed_out: List[str] = field(default_factory=list)  # Lenses cancelled by the budget
+    failed: List[str] = field(default_factory=list)     # Lenses that raised
+    queries_skipped: int = 0            # Known empty (ExistenceSummary), never sent
+    threads: List[Finding] = field(default_factory=list)  # Follow-ups of flagged findings (follow_threads)
+    queries_recalled: int = 0           # Answered from the session's previous turn (working_memory)
+
+    @property
+    def partial(self) -> bool:
+        """Some lenses were not explored (timeout or failure)."""
+        return bool(self.timed_out or self.failed)
+
+
+# A lens as query steps: yields request lists, receives results, returns its Finding
+LensSteps = Generator[List[ToolRequest], List[QueryResult], Finding]
+
+
+# ============================================================================
+# LENS DEPENDENCY GRAPH
+# ============================================================================
+
+# Canonical lens order (findings are always reported in this order)
+LENS_ORDER = [
+    "relational",
+    "historical",
+    "technical",
+    "emotional",
+    "strategic",
+    "experiential",
+    "constraint",
+    "connective",
+]
+
+# lens_name -> lenses whose findings it reads
+LENS_DEPENDENCIES: Dict[str, List[str]] = {
+    "relational": [],
+    "historical": [],
+    "technical": ["historical"],                 # Conversation topics add terms
+    "emotional": ["technical", "historical"],    # Historical topic is the fallback situation
+    "strategic": ["technical"],
+    "experiential": ["technical"],
+    "constraint": ["technical"],                 # Relevance filter on component
+    "connective": ["technical"],
+}
+
+# Speculative mode: technical starts with the stimulus terms alongside
+# historical and is refined before its dependents run (see LensExplorer)
+SPECULATIVE_LENS_DEPENDENCIES: Dict[str, List[str]] = dict(LENS_DEPENDENCIES, technical=[])
+
+
+# Lenses cancelled first when the time budget runs short, mirroring the section
+# trim order of trim_context_object: Relevant History goes first, Strategic
+# Direction last; relational (Who I Am) is kept longest
+LENS_DROP_ORDER = [
+    "historical",
+    "emotional",
+    "constraint",
+    "connective",
+    "technical",
+    "experiential",
+    "strategic",
+    "relational",
+]
+
+
+def _drop_rank(lens_name: str) -> int:
+    """Position in LENS_DROP_ORDER (lower = cancelled sooner)."""
+    return LENS_DROP_ORDER.index(lens_name) if lens_name in LENS_DROP_ORDER else len(LENS_DROP_ORDER)
+
+
+def lens_waves(dependencies: Dict[str, List[str]] = None) -> List[List[str]]:
+    """
+    Group lenses into waves of mutually independent lenses.
+
+    Every lens in a wave depends only on lenses from earlier waves, so a
+    wave can run concurrently. Within a wave, canonical lens order is kept.
+
+    Raises:
+        ValueError: If the dependency graph has a cycle or unknown lens
+    """
+    dependencies = dependencies or LENS_DEPENDENCIES
+    remaining = [lens for lens in LENS_ORDER if lens in dependencies]
+    done = set()
+    waves = []
+
+    while remaining:
+        wave = [
+            lens for lens in remaining
+            if all(dep in done for dep in dependencies[lens])
+        ]
+        if not wave:
+            raise ValueError(f"Lens dependency cycle or unknown lens among: {remaining}")
+        waves.append(wave)
+        done.update(wave)
+        remaining = [lens for lens in remaining if lens not in done]
+
+    return waves
+
+
+# ============================================================================
+# TIME BUDGET
+# ============================================================================
+
+class ExplorationTimeout(Exception):
+    """A round trip outlived the exploration's time budget."""
+
+
+@dataclass
+class ExplorationBudget:
+    """
+    Time budget of one exploration (None = unlimited).
+
+    total_ms bounds the whole exploration, lens_ms each lens from the moment
+    it is scheduled. The wave steps check it between round trips; the drivers
+    stop waiting on a round trip that outlives it.
+    """
+    total_ms: Optional[float] = None
+    lens_ms: Optional[float] = None
+    started: float = field(default_factory=time.perf_counter)
+    lens_started: Dict[str, float] = field(default_factory=dict)
+    in_flight: List[str] = field(default_factory=list)   # Lenses waiting on the current round trip
+    ms_per_request: float = 0.0                          # Last round trip time / its requests
+
+    @property
+    def limited(self) -> bool:
+        return self.total_ms is not None or self.lens_ms is not None
+
+    def start_lens(self, lens_name: str):
+        self.lens_started.setdefault(lens_name, time.perf_counter())
+
+    def remaining_ms(self, lens_name: str = None) -> float:
+        """Time left overall, or for one lens (inf if unlimited)."""
+        now = time.perf_counter()
+        remaining = float("inf")
+        if self.total_ms is not None:
+            remaining = self.total_ms - (now - self.started) * 1000
+        if lens_name is not None and self.lens_ms is not None:
+            started = self.lens_started.get(lens_name, now)
+            remaining = min(remaining, self.lens_ms - (now - started) * 1000)
+        return remaining
+
+    def wait_s(self, lens_name: str = None) -> Optional[float]:
+        """Seconds to wait for a lens (or the exploration), None if unlimited."""
+        remaining = self.remaining_ms(lens_name)
+        return None if remaining == float("inf") else max(remaining, 0.0) / 1000
+
+    def timeout_s(self) -> Optional[float]:
+        """Seconds the current round trip may take: until its last lens runs out."""
+        if not self.in_flight:
+            return self.wait_s()
+        waits = [self.wait_s(lens_name) for lens_name in self.in_flight]
+        return None if None in waits else max(waits)
+
+    def observe(self, elapsed_ms: float, requests: int):
+        """Record a round trip, for projecting the next one."""
+        self.ms_per_request = elapsed_ms / max(requests, 1)
+
+    def shed(self, pending: Dict[str, List[ToolRequest]]) -> List[str]:
+        """
+        Lenses to cancel before the next round trip: those out of time, then,
+        lowest priority first, those the projected round trip won't fit in
+        the remaining total budget. The top-priority lens is always tried
+        while time remains.
+        """
+        dropped = [lens_name for lens_name in pending if self.remaining_ms(lens_name) <= 0]
+        keep = sorted((lens_name for lens_name in pending if lens_name not in dropped),
+                      key=_drop_rank, reverse=True)
+        remaining = self.remaining_ms()
+        while len(keep) > 1 and self.ms_per_request * sum(len(pending[k]) for k in keep) > remaining:
+            dropped.append(keep.pop())
+        return dropped
+
+
+def _timeout_marker(lens_name: str) -> Finding:
+    """Finding for a lens the time budget cancelled."""
+    return Finding(
+        lens=lens_name,
+        data=None,
+        synthesis=f"Not explored: {lens_name} lens ran out of time",
+        confidence=0.0,
+        needs_deeper_exploration=False,
+        timed_out=True
+    )
+
+
+def _failure_marker(lens_name: str, error: Exception) -> Finding:
+    """Finding for a lens that raised."""
+    return Finding(
+        lens=lens_name,
+        data=None,
+        synthesis=f"Not explored: {lens_name} lens failed ({error})",
+        confidence=0.0,
+        needs_deeper_exploration=False,
+        error=str(error)
+    )
+
+
+def _exploration_error(findings: Dict[str, Finding]) -> Optional[str]:
+    """The exploration failed only if every lens did: return the first error."""
+    errors = [finding.error for finding in findings.values() if finding.error]
+    if errors and len(errors) == len(findings):
+        return errors[0]
+    return None
 
 
 def extract_keywords(text: str) -> List[str]:
@@ -96,71 +332,607 @@ def extract_technical_terms(stimulus_content: str, historical_data: List[Dict] =
     - File names (*.py, *.js, etc)
     - Technical patterns (race condition, memory leak, etc)
     - Component names
+
+    Patterns only; LensExplorer also matches the components the graph knows
+    (TermExtractor in dreamer/terms.py).
     """
-    terms = []
-
-    # Technical patterns to look for
-    tech_patterns = [
-        r'\b\w+\.py\b',           # Python files
-        r'\b\w+\.js\b',           # JS files
-        r'\brace\s*condition\b',   # Race condition
-        r'\bbug\b',               # Bug
-        r'\berror\b',             # Error
-        r'\bcrash\b',             # Crash
-        r'\bfailure\b',           # Failure
-        r'\brace\b',              # Race
-        r'\btiming\b',            # Timing
-        r'\bconcurrency\b',       # Concurrency
-        r'\bthread\b',            # Thread
-        r'\block\b',              # Lock
-        r'\bdeadlock\b',          # Deadlock
-        r'\bstimulus\b',          # Stimulus (project specific)
-        r'\bintegrator\b',        # Integrator (project specific)
-        r'\bdiffusion\b',         # Diffusion (project specific)
-    ]
-
-    combined_text = stimulus_content.lower()
-
-    # Add historical context
-    if historical_data:
-        for conv in historical_data:
-            combined_text += " " + conv.get('topic', '').lower()
-            combined_text += " " + " ".join(conv.get('key_points', []))
-
-    # Extract matches
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, combined_text)
-        terms.extend(matches)
-
-    # Also extract potential component names (camelCase, snake_case)
-    component_pattern = r'\b[a-z]+_[a-z_]+\b|\b[a-z]+[A-Z][a-zA-Z]+\b'
-    components = re.findall(component_pattern, stimulus_content)
-    terms.extend(components)
-
-    return list(dict.fromkeys(terms))  # Unique, preserving order
+    return _PATTERN_TERMS.extract(stimulus_content, historical_data)
+
+
+# Scanner without a graph vocabulary (extract_technical_terms)
+_PATTERN_TERMS = TermExtractor()
 
 
 class LensExplorer:
     """
     8-Lens Graph Exploration System.
 
-    Sequential exploration through 8 lenses, each building on previous findings.
+    Each lens builds on the findings of the lenses it depends on.
+    Independent lenses run together: pipelined into one round trip per
+    wave, or on a thread pool when pipelining is off.
     Critical for comprehensive context reconstruction.
     """
 
-    def __init__(self, tools: GraphTools = None, port: int = 6380):
+    def __init__(
+        self,
+        tools: GraphTools = None,
+        port: int = 6380,
+        max_workers: int = 8,
+        pipeline: bool = True,
+        lens_timeout_ms: Optional[float] = None,
+        total_timeout_ms: Optional[float] = None,
+        speculative: bool = False,
+        follow_threads: bool = False,
+        max_thread_depth: int = DEFAULT_MAX_DEPTH,
+        max_thread_queries: int = DEFAULT_MAX_QUERIES,
+        working_memory: Optional[WorkingMemory] = None
+    ):
         """
         Initialize lens explorer.
 
         Args:
             tools: GraphTools instance (created if not provided)
             port: FalkorDB port (default 6380 for strange-loop)
+            max_workers: Max lenses in flight at once when not pipelining (1 = sequential)
+            pipeline: Send each wave's queries as one batch (default True)
+            lens_timeout_ms: Budget per lens, from when it is scheduled (None = unlimited)
+            total_timeout_ms: Budget per exploration (None = unlimited); lenses
+                still running when it ends come back as timeout markers
+            speculative: Start the technical lens with the stimulus terms
+                alongside historical instead of after it; the terms the
+                historical topics add are queried afterwards, only if any
+            follow_threads: After the lenses, follow the threads of findings
+                flagged needs_deeper_exploration (dreamer/threads.py): one
+                round trip per depth level, reported in result.threads
+            max_thread_depth: Depth levels to follow (default 2)
+            max_thread_queries: Queries thread following may spend (default 8)
+            working_memory: Session working memory (dreamer/session.py):
+                stimuli carrying a session_id recall the answers of the
+                session's previous turn instead of re-querying them
         """
         if tools:
             self.tools = tools
         else:
             self.tools = GraphTools(port=port)
 
+        self.max_workers = max_workers
+        self.pipeline = pipeline
+        self.lens_timeout_ms = lens_timeout_ms
+        self.total_timeout_ms = total_timeout_ms
+        self.speculative = speculative
+
+        # Technical terms, with the graph's component names (see refresh_terms)
+        self.term_extractor = TermExtractor()
+
+        # Breadth-first follow-ups of flagged findings (None = off)
+        self.thread_follower = ThreadFollower(
+            self.term_extractor.extract, max_depth=max_thread_depth, max_queries=max_thread_queries
+        ) if follow_threads else None
+
+        self.working_memory = working_memory
+
+        # Round trips waited on with a timeout (created on first use)
+        self._round_trip_pool: Optional[ThreadPoolExecutor] = None
+        self._round_trip_lock = threading.Lock()
+
+    # ========================================================================
+    # TECHNICAL TERMS
+    # ========================================================================
+
+    def refresh_terms(self) -> bool:
+        """
+        Reload the term vocabulary if the graph version moved.
+
+        Called at the start of every exploration, once its time budget has
+        started. Only the first load runs inline (charged to the budget);
+        after that the version check and any reload run in the background
+        and the exploration scans with the current vocabulary. If the
+        vocabulary can't be loaded, extraction goes on with what it has
+        (patterns only at worst).
+
+        Returns:
+            True if the term scanner was rebuilt
+        """
+        try:
+            return self.term_extractor.refresh(self.tools, background=True)
+        except Exception:
+            return False
+
+    async def refresh_terms_async(self) -> bool:
+        """
+        refresh_terms() for AsyncGraphTools.
+
+        AsyncGraphTools has no graph version reader, so the vocabulary is
+        loaded once; tools that have one (in-memory) follow their version.
+        """
+        if not hasattr(self.tools, "graph_version"):
+            if self.term_extractor.loaded:
+                return False
+            try:
+                return self.term_extractor.load(await self.tools.query_term_vocabulary())
+            except Exception:
+                return False
+        return self.refresh_terms()
+
+    # ========================================================================
+    # STEP EXECUTION
+    # ========================================================================
+
+    def _new_stats(self) -> Dict:
+        """Counters and time budget for one exploration."""
+        return {
+            "queries": 0,
+            "round_trips": 0,
+            "skipped": 0,
+            "recalled": 0,
+            "lock": threading.Lock(),
+            "budget": ExplorationBudget(self.total_timeout_ms, self.lens_timeout_ms)
+        }
+
+    def _count(self, requests: List[ToolRequest], stats: Dict = None):
+        """Record one round trip carrying len(requests) queries."""
+        if stats is not None:
+            with stats["lock"]:
+                stats["queries"] += len(requests)
+                stats["round_trips"] += 1
+
+    def _skip_known_empty(self, requests: List[ToolRequest], stats: Dict = None) -> tuple:
+        """
+        Answer requests the tools' existence summary proves empty.
+
+        Returns:
+            (answers with None where the query must run, requests to run)
+        """
+        known_empty = getattr(self.tools, "known_empty", None)
+        if known_empty is None:
+            return [None] * len(requests), requests
+
+        answers = [rows_to_query_result([], 0.0) if known_empty(tool, params) else None
+                   for tool, params in requests]
+        skipped = sum(answer is not None for answer in answers)
+        if skipped and stats is not None:
+            with stats["lock"]:
+                stats["skipped"] += skipped
+        return answers, [request for request, answer in zip(requests, answers) if answer is None]
+
+    @staticmethod
+    def _merge_answers(answers: List[Optional[QueryResult]], results: List[QueryResult]) -> List[QueryResult]:
+        """Fill the unanswered slots of answers with results, in order."""
+        results = iter(results)
+        return [answer if answer is not None else next(results) for answer in answers]
+
+    def _execute(self, requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+        """
+        Execute one step's requests in a single round trip.
+
+        Requests known to be empty are answered locally (no round trip if
+        that is all of them). Falls back to one call per request for tools
+        without execute_batch.
+        """
+        answers, requests = self._skip_known_empty(requests, stats)
+        if not requests:
+            return answers
+        self._count(requests, stats)
+
+        if hasattr(self.tools, "execute_batch"):
+            return self._merge_answers(answers, self.tools.execute_batch(requests))
+
+        return self._merge_answers(answers, [getattr(self.tools, tool)(**params) for tool, params in requests])
+
+    async def _execute_async(self, requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+        """
+        Async _execute: awaits AsyncGraphTools, calls sync tools directly.
+
+        Sync tools still work here but block the event loop for the round trip.
+        """
+        answers, requests = self._skip_known_empty(requests, stats)
+        if not requests:
+            return answers
+        self._count(requests, stats)
+
+        if hasattr(self.tools, "execute_batch"):
+            results = self.tools.execute_batch(requests)
+            return self._merge_answers(answers, await results if inspect.isawaitable(results) else results)
+
+        results = []
+        for tool, params in requests:
+            result = getattr(self.tools, tool)(**params)
+            results.append(await result if inspect.isawaitable(result) else result)
+        return self._merge_answers(answers, results)
+
+    def _drive(self, steps: Generator, stats: Dict = None, execute: Callable = None) -> Any:
+        """
+        Run a step generator to completion with blocking round trips.
+
+        Transport errors are thrown back into the generator, so callers
+        holding partial results can handle them. So is ExplorationTimeout,
+        when a round trip outlives the budget in stats.
+
+        Args:
+            execute: Step executor (default: _execute)
+        """
+        execute = execute or self._execute
+        budget = stats.get("budget") if stats else None
+        try:
+            requests = next(steps)
+            while True:
+                try:
+                    results = self._within_budget(execute, requests, stats, budget)
+                except Exception as e:
+                    requests = steps.throw(e)
+                    continue
+                requests = steps.send(results)
+        except StopIteration as done:
+            return done.value
+
+    def _within_budget(self, execute: Callable, requests: List[ToolRequest], stats: Dict,
+                       budget: Optional[ExplorationBudget]) -> List[QueryResult]:
+        """
+        Run one round trip, giving up when the budget runs out.
+
+        The abandoned round trip finishes in the background; its results are
+        dropped.
+
+        Raises:
+            ExplorationTimeout: The round trip outlived the budget
+        """
+        timeout = budget.timeout_s() if budget is not None else None
+        if timeout is None:
+            return execute(requests, stats)
+        if timeout <= 0:
+            raise ExplorationTimeout("Exploration budget exhausted")
+
+        with self._round_trip_lock:
+            if self._round_trip_pool is None:
+                self._round_trip_pool = ThreadPoolExecutor(max_workers=max(4, self.max_workers))
+        future = self._round_trip_pool.submit(execute, requests, stats)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise ExplorationTimeout(f"Round trip exceeded the budget ({timeout * 1000:.0f}ms left)")
+
+    async def _drive_async(self, steps: Generator, stats: Dict = None, execute: Callable = None) -> Any:
+        """
+        Run a step generator to completion, awaiting each round trip.
+
+        Args:
+            execute: Async step executor (default: _execute_async)
+        """
+        execute = execute or self._execute_async
+        budget = stats.get("budget") if stats else None
+        try:
+            requests = next(steps)
+            while True:
+                timeout = budget.timeout_s() if budget is not None else None
+                try:
+                    results = await asyncio.wait_for(execute(requests, stats), timeout)
+                except asyncio.TimeoutError:
+                    requests = steps.throw(ExplorationTimeout("Round trip exceeded the budget"))
+                    continue
+                except Exception as e:
+                    requests = steps.throw(e)
+                    continue
+                requests = steps.send(results)
+        except StopIteration as done:
+            return done.value
+
+    def _prefetched_executor(self, answer: Callable, live: bool) -> Callable:
+        """
+        Step executor that answers requests locally where it can.
+
+        Args:
+            answer: requests -> list of QueryResult, or None where it has no answer
+            live: Run unanswered requests against the graph (else: not found)
+        """
+        def execute(requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+            answers = answer(requests)
+            misses = [i for i, result in enumerate(answers) if result is None]
+
+            if misses and live:
+                for i, result in zip(misses, self._execute([requests[i] for i in misses], stats)):
+                    answers[i] = result
+            else:
+                for i in misses:
+                    answers[i] = rows_to_query_result([], 0.0)
+
+            return answers
+
+        return execute
+
+    def _begin_turn(self, stimulus: Dict) -> Optional[SessionTurn]:
+        """
+        Working memory turn for a stimulus's session (None without one).
+
+        Reads the graph version before the time budget starts; tools without
+        a version reader recall nothing.
+        """
+        if self.working_memory is None or not stimulus.get("session_id"):
+            return None
+        try:
+            version = self.tools.graph_version() if hasattr(self.tools, "graph_version") else None
+        except Exception:
+            version = None
+        return self.working_memory.begin(stimulus["session_id"], stimulus.get("last_driver_output"), version)
+
+    def _recall(self, turn: SessionTurn, requests: List[ToolRequest], stats: Dict = None) -> tuple:
+        """
+        Answer requests from the session's previous turn.
+
+        Returns:
+            (request keys, answers with None where the query must run)
+        """
+        keys = [self.tools.request_key(*request) for request in requests]
+        answers = [turn.recall(key) for key in keys]
+        recalled = sum(answer is not None for answer in answers)
+        if recalled and stats is not None:
+            with stats["lock"]:
+                stats["recalled"] += recalled
+        return keys, answers
+
+    def _recalling_executor(self, turn: SessionTurn) -> Callable:
+        """Step executor answering from a session turn's memory, recording what it runs."""
+        def execute(requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+            keys, answers = self._recall(turn, requests, stats)
+            misses = [i for i, result in enumerate(answers) if result is None]
+            if misses:
+                results = self._execute([requests[i] for i in misses], stats)
+                turn.record([keys[i] for i in misses], results)
+                for i, result in zip(misses, results):
+                    answers[i] = result
+            return answers
+
+        return execute
+
+    def _recalling_executor_async(self, turn: SessionTurn) -> Callable:
+        """Async _recalling_executor (over _execute_async)."""
+        async def execute(requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+            keys, answers = self._recall(turn, requests, stats)
+            misses = [i for i, result in enumerate(answers) if result is None]
+            if misses:
+                results = await self._execute_async([requests[i] for i in misses], stats)
+                turn.record([keys[i] for i in misses], results)
+                for i, result in zip(misses, results):
+                    answers[i] = result
+            return answers
+
+        return execute
+
+    def _recording_executor(self, execute: Callable, answers: Dict) -> Callable:
+        """Step executor that keeps every answer it gets, by request key (failed queries are not kept)."""
+        def record(requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+            results = execute(requests, stats)
+            for request, result in zip(requests, results):
+                if not result.error:
+                    answers[self.tools.request_key(*request)] = result
+            return results
+
+        return record
+
+    def _recording_executor_async(self, execute: Callable, answers: Dict) -> Callable:
+        """Async _recording_executor."""
+        async def record(requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+            results = await execute(requests, stats)
+            for request, result in zip(requests, results):
+                if not result.error:
+                    answers[self.tools.request_key(*request)] = result
+            return results
+
+        return record
+
+    def _run_lens(self, steps: LensSteps, stats: Dict = None, execute: Callable = None) -> Finding:
+        """Drive one lens's step generator to completion."""
+        return self._drive(steps, stats, execute)
+
+    def _wave_steps(self, steps: Dict[str, LensSteps],
+                    budget: ExplorationBudget = None) -> Generator[List[ToolRequest], List[QueryResult], Dict[str, Finding]]:
+        """
+        Run several lenses in lockstep, one batched round trip per step.
+
+        All requests the lenses are waiting on go out together; each lens
+        gets back exactly the results for its own requests. A lens that
+        raises becomes a failure marker, the others go on. With a budget,
+        lenses out of time are cancelled between round trips (see
+        ExplorationBudget.shed) and become timeout markers.
+        """
+        results: Dict[str, Finding] = {}
+        pending: Dict[str, List[ToolRequest]] = {}
+
+        for lens_name, lens_steps in steps.items():
+            if budget is not None:
+                budget.start_lens(lens_name)
+            try:
+                pending[lens_name] = next(lens_steps)
+            except StopIteration as done:
+                results[lens_name] = done.value
+            except Exception as e:
+                results[lens_name] = _failure_marker(lens_name, e)
+
+        while pending:
+            if budget is not None and budget.limited:
+                for lens_name in budget.shed(pending):
+                    steps[lens_name].close()
+                    del pending[lens_name]
+                    results[lens_name] = _timeout_marker(lens_name)
+                budget.in_flight = list(pending)
+                if not pending:
+                    break
+
+            batch = [request for requests in pending.values() for request in requests]
+            sent = time.perf_counter()
+            try:
+                answers = yield batch
+            except Exception as e:
+                # Round trip lost (transport error) or abandoned (ExplorationTimeout)
+                for lens_name in pending:
+                    steps[lens_name].close()
+                    timed_out = isinstance(e, ExplorationTimeout)
+                    results[lens_name] = _timeout_marker(lens_name) if timed_out else _failure_marker(lens_name, e)
+                break
+
+            if budget is not None:
+                budget.observe((time.perf_counter() - sent) * 1000, len(batch))
+
+            waiting = {}
+            offset = 0
+            for lens_name, requests in pending.items():
+                chunk = answers[offset:offset + len(requests)]
+                offset += len(requests)
+                try:
+                    waiting[lens_name] = steps[lens_name].send(chunk)
+                except StopIteration as done:
+                    results[lens_name] = done.value
+                except Exception as e:
+                    results[lens_name] = _failure_marker(lens_name, e)
+            pending = waiting
+
+        return results
+
+    def _lens_steps(self, lens_name: str, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Step generator for one lens by name."""
+        return getattr(self, f"_{lens_name}_steps")(stimulus, findings)
+
+    def _lens_waves(self) -> List[List[str]]:
+        """Waves of this explorer's dependency graph (speculative or not)."""
+        return lens_waves(SPECULATIVE_LENS_DEPENDENCIES if self.speculative else LENS_DEPENDENCIES)
+
+    def _refines_technical(self, wave: List[str], findings: Dict[str, Finding]) -> bool:
+        """Whether a speculative technical finding from this wave still needs refining."""
+        technical = findings.get("technical")
+        return (self.speculative and "technical" in wave and technical is not None
+                and not technical.timed_out and not technical.error)
+
+    def _exploration_steps(self, stimulus: Dict,
+                           budget: ExplorationBudget = None) -> Generator[List[ToolRequest], List[QueryResult], tuple]:
+        """
+        Whole 8-lens exploration as steps: one batch per wave step.
+
+        Returns (findings, error). Failed or cancelled lenses are markers in
+        findings; later lenses still run without them. error is set only if
+        every lens failed. Waves that start after the total budget ran out
+        are not explored.
+        """
+        findings: Dict[str, Finding] = {}
+
+        for wave in self._lens_waves():
+            if budget is not None and budget.remaining_ms() <= 0:
+                findings.update((name, _timeout_marker(name)) for name in wave)
+                continue
+
+            # Every lens in the wave sees the same snapshot of earlier findings
+            snapshot = dict(findings)
+            findings.update((yield from self._wave_steps({
+                name: self._lens_steps(name, stimulus, snapshot) for name in wave
+            }, budget)))
+
+            if self._refines_technical(wave, findings):
+                # A refinement that fails or runs out of time keeps the speculative finding
+                refined = (yield from self._wave_steps({
+                    "technical": self._technical_refinement_steps(stimulus, dict(findings))
+                }, budget))["technical"]
+                if not refined.timed_out and not refined.error:
+                    findings["technical"] = refined
+
+        return findings, _exploration_error(findings)
+
+    def _explore_threaded(self, stimulus: Dict, stats: Dict, execute: Callable = None) -> tuple:
+        """
+        Exploration with one thread per lens and no pipelining. Returns (findings, error).
+
+        Higher-priority lenses are submitted first; with a budget, lenses not
+        done in time are abandoned (their threads finish in the background).
+        execute is the step executor of every lens (default: _execute).
+        """
+        findings: Dict[str, Finding] = {}
+        budget = stats.get("budget")
+        pool = ThreadPoolExecutor(max_workers=max(1, self.max_workers))
+
+        try:
+            for wave in self._lens_waves():
+                if budget is not None and budget.remaining_ms() <= 0:
+                    findings.update((name, _timeout_marker(name)) for name in wave)
+                    continue
+
+                snapshot = dict(findings)
+                futures = {}
+                for name in sorted(wave, key=_drop_rank, reverse=True):
+                    if budget is not None:
+                        budget.start_lens(name)
+                    futures[name] = pool.submit(self._run_lens, self._lens_steps(name, stimulus, snapshot), stats, execute)
+
+                for name in wave:
+                    try:
+                        findings[name] = futures[name].result(
+                            timeout=budget.wait_s(name) if budget is not None else None
+                        )
+                    except (FutureTimeout, ExplorationTimeout):
+                        futures[name].cancel()
+                        findings[name] = _timeout_marker(name)
+                    except Exception as e:
+                        findings[name] = _failure_marker(name, e)
+
+                if self._refines_technical(wave, findings):
+                    try:
+                        findings["technical"] = self._run_lens(
+                            self._technical_refinement_steps(stimulus, dict(findings)), stats, execute
+                        )
+                    except Exception:
+                        pass  # Keep the speculative finding
+        finally:
+            pool.shutdown(wait=budget is None or not budget.limited, cancel_futures=True)
+
+        return findings, _exploration_error(findings)
+
+    def _thread_steps(self, stimulus: Dict, findings: Dict[str, Finding],
+                      budget: ExplorationBudget = None) -> Generator[List[ToolRequest], List[QueryResult], List[Finding]]:
+        """
+        Thread following as steps (see follow_threads): one batch per depth level.
+
+        Nothing is followed when it is off or every lens failed.
+        """
+        if self.thread_follower is None or _exploration_error(findings):
+            return []
+        if budget is not None:
+            budget.in_flight = []  # Follow-ups answer to the total budget, not a lens's
+
+        # Terms the technical lens already queried are not looked up again
+        return (yield from self.thread_follower.steps(
+            findings, self._technical_terms(stimulus, findings), budget
+        ))
+
+    def _exploration_result(self, findings: Dict[str, Finding], error: Optional[str],
+                            start_time: float, stats: Dict,
+                            threads: List[Finding] = None) -> ExplorationResult:
+        """Package findings (in canonical lens order) and follow-ups with exploration stats."""
+        findings = {name: findings[name] for name in LENS_ORDER if name in findings}
+        threads = threads or []
+
+        nodes_retrieved = 0
+        for finding in list(findings.values()) + threads:
+            # Count nodes retrieved
+            if finding.data:
+                if isinstance(finding.data, list):
+                    nodes_retrieved += len(finding.data)
+                else:
+                    nodes_retrieved += 1
+
+        total_time_ms = (time.time() - start_time) * 1000
+
+        return ExplorationResult(
+            findings=findings,
+            total_time_ms=total_time_ms,
+            queries_executed=stats["queries"],
+            nodes_retrieved=nodes_retrieved,
+            success=error is None,
+            error=error,
+            round_trips=stats["round_trips"],
+            timed_out=[name for name, finding in findings.items() if finding.timed_out],
+            failed=[name for name, finding in findings.items() if finding.error],
+            queries_skipped=stats["skipped"],
+            threads=threads,
+            queries_recalled=stats["recalled"]
+        )
+
     # ========================================================================
     # LENS 1: RELATIONAL CONTEXT
     # ========================================================================
@@ -173,9 +945,13 @@ class LensExplorer:
 
         Query: query_partnerships(sender)
         """
+        return self._run_lens(self._relational_steps(stimulus, findings))
+
+    def _relational_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Relational lens as query steps (see _run_lens)."""
         sender = stimulus.get("sender", "unknown")
 
-        result = self.tools.query_partnerships(sender)
+        [result] = yield [("query_partnerships", {"partner_id": sender})]
 
         if not result.found:
             return Finding(
@@ -223,17 +999,21 @@ class LensExplorer:
 
         Query: query_conversations(sender, keywords)
         """
+        return self._run_lens(self._historical_steps(stimulus, findings))
+
+    def _historical_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Historical lens as query steps (see _run_lens)."""
         sender = stimulus.get("sender", "unknown")
         content = stimulus.get("content", "")
 
         # Extract keywords from stimulus
         keywords = extract_keywords(content)
 
-        result = self.tools.query_conversations(
-            partner_id=sender,
-            keywords=keywords if keywords else None,
-            limit=5
-        )
+        [result] = yield [("query_conversations", {
+            "partner_id": sender,
+            "keywords": keywords if keywords else None,
+            "limit": 5
+        })]
 
         if not result.found:
             return Finding(
@@ -280,19 +1060,29 @@ class LensExplorer:
 
         Critical for: Understanding what we're actually working on
 
-        Query: query_technical_context(term)
+        Query: query_technical_context_many(terms)
         """
+        return self._run_lens(self._technical_steps(stimulus, findings))
+
+    def _technical_terms(self, stimulus: Dict, findings: Dict) -> List[str]:
+        """Terms the technical lens queries (stimulus plus historical topics, top 3)."""
         content = stimulus.get("content", "")
         historical = findings.get("historical")
 
         # Extract technical terms
         historical_data = historical.data if historical and historical.data else []
-        terms = extract_technical_terms(content, historical_data if isinstance(historical_data, list) else [])
+        terms = self.term_extractor.extract(content, historical_data if isinstance(historical_data, list) else [])
 
         if not terms:
             # Try keywords as fallback
             terms = extract_keywords(content)[:3]
 
+        return terms[:3]
+
+    def _technical_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Technical lens as query steps (see _run_lens)."""
+        terms = self._technical_terms(stimulus, findings)
+
         if not terms:
             return Finding(
                 lens="technical",
@@ -303,17 +1093,39 @@ class LensExplorer:
                 query_time_ms=0
             )
 
-        # Query each term (limit to top 3)
+        # Top 3 terms in one query: each node once, most terms matched first, then most recent
+        [result] = yield [("query_technical_context_many", {"terms": terms})]
+
         technical_contexts = []
-        total_time = 0
+        if result.found:
+            technical_contexts = result.data if isinstance(result.data, list) else [result.data]
+
+        return self._technical_finding(terms, technical_contexts, result.query_time_ms)
+
+    def _technical_refinement_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """
+        Second half of the speculative technical lens (see speculative).
+
+        findings["technical"] was queried with the stimulus terms alone. If
+        the historical topics add terms, the lens runs again over the full
+        term list; otherwise the speculative finding stands and no round
+        trip is spent.
+        """
+        speculative = findings["technical"]
+        queried = {term.lower() for term in self._technical_terms(stimulus, {})}
+        terms = self._technical_terms(stimulus, findings)
 
-        for term in terms[:3]:
-            result = self.tools.query_technical_context(term)
-            total_time += result.query_time_ms
-            if result.found:
-                data = result.data if isinstance(result.data, list) else [result.data]
-                technical_contexts.extend(data)
+        if all(term.lower() in queried for term in terms):
+            return speculative
 
+        # The full list, not just the new terms: a node matching both old and
+        # new terms must outrank single matches, which two LIMITed queries can't
+        refined = yield from self._technical_steps(stimulus, findings)
+        refined.query_time_ms += speculative.query_time_ms or 0
+        return refined
+
+    def _technical_finding(self, terms: List[str], technical_contexts: List[Dict], total_time: float) -> Finding:
+        """Technical finding from the matched Technical_Context nodes (best first)."""
         if not technical_contexts:
             return Finding(
                 lens="technical",
@@ -366,6 +1178,10 @@ class LensExplorer:
 
         Query: query_emotional_state(context)
         """
+        return self._run_lens(self._emotional_steps(stimulus, findings))
+
+    def _emotional_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Emotional lens as query steps (see _run_lens)."""
         technical = findings.get("technical")
         historical = findings.get("historical")
         content = stimulus.get("content", "")
@@ -380,10 +1196,10 @@ class LensExplorer:
         else:
             situation = content
 
-        result = self.tools.query_emotional_state(
-            context_similar_to=situation,
-            limit=3
-        )
+        [result] = yield [("query_emotional_state", {
+            "context_similar_to": situation,
+            "limit": 3
+        })]
 
         if not result.found:
             return Finding(
@@ -433,6 +1249,10 @@ class LensExplorer:
 
         Query: query_strategy_patterns(situation_type)
         """
+        return self._run_lens(self._strategic_steps(stimulus, findings))
+
+    def _strategic_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Strategic lens as query steps (see _run_lens)."""
         technical = findings.get("technical")
 
         if not technical or not technical.data:
@@ -453,11 +1273,11 @@ class LensExplorer:
             situation_type = extract_keywords(tech_data.get("description", ""))
             situation_type = situation_type[0] if situation_type else "unknown"
 
-        result = self.tools.query_strategy_patterns(
-            situation_type=situation_type,
-            min_success_rate=0.7,
-            limit=3
-        )
+        [result] = yield [("query_strategy_patterns", {
+            "situation_type": situation_type,
+            "min_success_rate": 0.7,
+            "limit": 3
+        })]
 
         if not result.found:
             return Finding(
@@ -505,6 +1325,10 @@ class LensExplorer:
 
         Query: query_failed_attempts(context)
         """
+        return self._run_lens(self._experiential_steps(stimulus, findings))
+
+    def _experiential_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Experiential lens as query steps (see _run_lens)."""
         technical = findings.get("technical")
         content = stimulus.get("content", "")
 
@@ -525,10 +1349,10 @@ class LensExplorer:
                 query_time_ms=0
             )
 
-        result = self.tools.query_failed_attempts(
-            context=context,
-            limit=5
-        )
+        [result] = yield [("query_failed_attempts", {
+            "context": context,
+            "limit": 5
+        })]
 
         if not result.found:
             return Finding(
@@ -570,11 +1394,22 @@ Most Recent:
 
         Critical for: Understanding urgency, prioritization
 
-        Query: query_active_constraints()
+        Query: query_active_constraints(component)
         """
-        result = self.tools.query_active_constraints(
-            min_severity="medium"
-        )
+        return self._run_lens(self._constraint_steps(stimulus, findings))
+
+    def _constraint_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Constraint lens as query steps (see _run_lens)."""
+        params = {"min_severity": "medium"}
+
+        # Narrow to constraints on the component under discussion (server-side)
+        technical = findings.get("technical")
+        if technical and technical.data:
+            tech_data = technical.data[0] if isinstance(technical.data, list) else technical.data
+            if tech_data.get("component"):
+                params["component"] = tech_data["component"]
+
+        [result] = yield [("query_active_constraints", params)]
 
         if not result.found:
             return Finding(
@@ -588,15 +1423,6 @@ Most Recent:
 
         constraints = result.data if isinstance(result.data, list) else [result.data]
 
-        # Filter to relevant constraints if we have technical context
-        technical = findings.get("technical")
-        if technical and technical.data:
-            tech_data = technical.data[0] if isinstance(technical.data, list) else technical.data
-            component = tech_data.get("component", "")
-            relevant = [c for c in constraints if component.lower() in c.get("description", "").lower()]
-            if relevant:
-                constraints = relevant
-
         critical = constraints[0]
         c_type = critical.get('constraint_type', 'Unknown')
         description = critical.get('description', 'Unknown')
@@ -635,6 +1461,10 @@ Most Recent:
 
         Query: query_related_code(component)
         """
+        return self._run_lens(self._connective_steps(stimulus, findings))
+
+    def _connective_steps(self, stimulus: Dict, findings: Dict) -> LensSteps:
+        """Connective lens as query steps (see _run_lens)."""
         technical = findings.get("technical")
 
         if not technical or not technical.data:
@@ -661,11 +1491,11 @@ Most Recent:
                 query_time_ms=0
             )
 
-        result = self.tools.query_related_code(
-            filename=component,
-            include_dependencies=True,
-            limit=5
-        )
+        [result] = yield [("query_related_code", {
+            "filename": component,
+            "include_dependencies": True,
+            "limit": 5
+        })]
 
         if not result.found:
             return Finding(
@@ -720,69 +1550,238 @@ Most Recent:
     # MAIN EXPLORATION ORCHESTRATION
     # ========================================================================
 
-    def explore_all(self, stimulus: Dict) -> ExplorationResult:
+    def explore_all(self, stimulus: Dict, answers: Dict = None) -> ExplorationResult:
         """
         Run complete 8-lens exploration.
 
-        Sequential execution - each lens can use previous findings.
+        Lenses run in dependency waves (see lens_waves): each lens can use the
+        findings of the lenses it depends on, independent lenses run at once.
+        With pipelining on, each wave costs one round trip per step.
+
+        With lens_timeout_ms / total_timeout_ms set, lenses still running when
+        their budget ends are cancelled: the result holds the completed
+        findings plus timeout markers (Finding.timed_out, result.timed_out).
+
+        With working_memory set, a stimulus carrying 'session_id' (and
+        'last_driver_output') recalls what the session's previous turn
+        queried, at the same graph version (result.queries_recalled).
+
+        Args:
+            stimulus: Dict with keys 'sender', 'content', 'timestamp' (optional),
+                'session_id' and 'last_driver_output' (optional)
+            answers: If given, filled with request key -> QueryResult of
+                every query the exploration read (see replay())
+
+        Returns:
+            ExplorationResult with all findings
+        """
+        start_time = time.time()
+        turn = self._begin_turn(stimulus)
+        stats = self._new_stats()
+        self.refresh_terms()
+        execute = self._recalling_executor(turn) if turn is not None else None
+        if answers is not None:
+            execute = self._recording_executor(execute or self._execute, answers)
+
+        if self.pipeline:
+            findings, error = self._drive(self._exploration_steps(stimulus, stats["budget"]), stats, execute)
+        else:
+            findings, error = self._explore_threaded(stimulus, stats, execute)
+        threads = self._drive(self._thread_steps(stimulus, findings, stats["budget"]), stats, execute)
+
+        if turn is not None:
+            self.working_memory.end(turn, findings)
+
+        return self._exploration_result(findings, error, start_time, stats, threads)
+
+    def explore_all_bundled(self, stimulus: Dict, compatible: bool = True) -> ExplorationResult:
+        """
+        Run complete 8-lens exploration from one context bundle query.
+
+        query_context_bundle (see bundle_answers) fetches every lens's data in
+        a single round trip; the lenses then run as usual, answered from the
+        bundle.
+
+        The bundle guesses the technical terms from the stimulus alone (the
+        lenses also read conversation topics), so a lens may ask for something
+        the bundle didn't fetch:
+        - compatible=True: those requests run live (extra round trips), so the
+          findings are exactly those of explore_all()
+        - compatible=False: they are answered with the bundle's data for the
+          same query function - always one round trip, findings may differ
 
         Args:
             stimulus: Dict with keys 'sender', 'content', 'timestamp' (optional)
+            compatible: Guarantee explore_all() findings (default True)
 
         Returns:
             ExplorationResult with all findings
         """
-        import time
         start_time = time.time()
+        stats = self._new_stats()
 
-        findings: Dict[str, Finding] = {}
-        nodes_retrieved = 0
+        # Bundle answers, by request identity and (for compatible=False) by tool
+        prefetched: Dict[tuple, QueryResult] = {}
+        by_tool: Dict[str, List[QueryResult]] = {}
+        for request, result in self.bundle_answers(stimulus, stats):
+            prefetched[self.tools.request_key(*request)] = result
+            by_tool.setdefault(request[0], []).append(result)
 
-        # Define lens sequence
-        lenses = [
-            ("relational", self.explore_relational),
-            ("historical", self.explore_historical),
-            ("technical", self.explore_technical),
-            ("emotional", self.explore_emotional),
-            ("strategic", self.explore_strategic),
-            ("experiential", self.explore_experiential),
-            ("constraint", self.explore_constraint),
-            ("connective", self.explore_connective),
-        ]
+        def answer(requests: List[ToolRequest]) -> List[Optional[QueryResult]]:
+            answers = [prefetched.get(self.tools.request_key(*request)) for request in requests]
 
-        try:
-            for lens_name, explore_fn in lenses:
-                finding = explore_fn(stimulus, findings)
-                findings[lens_name] = finding
-
-                # Count nodes retrieved
-                if finding.data:
-                    if isinstance(finding.data, list):
-                        nodes_retrieved += len(finding.data)
-                    else:
-                        nodes_retrieved += 1
-
-            total_time_ms = (time.time() - start_time) * 1000
-
-            return ExplorationResult(
-                findings=findings,
-                total_time_ms=total_time_ms,
-                queries_executed=8,
-                nodes_retrieved=nodes_retrieved,
-                success=True,
-                error=None
-            )
+            # Answers used as asked can't be handed out again as stand-ins
+            for (tool, _), result in zip(requests, answers):
+                spare = by_tool.get(tool, [])
+                if result is not None and any(result is r for r in spare):
+                    spare[:] = [r for r in spare if r is not result]
 
-        except Exception as e:
-            total_time_ms = (time.time() - start_time) * 1000
-            return ExplorationResult(
-                findings=findings,
-                total_time_ms=total_time_ms,
-                queries_executed=len(findings),
-                nodes_retrieved=nodes_retrieved,
-                success=False,
-                error=str(e)
-            )
+            if not compatible and by_tool:
+                for i, (tool, _) in enumerate(requests):
+                    if answers[i] is None:
+                        spare = by_tool.get(tool)
+                        answers[i] = spare.pop(0) if spare else rows_to_query_result([], 0.0)
+
+            return answers
+
+        execute = self._prefetched_executor(answer, live=True)
+        findings, error = self._drive(self._exploration_steps(stimulus, stats["budget"]), stats, execute)
+        threads = self._drive(self._thread_steps(stimulus, findings, stats["budget"]), stats, execute)
+
+        return self._exploration_result(findings, error, start_time, stats, threads)
+
+    def bundle_answers(self, stimulus: Dict, stats: Dict = None) -> List[Tuple[ToolRequest, QueryResult]]:
+        """
+        Fetch the stimulus's context bundle (one query_context_bundle call).
+
+        replay() on these answers tells whether explore_all_bundled() gets
+        by with its one round trip.
+
+        Returns:
+            (request, QueryResult) per query the bundle answered, in lens
+            order (empty if the bundle failed)
+        """
+        self.refresh_terms()
+
+        content = stimulus.get("content", "")
+        keywords = extract_keywords(content)
+        terms = self._technical_terms(stimulus, {})
+
+        self._count([("query_context_bundle", {})], stats)
+        bundle = self.tools.query_context_bundle(
+            stimulus.get("sender", "unknown"), keywords, terms[:3], content=content
+        )
+        if any(payload.error for payload in bundle.values()):
+            return []
+        return [(request, result) for payload in bundle.values()
+                for request, result in zip(payload.requests, payload.results)]
+
+    def explore_all_anchored(self, stimulus: Dict, max_depth: int = 2, fallback: bool = True) -> ExplorationResult:
+        """
+        Run complete 8-lens exploration over the sender's graph neighborhood.
+
+        Instead of re-finding each node type by text matching, one traversal
+        (GraphTools.query_neighborhood) walks typed relationships out from the
+        sender's Partnership/Person nodes; each lens's query is answered over
+        the connected memories, with the same filters (see
+        dreamer/neighborhood.py).
+
+        Args:
+            stimulus: Dict with keys 'sender', 'content', 'timestamp' (optional)
+            max_depth: Max hops from the sender's nodes (default: 2)
+            fallback: Run the regular query for lenses whose node type the walk
+                didn't reach (default True); False keeps exploration to the
+                neighborhood (they report not found)
+
+        Returns:
+            ExplorationResult with all findings
+        """
+        start_time = time.time()
+        stats = self._new_stats()
+        self.refresh_terms()
+
+        sender = stimulus.get("sender", "unknown")
+        self._count([("query_neighborhood", {"sender": sender})], stats)
+        result = self.tools.query_neighborhood(sender, max_depth=max_depth)
+
+        if result.error and not fallback:
+            return self._exploration_result({}, result.error, start_time, stats)
+
+        neighborhood = Neighborhood(result)
+
+        def answer(requests: List[ToolRequest]) -> List[Optional[QueryResult]]:
+            return [neighborhood.answer(tool, params) for tool, params in requests]
+
+        execute = self._prefetched_executor(answer, live=fallback)
+        findings, error = self._drive(self._exploration_steps(stimulus, stats["budget"]), stats, execute)
+        threads = self._drive(self._thread_steps(stimulus, findings, stats["budget"]), stats, execute)
+
+        return self._exploration_result(findings, error, start_time, stats, threads)
+
+    async def explore_all_async(self, stimulus: Dict, answers: Dict = None) -> ExplorationResult:
+        """
+        Async explore_all: same waves and findings, awaiting each round trip.
+
+        Use with AsyncGraphTools so many explorations share one event loop.
+        Working memory needs tools with a graph version reader (AsyncGraphTools
+        has none), otherwise turns are not recalled.
+
+        Args:
+            stimulus: Dict with keys 'sender', 'content', 'timestamp' (optional),
+                'session_id' and 'last_driver_output' (optional)
+            answers: If given, filled with the answers read (see explore_all)
+
+        Returns:
+            ExplorationResult with all findings
+        """
+        start_time = time.time()
+        turn = self._begin_turn(stimulus)
+        stats = self._new_stats()
+        await self.refresh_terms_async()
+        execute = self._recalling_executor_async(turn) if turn is not None else None
+        if answers is not None:
+            execute = self._recording_executor_async(execute or self._execute_async, answers)
+
+        findings, error = await self._drive_async(self._exploration_steps(stimulus, stats["budget"]), stats, execute)
+        threads = await self._drive_async(self._thread_steps(stimulus, findings, stats["budget"]), stats, execute)
+
+        if turn is not None:
+            self.working_memory.end(turn, findings)
+
+        return self._exploration_result(findings, error, start_time, stats, threads)
+
+    def replay(self, stimulus: Dict, answers: Dict) -> Optional[ExplorationResult]:
+        """
+        Explore a stimulus on recorded answers only, without the graph.
+
+        Lenses see a stimulus only through the requests they send, so if
+        every request is among the answers another exploration read (see
+        explore_all(answers=...)), the findings are the ones a live
+        exploration would produce at that graph version.
+
+        Returns:
+            ExplorationResult (queries_executed=0), or None if the stimulus
+            asks for something the answers don't hold
+        """
+        start_time = time.time()
+        stats = self._new_stats()
+        stats["budget"] = None
+        missing = []
+
+        def execute(requests: List[ToolRequest], stats: Dict = None) -> List[QueryResult]:
+            results = [answers.get(self.tools.request_key(*request)) for request in requests]
+            missing.extend(request for request, result in zip(requests, results) if result is None)
+            return [copy.deepcopy(result) if result is not None else rows_to_query_result([], 0.0)
+                    for result in results]
+
+        findings, error = self._drive(self._exploration_steps(stimulus), stats, execute)
+        if missing:
+            return None
+        threads = self._drive(self._thread_steps(stimulus, findings), stats, execute)
+        if missing:
+            return None
+
+        return self._exploration_result(findings, error, start_time, stats, threads)
 
 
 # ============================================================================
@@ -830,8 +1829,11 @@ if __name__ == "__main__":
         print("-" * 60)
         print(f"EXPLORATION COMPLETE")
         print(f"  Total Time: {result.total_time_ms:.1f}ms")
-        print(f"  Queries: {result.queries_executed}")
+        print(f"  Queries: {result.queries_executed} ({result.round_trips} round trips, "
+              f"{result.queries_skipped} skipped as known empty)")
         print(f"  Nodes Retrieved: {result.nodes_retrieved}")
+        for finding in result.threads:
+            print(f"  ↳ {finding.lens}: {finding.synthesis[:70]}...")
         print("-" * 60)
     else:
         print(f"✗ Exploration failed: {result.error}")
@@ -0,0 +1,86 @@
+"""
+Neighborhood Answers - Lens Queries Answered From a Relationship Walk
+
+Purpose: Let the 8 lenses run on the sender's local graph neighborhood
+Owner: Felix (Mechanical shell)
+Version: 1.0
+Date: 2024-11-20
+
+GraphTools.query_neighborhood() walks typed relationships out from the
+sender's Partnership/Person nodes. Neighborhood turns those nodes back into
+the QueryResults the lenses ask for: the search is restricted to what is
+connected to the sender, so the lens code (and synthesis) is unchanged.
+
+- Each lens request is answered by its query function over the connected
+  nodes (InMemoryGraphTools on a snapshot of the neighborhood): the same
+  keyword, term, context and severity filters, ordering and limit, with
+  SEARCH_CONTAINS semantics. A connected node the lens's query wouldn't
+  match is not reported, so a finding still means "matches the message"
+- Labels the walk didn't reach return None, so the caller can fall back to
+  the regular query
+- query_related_code is never answered: its rows carry DEPENDS_ON
+  dependencies, which the walk doesn't return
+
+See: LensExplorer.explore_all_anchored() in dreamer/lenses.py
+"""
+
+import sys
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+
+from graph.memory_tools import GraphSnapshot, InMemoryGraphTools
+from graph.tools import QueryResult
+
+
+# query function -> label it reads
+ANCHORED_QUERIES = {
+    "query_partnerships": "Partnership",
+    "query_conversations": "Conversation_Memory",
+    "query_technical_context": "Technical_Context",
+    "query_technical_context_many": "Technical_Context",
+    "query_emotional_state": "Emotional_State",
+    "query_strategy_patterns": "Strategy_Pattern",
+    "query_failed_attempts": "Failed_Attempt",
+    "query_active_constraints": "Constraint",
+}
+
+
+class Neighborhood:
+    """Nodes from one query_neighborhood() result, grouped by label."""
+
+    def __init__(self, result: QueryResult):
+        """
+        Args:
+            result: QueryResult from query_neighborhood()
+        """
+        self.query_time_ms = result.query_time_ms
+        self.nodes_by_label: Dict[str, List[Dict[str, Any]]] = {}
+
+        snapshot = GraphSnapshot()
+        if result.found:
+            rows = result.data if isinstance(result.data, list) else [result.data]
+            for row in rows:
+                self.nodes_by_label.setdefault(row["label"], []).append(row["node"])
+                snapshot.nodes.append({"id": len(snapshot.nodes), "labels": [row["label"]],
+                                       "properties": row["node"]})
+        self._tools = InMemoryGraphTools(snapshot)
+
+    def __len__(self) -> int:
+        return sum(len(nodes) for nodes in self.nodes_by_label.values())
+
+    def answer(self, tool: str, params: Dict[str, Any]) -> Optional[QueryResult]:
+        """
+        Answer one lens request from the neighborhood.
+
+        Returns:
+            QueryResult (query_time_ms 0.0), or None if the walk didn't reach
+            any node this request could use (or the request can't be answered)
+        """
+        label = ANCHORED_QUERIES.get(tool)
+        if label is None or not self.nodes_by_label.get(label):
+            return None
+
+        [result] = self._tools.execute_batch([(tool, params)])
+        return None if result.error else replace(result, query_time_ms=0.0)
@@ -0,0 +1,183 @@
+"""
+Session Working Memory - What the Previous Turn of a Conversation Already Read
+
+Purpose: Let follow-up stimuli of one session skip the queries the last turn answered
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-26
+
+Opt-in: LensExplorer(working_memory=WorkingMemory()) or
+DreamerAgent(working_memory=WorkingMemory()).
+
+B01 Act 3 ("Did you figure out that race condition?") asks the graph the
+same questions Act 1 did: same partner, same technical terms, same component.
+WorkingMemory keeps, per session_id (stimulus envelope), the previous turn's
+answers keyed by request (the Cypher and normalized parameters a lens runs),
+its findings and the graph version they were read at:
+
+- A lens whose requests are the same as last turn's is answered from memory
+  with no round trip; its finding is rebuilt from identical data, so it is
+  the finding a fresh exploration would produce
+- Lenses whose inputs changed (new keywords, new terms from the conversation
+  topics) run as usual, and so does everything once the graph version moved
+- last_driver_output.content null means the conversation (re)starts: the
+  session is forgotten
+
+Each turn replaces the last one, so memory holds one turn per session;
+sessions are evicted least recently used past max_sessions or after ttl_s
+without a turn.
+
+See: docs/schemas/stimulus_envelope.md (session_id, last_driver_output)
+"""
+
+import copy
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+
+from graph.tools import QueryResult
+
+
+# Working memory defaults
+DEFAULT_MAX_SESSIONS = 256
+DEFAULT_TTL_S = 1800.0                 # 30 minutes between turns
+
+
+@dataclass
+class SessionTurn:
+    """One turn of a session: what it may recall, and what it read."""
+
+    session_id: str
+    version: Optional[int]                                   # Graph version the turn read at
+    recalled: Dict[Tuple, QueryResult] = field(default_factory=dict)  # Previous turn's answers (if still valid)
+    answers: Dict[Tuple, QueryResult] = field(default_factory=dict)   # This turn's answers
+    findings: Dict[str, Any] = field(default_factory=dict)  # This turn's findings (set at the end)
+    stored_at: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def recall(self, key: Tuple) -> Optional[QueryResult]:
+        """
+        The previous turn's answer to a request, or None if it must run.
+
+        Like a QueryCache hit: a copy with query_time_ms=0.0 and cached=True.
+        """
+        result = self.recalled.get(key)
+        if result is None:
+            return None
+        with self._lock:
+            self.answers[key] = result
+        return replace(result, data=copy.deepcopy(result.data), query_time_ms=0.0, cached=True)
+
+    def record(self, keys: List[Tuple], results: List[QueryResult]):
+        """Remember this turn's answers (failed queries are not kept)."""
+        with self._lock:
+            for key, result in zip(keys, results):
+                if not result.error:
+                    self.answers[key] = result
+
+
+class WorkingMemory:
+    """
+    Per-session answers of the previous turn, at the graph version they were read.
+
+    Thread-safe.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, ttl_s: float = DEFAULT_TTL_S):
+        """
+        Args:
+            max_sessions: Sessions kept (least recently used evicted first)
+            ttl_s: Seconds a session is kept without a new turn (0 = no expiry)
+        """
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+
+        self._sessions: "OrderedDict[str, SessionTurn]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.turns = 0
+        self.continued = 0      # Turns that could recall the previous one
+        self.resets = 0         # Sessions dropped (restart, graph moved, expired)
+        self.evictions = 0
+
+    def begin(self, session_id: str, last_driver_output: Optional[Dict[str, Any]],
+              version: Optional[int]) -> SessionTurn:
+        """
+        Start a turn of a session.
+
+        The previous turn is recalled only if the conversation continues
+        (last_driver_output has content), the graph version is known and
+        unchanged, and the turn is within ttl_s.
+
+        Args:
+            session_id: Envelope session_id
+            last_driver_output: Envelope last_driver_output ({"content", "timestamp"})
+            version: Current graph version (None = unknown, nothing is recalled)
+        """
+        turn = SessionTurn(session_id=session_id, version=version)
+        continues = bool((last_driver_output or {}).get("content"))
+
+        with self._lock:
+            self.turns += 1
+            previous = self._sessions.get(session_id)
+            if previous is None:
+                return turn
+
+            expired = self.ttl_s and time.monotonic() - previous.stored_at > self.ttl_s
+            if not continues or expired or version is None or previous.version != version:
+                del self._sessions[session_id]
+                self.resets += 1
+                return turn
+
+            self._sessions.move_to_end(session_id)
+            turn.recalled = previous.answers
+            self.continued += 1
+        return turn
+
+    def end(self, turn: SessionTurn, findings: Dict[str, Any] = None):
+        """Keep a finished turn as its session's memory (replacing the previous one)."""
+        if turn.version is None:
+            return
+        turn.findings = dict(findings or {})
+        turn.stored_at = time.monotonic()
+        turn.recalled = {}  # Only the latest turn is kept
+
+        with self._lock:
+            self._sessions[turn.session_id] = turn
+            self._sessions.move_to_end(turn.session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def previous(self, session_id: str) -> Optional[SessionTurn]:
+        """The turn a session would recall from (None if none is kept)."""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def forget(self, session_id: str = None):
+        """Drop one session, or all of them."""
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters snapshot."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "turns": self.turns,
+                "continued": self.continued,
+                "resets": self.resets,
+                "evictions": self.evictions,
+            }
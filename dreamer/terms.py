@@ -0,0 +1,311 @@
+"""
+Technical Term Extraction - One Compiled Scanner Over Stimulus and History
+
+Purpose: Find the terms the technical lens queries, in one pass, including
+         the components the graph actually knows
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-26
+
+TermExtractor compiles everything it looks for into a single regex:
+
+1. Known components: Technical_Context.component and Code_Reference.file_path
+   values from the graph (query_term_vocabulary()), as a character trie so
+   thousands of names cost one branch per character, not one try per name.
+   A mention of "stimulus_integrator", "stimulus_integrator.py" or the full
+   path yields the stored component name
+2. The generic technical patterns (files, race condition, deadlock, ...)
+3. Code-style names (snake_case, camelCase) - stimulus text only
+
+Each text is scanned once; terms come back in that priority order, then in
+text order, stimulus before historical topics. Where alternatives overlap,
+the first one wins ("race condition" no longer also yields "race").
+
+The vocabulary follows the graph version (graph/version.py): refresh() is a
+cached version read when nothing changed, and the scanner is only rebuilt
+when the set of names actually differs. With background=True, only the
+first load is inline; later version checks and reloads run on a daemon
+thread (at most one per refresh_interval_s) while extraction goes on with
+the current vocabulary.
+
+See: LensExplorer._technical_terms() in dreamer/lenses.py
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+
+from graph.tools import QueryResult
+
+
+# Background vocabulary checks at most this often (seconds), like GraphVersion
+DEFAULT_REFRESH_INTERVAL_S = 1.0
+
+# Technical patterns to look for, in term priority order. Like every
+# alternative of the scanner they start at a word boundary (\b is hoisted
+# out, so positions inside a word are skipped at once)
+TECH_PATTERNS = [
+    r'\w+\.py\b',           # Python files
+    r'\w+\.js\b',           # JS files
+    r'race\s*condition\b',   # Race condition
+    r'bug\b',               # Bug
+    r'error\b',             # Error
+    r'crash\b',             # Crash
+    r'failure\b',           # Failure
+    r'race\b',              # Race
+    r'timing\b',            # Timing
+    r'concurrency\b',       # Concurrency
+    r'thread\b',            # Thread
+    r'lock\b',              # Lock
+    r'deadlock\b',          # Deadlock
+    r'stimulus\b',          # Stimulus (project specific)
+    r'integrator\b',        # Integrator (project specific)
+    r'diffusion\b',         # Diffusion (project specific)
+]
+
+# Potential component names (snake_case, camelCase); case-sensitive
+COMPONENT_PATTERN = r'[a-z]+_[a-z_]+\b|[a-z]+[A-Z][a-zA-Z]+\b'
+
+# File stems worth matching on their own (snake_case, digits, camelCase)
+_IDENTIFIER = re.compile(r'[_\d]|[a-z][A-Z]')
+
+# Aliases must start and end on a word character for \b to hold
+_ALIAS = re.compile(r'\w(?:.*\w)?', re.DOTALL)
+
+
+# ============================================================================
+# VOCABULARY
+# ============================================================================
+
+def component_aliases(name: str) -> List[str]:
+    """
+    Lowercase spellings of a component or file path a stimulus may use.
+
+    "orchestration/stimulus_integrator.py" -> the path, "stimulus_integrator.py"
+    and "stimulus_integrator"; a plain stem ("engine") only counts when it
+    looks like an identifier.
+    """
+    name = name.strip().strip("./")
+    basename = name.rsplit("/", 1)[-1]
+    stem, extension = os.path.splitext(basename)
+
+    aliases = [name, basename]
+    if extension and len(stem) >= 4 and _IDENTIFIER.search(stem):
+        aliases.append(stem)
+    return [alias.lower() for alias in dict.fromkeys(aliases) if _ALIAS.fullmatch(alias)]
+
+
+def build_vocabulary(components: Iterable[str] = (), file_paths: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    alias -> term to query.
+
+    Component aliases yield the stored component name (what the technical
+    query matches on); file path aliases yield the file name. Components
+    win where both claim an alias.
+    """
+    vocabulary: Dict[str, str] = {}
+    for component in components:
+        if component:
+            for alias in component_aliases(str(component)):
+                vocabulary.setdefault(alias, str(component))
+    for file_path in file_paths:
+        if file_path:
+            basename = str(file_path).rsplit("/", 1)[-1]
+            for alias in component_aliases(str(file_path)):
+                vocabulary.setdefault(alias, basename)
+    return vocabulary
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex matching any of words, longest first, shaped as a character trie.
+
+    Shared prefixes are matched once, so the cost per position follows the
+    text, not the number of words.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def pattern(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: a longer word is tried before the one ending here
+        return f"(?:{body})?" if "" in node else body
+
+    return pattern(trie)
+
+
+# ============================================================================
+# EXTRACTOR
+# ============================================================================
+
+class TermExtractor:
+    """
+    Single-pass technical term scanner with a graph-derived vocabulary.
+
+    Thread-safe: extract() reads an immutable (vocabulary, scanner) pair that
+    updates swap as a whole.
+    """
+
+    def __init__(self, components: Iterable[str] = (), file_paths: Iterable[str] = (),
+                 refresh_interval_s: float = DEFAULT_REFRESH_INTERVAL_S):
+        """
+        Args:
+            components: Known component names (Technical_Context.component)
+            file_paths: Known file paths (Code_Reference.file_path)
+            refresh_interval_s: Min seconds between background refreshes
+        """
+        self.version: Optional[int] = None  # Graph version the vocabulary was loaded at
+        self.loaded = False                  # Vocabulary came from a graph at least once
+        self.refresh_interval_s = refresh_interval_s
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._refreshed_at = 0.0
+        self._state: Tuple[Dict[str, str], re.Pattern, List[str]] = self._compile({})
+        self.update(components, file_paths)
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    @staticmethod
+    def _compile(vocabulary: Dict[str, str]) -> Tuple[Dict[str, str], re.Pattern, List[str]]:
+        """(vocabulary, scanner, group names in priority order)."""
+        groups = [(f"p{i}", pattern) for i, pattern in enumerate(TECH_PATTERNS)]
+        groups.append(("component", f"(?-i:{COMPONENT_PATTERN})"))
+        if vocabulary:
+            groups.insert(0, ("known", rf"{trie_pattern(sorted(vocabulary))}\b"))
+
+        alternatives = "|".join(f"(?P<{name}>{pattern})" for name, pattern in groups)
+        scanner = re.compile(rf"\b(?:{alternatives})", re.IGNORECASE)
+        return vocabulary, scanner, [name for name, _ in groups]
+
+    def update(self, components: Iterable[str] = (), file_paths: Iterable[str] = ()) -> bool:
+        """
+        Replace the vocabulary.
+
+        Returns:
+            True if it changed (the scanner was rebuilt)
+        """
+        vocabulary = build_vocabulary(components, file_paths)
+        if vocabulary == self._state[0]:
+            return False
+        self._state = self._compile(vocabulary)
+        return True
+
+    def load(self, result: QueryResult, version: Optional[int] = None) -> bool:
+        """
+        Take the vocabulary from a query_term_vocabulary() result.
+
+        A failed query leaves the current vocabulary (and version) alone, so
+        the next refresh() tries again.
+
+        Returns:
+            True if the scanner was rebuilt
+        """
+        if result.error:
+            return False
+
+        rows = result.data if isinstance(result.data, list) else ([result.data] if result.found else [])
+        components, file_paths = [], []
+        for row in rows:
+            components.extend(row.get("components") or [])
+            file_paths.extend(row.get("file_paths") or [])
+
+        with self._lock:
+            self.version = version
+            self.loaded = True
+            return self.update(components, file_paths)
+
+    def refresh(self, tools, citizen: str = "felix", background: bool = False) -> bool:
+        """
+        Reload the vocabulary if the graph version moved since the last load.
+
+        tools.graph_version() is cached for its check interval, so when
+        nothing changed this costs no round trip.
+
+        Args:
+            tools: GraphTools or InMemoryGraphTools
+            citizen: Whose components to load
+            background: Once a vocabulary is loaded, check (and reload) on a
+                daemon thread and return at once; the first load is inline
+
+        Returns:
+            True if the scanner was rebuilt (background: always False, the
+            new scanner is swapped in when it is ready)
+        """
+        if background and self.loaded:
+            now = time.monotonic()
+            with self._refresh_lock:
+                if self._refreshing or now - self._refreshed_at < self.refresh_interval_s:
+                    return False
+                self._refreshing = True
+                self._refreshed_at = now
+            threading.Thread(
+                target=self._refresh_background, args=(tools, citizen), name="term-vocabulary", daemon=True
+            ).start()
+            return False
+
+        version = tools.graph_version()
+        if self.loaded and version == self.version:
+            return False
+        return self.load(tools.query_term_vocabulary(citizen), version)
+
+    def _refresh_background(self, tools, citizen: str):
+        """refresh() on a daemon thread; a failure leaves the current vocabulary."""
+        try:
+            self.refresh(tools, citizen)
+        except Exception:
+            pass
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    def extract(self, stimulus_content: str, historical_data: List[Dict] = None) -> List[str]:
+        """
+        Technical terms of a stimulus and its conversation history.
+
+        Looks for:
+        - Components and files the graph knows (their stored names)
+        - File names (*.py, *.js) and technical patterns (race condition, ...)
+        - Code-style component names, in the stimulus only
+
+        Returns:
+            Unique terms, by pattern priority then position
+        """
+        vocabulary, scanner, groups = self._state
+
+        texts = [(stimulus_content or "", True)]
+        if historical_data:
+            for conv in historical_data:
+                texts.append((conv.get('topic', '') or "", False))
+                texts.append((" ".join(conv.get('key_points', []) or []), False))
+
+        found = []
+        offset = 0
+        for text, components in texts:
+            for match in scanner.finditer(text):
+                group = match.lastgroup
+                if group == "component":
+                    if components:
+                        found.append((groups.index(group), offset + match.start(), match.group()))
+                    continue
+                term = match.group().lower()
+                if group == "known":
+                    term = vocabulary.get(term, term)
+                found.append((groups.index(group), offset + match.start(), term))
+            offset += len(text) + 1
+
+        found.sort(key=lambda entry: entry[:2])
+        return list(dict.fromkeys(term for _, _, term in found))  # Unique, preserving order
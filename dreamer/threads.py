@@ -0,0 +1,319 @@
+"""
+Thread Following - Breadth-First Follow-Ups of Findings Worth a Deeper Look
+
+Purpose: Act on Finding.needs_deeper_exploration with bounded, batched follow-ups
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-26
+
+M02 "Thread Following": the historical and technical lenses flag their
+findings for deeper exploration. The threads worth pulling:
+
+- Historical: the key points of past conversations name technical issues
+  (terms, via the technical term scanner) -> Technical_Context
+- Technical: a context names its related code -> Code_Reference
+- Each follow-up opens the next level: a context found from a conversation
+  names its code, a code reference names its dependencies
+
+ThreadFollower expands them breadth-first, one round trip per depth level:
+every term of a level shares one query_technical_context_many (rows are
+mapped back to their threads by matched terms), and the level's code lookups
+ride in the same batch. Follow-ups therefore cost max_depth round trips at
+most, however many key points there are.
+
+Bounds:
+- max_depth levels (V1: 2)
+- max_queries requests over all levels
+- max_per_lens follow-up findings per originating lens (V1: 3)
+- A node already in a lens finding (or an earlier follow-up) is never
+  reported again; a term or file is only queried once
+
+Follow-ups come back as Findings with lens "technical_deep" / "code_deep" and
+related_findings=[originating lens].
+
+See: LensExplorer(follow_threads=True) in dreamer/lenses.py
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Set
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+
+from graph.tools import QueryResult, ToolRequest, node_properties
+
+
+# Lenses whose flagged findings have threads to follow, and what they lead to
+THREAD_SOURCES = {
+    "historical": "technical",   # Key points -> technical terms
+    "technical": "code",         # related_code -> files
+}
+
+# Follow-up finding lens per thread kind
+THREAD_LENSES = {
+    "technical": "technical_deep",
+    "code": "code_deep",
+}
+
+# V1 limits (M02)
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_PER_LENS = 3
+DEFAULT_MAX_QUERIES = 8
+
+# Rows the technical lens reports at most (query_technical_context_many default limit)
+LENS_ROWS = 5
+
+
+@dataclass
+class Thread:
+    """One thread to follow: a term or file, and the lens it started from."""
+
+    kind: str           # "technical" (term) or "code" (file)
+    key: str            # Term or file name
+    origin: str         # Lens whose finding it came from
+    depth: int = 1      # Level it is queried at
+
+
+def _rows(data: Any) -> List[Any]:
+    """Finding/QueryResult data as a list of rows."""
+    if data is None:
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+def _node_key(node: Any) -> Optional[str]:
+    """Identity of a node for deduplication (id, else file path)."""
+    node = node_properties(node)
+    if not isinstance(node, dict):
+        return None
+    key = node.get("id") or node.get("file_path")
+    return str(key) if key else None
+
+
+def _code_row(row: Dict) -> tuple:
+    """(code reference, dependencies) of a query_related_code row, as property dicts."""
+    code = node_properties(row.get("cr") or {}) if "cr" in row else row
+    deps = [node_properties(dep) for dep in row.get("dependencies") or []]
+    return code, [dep for dep in deps if isinstance(dep, dict)]
+
+
+def _nodes(data: Any) -> Iterable[Dict]:
+    """Every node in finding data, including code rows' dependencies."""
+    for row in _rows(data):
+        row = node_properties(row)
+        if isinstance(row, dict) and "cr" in row:
+            code, deps = _code_row(row)
+            yield code
+            yield from deps
+        elif isinstance(row, dict):
+            yield row
+
+
+class ThreadFollower:
+    """Bounded breadth-first follow-up of flagged findings, one batch per level."""
+
+    def __init__(
+        self,
+        extract_terms: Callable[[str], List[str]],
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_queries: int = DEFAULT_MAX_QUERIES,
+        max_per_lens: int = DEFAULT_MAX_PER_LENS
+    ):
+        """
+        Args:
+            extract_terms: Text -> technical terms (TermExtractor.extract)
+            max_depth: Levels to expand (1 = only the flagged findings' own threads)
+            max_queries: Requests over all levels
+            max_per_lens: Follow-up findings per originating lens
+        """
+        self.extract_terms = extract_terms
+        self.max_depth = max_depth
+        self.max_queries = max_queries
+        self.max_per_lens = max_per_lens
+
+    def seed(self, findings: Dict[str, Any]) -> List[Thread]:
+        """Depth 1 threads of the findings flagged for deeper exploration."""
+        threads = []
+        for lens_name, kind in THREAD_SOURCES.items():
+            finding = findings.get(lens_name)
+            if (finding is None or not finding.needs_deeper_exploration or not finding.data
+                    or finding.timed_out or finding.error):
+                continue
+
+            for row in map(node_properties, _rows(finding.data)):
+                if not isinstance(row, dict):
+                    continue
+                if kind == "technical":
+                    keys = self.extract_terms(" ".join(row.get("key_points") or []))
+                else:
+                    keys = [str(path) for path in row.get("related_code") or [] if path]
+                threads.extend(Thread(kind, key, lens_name) for key in keys)
+        return threads
+
+    def steps(self, findings: Dict[str, Any], queried_terms: Iterable[str] = (),
+              budget=None) -> Generator[List[ToolRequest], List[QueryResult], List[Any]]:
+        """
+        Follow the threads of findings as steps: one batch per depth level.
+
+        Stops early when a level has nothing new to query, the query or
+        finding budgets are spent, the exploration budget has run out, or a
+        round trip fails; follow-ups found up to then are kept.
+
+        Args:
+            findings: lens_name -> Finding of the exploration
+            queried_terms: Terms the lenses already queried (not repeated)
+            budget: ExplorationBudget (remaining_ms() <= 0 stops following)
+
+        Returns:
+            Follow-up Findings, in the order they were found
+        """
+        nodes = [node for finding in findings.values() for node in _nodes(finding.data)]
+        visited = {key for key in map(_node_key, nodes) if key}
+        queried = {("technical", term.lower()) for term in queried_terms}
+        # Files a lens already reported need no lookup of their own
+        queried |= {("code", str(node["file_path"]).lower()) for node in nodes if node.get("file_path")}
+
+        follow_ups: List[Any] = []
+        per_lens: Dict[str, int] = {}
+        queries = 0
+        frontier = self.seed(findings)
+
+        for depth in range(1, self.max_depth + 1):
+            # A file lookup yields one follow-up at most: none beyond the origin's room
+            level: Dict[tuple, Thread] = {}
+            lookups: Dict[str, int] = {}
+            for thread in frontier:
+                ident = (thread.kind, thread.key.lower())
+                room = self.max_per_lens - per_lens.get(thread.origin, 0)
+                if thread.kind == "code":
+                    room -= lookups.get(thread.origin, 0)
+                if ident in queried or ident in level or room <= 0:
+                    continue
+                level[ident] = thread
+                if thread.kind == "code":
+                    lookups[thread.origin] = lookups.get(thread.origin, 0) + 1
+
+            if not level or queries >= self.max_queries:
+                break
+            if budget is not None and budget.remaining_ms() <= 0:
+                break
+
+            technical = [thread for thread in level.values() if thread.kind == "technical"]
+            code = [thread for thread in level.values() if thread.kind == "code"]
+
+            # All terms of the level in one lookup, then code files while queries last
+            requests: List[ToolRequest] = []
+            if technical:
+                requests.append(("query_technical_context_many", {
+                    "terms": [thread.key for thread in technical],
+                    # Room for the follow-ups plus rows a lens already reported (skipped)
+                    "limit": self.max_per_lens * len({thread.origin for thread in technical}) + LENS_ROWS
+                }))
+            code = code[:max(0, self.max_queries - queries - len(requests))]
+            requests.extend(("query_related_code", {
+                "filename": thread.key, "include_dependencies": True, "limit": 1
+            }) for thread in code)
+
+            queries += len(requests)
+            queried.update((thread.kind, thread.key.lower()) for thread in technical + code)
+
+            try:
+                results = yield requests
+            except Exception:
+                break  # Round trip lost or out of time: keep what was followed so far
+
+            frontier = []
+            results = iter(results)
+            if technical:
+                frontier.extend(self._technical_follow_ups(
+                    next(results), technical, depth, visited, per_lens, follow_ups
+                ))
+            for thread, result in zip(code, results):
+                frontier.extend(self._code_follow_ups(
+                    result, thread, depth, visited, per_lens, follow_ups
+                ))
+
+        return follow_ups
+
+    # ========================================================================
+    # FOLLOW-UP FINDINGS
+    # ========================================================================
+
+    def _take(self, node: Dict, origin: str, visited: Set[str], per_lens: Dict[str, int]) -> bool:
+        """Claim a node for a follow-up: new, and the origin lens still has room."""
+        key = _node_key(node)
+        if key is not None and key in visited:
+            return False
+        if key is not None:
+            visited.add(key)
+        if per_lens.get(origin, 0) >= self.max_per_lens:
+            return False
+        per_lens[origin] = per_lens.get(origin, 0) + 1
+        return True
+
+    def _technical_follow_ups(self, result: QueryResult, threads: List[Thread], depth: int,
+                              visited: Set[str], per_lens: Dict[str, int],
+                              follow_ups: List) -> List[Thread]:
+        """technical_deep findings of one level's term lookup; returns their code threads."""
+        from dreamer.lenses import Finding  # lenses imports this module
+
+        if not result.found:
+            return []
+
+        by_term = {thread.key.lower(): thread for thread in threads}
+        rows = _rows(result.data)
+        matched = result.matched_terms or [[] for _ in rows]
+
+        next_threads = []
+        for row, terms in zip(map(node_properties, rows), matched):
+            thread = next((by_term[term.lower()] for term in terms or [] if term.lower() in by_term), threads[0])
+            if not isinstance(row, dict) or not self._take(row, thread.origin, visited, per_lens):
+                continue
+
+            follow_ups.append(Finding(
+                lens=THREAD_LENSES["technical"],
+                data=row,
+                synthesis=(f"From {thread.origin} ({thread.key}): {row.get('component', 'Unknown')} - "
+                           f"{row.get('issue_type', 'Unknown')}. {row.get('description', 'Unknown')}. "
+                           f"Status: {row.get('status', 'Unknown')}."),
+                confidence=result.confidence,
+                needs_deeper_exploration=depth < self.max_depth,
+                query_time_ms=result.query_time_ms,
+                related_findings=[thread.origin]
+            ))
+            next_threads.extend(Thread("code", str(path), thread.origin, depth + 1)
+                                for path in row.get("related_code") or [] if path)
+        return next_threads
+
+    def _code_follow_ups(self, result: QueryResult, thread: Thread, depth: int,
+                         visited: Set[str], per_lens: Dict[str, int],
+                         follow_ups: List) -> List[Thread]:
+        """code_deep findings of one file lookup; returns their dependency threads."""
+        from dreamer.lenses import Finding  # lenses imports this module
+
+        if not result.found:
+            return []
+
+        next_threads = []
+        for row in _rows(result.data):
+            row = node_properties(row)
+            if not isinstance(row, dict):
+                continue
+            code, deps = _code_row(row)
+            if not self._take(code, thread.origin, visited, per_lens):
+                continue
+
+            deps_str = ", ".join(dep.get("file_path", "?") for dep in deps[:3]) or "none identified"
+            follow_ups.append(Finding(
+                lens=THREAD_LENSES["code"],
+                data=row,
+                synthesis=(f"From {thread.origin} ({thread.key}): {code.get('file_path', 'Unknown')}. "
+                           f"{code.get('description', 'Unknown')}. Depends on: {deps_str}."),
+                confidence=result.confidence,
+                needs_deeper_exploration=depth < self.max_depth and bool(deps),
+                query_time_ms=result.query_time_ms,
+                related_findings=[thread.origin]
+            ))
+            next_threads.extend(Thread("code", str(dep["file_path"]), thread.origin, depth + 1)
+                                for dep in deps if dep.get("file_path"))
+        return next_threads
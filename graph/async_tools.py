@@ -0,0 +1,291 @@
+"""
+Async Graph Tools - asyncio Mirror of the V1 Query Functions
+
+Purpose: Non-blocking graph access for asyncio front ends (Telegram)
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+AsyncGraphTools exposes the same 8 query functions and execute_batch() as
+GraphTools, as coroutines on an asyncio FalkorDB client. Cypher, parameters
+and result parsing are shared with GraphTools (BaseGraphTools), so both
+return identical QueryResults.
+
+One AsyncGraphTools can serve hundreds of concurrent dreams: connections
+come from the bounded asyncio pool for host:port (graph/pool.py).
+
+See: graph/tools.py for the query function documentation
+"""
+
+from typing import List, Dict, Any, Optional
+import time
+
+from graph.tools import BaseGraphTools, LensPayload, QueryResult, ToolRequest, SEARCH_CONTAINS
+from graph.pool import AsyncFalkorDBPool, get_async_pool
+
+# asyncio FalkorDB client (pip install FalkorDB)
+try:
+    from falkordb.asyncio import FalkorDB as AsyncFalkorDB
+    from falkordb.asyncio.query_result import QueryResult as AsyncFalkorQueryResult
+except ImportError:
+    AsyncFalkorDB = None
+    AsyncFalkorQueryResult = None
+
+
+class AsyncGraphTools(BaseGraphTools):
+    """
+    8 query functions for Dreamer memory access, as coroutines.
+
+    Same anti-hallucination guarantee as GraphTools: actual nodes or None.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        graph_name: str = "strange_loop",
+        pool: AsyncFalkorDBPool = None,
+        search_mode: str = SEARCH_CONTAINS
+    ):
+        """
+        Initialize asyncio FalkorDB connection.
+
+        Args:
+            host: FalkorDB host (default: localhost)
+            port: FalkorDB port (default: 6379)
+            graph_name: Graph database name (default: strange_loop)
+            pool: Pool to borrow from (default: get_async_pool(host, port))
+            search_mode: SEARCH_CONTAINS or SEARCH_FULLTEXT (see GraphTools)
+        """
+        if AsyncFalkorDB is None:
+            raise ImportError("FalkorDB not installed. Run: pip install FalkorDB")
+
+        self.pool = pool or get_async_pool(host, port)
+        self.db = self.pool.db
+        self.graph = self.pool.select_graph(graph_name)
+        self.graph_name = graph_name
+        self._set_search_mode(search_mode)
+
+    async def _execute_query(self, cypher: str, params: Dict[str, Any] = None) -> QueryResult:
+        """
+        Execute Cypher query and return structured result.
+
+        Args:
+            cypher: Cypher query string
+            params: Query parameters
+
+        Returns:
+            QueryResult with found/data/confidence/time
+        """
+        start_time = time.perf_counter()
+        params = params or {}
+
+        try:
+            result = await self.graph.query(cypher, params)
+            query_time_ms = (time.perf_counter() - start_time) * 1000
+            return self._to_query_result(result, query_time_ms)
+
+        except Exception as e:
+            query_time_ms = (time.perf_counter() - start_time) * 1000
+            return QueryResult(
+                found=False,
+                data=None,
+                confidence=0.0,
+                query_time_ms=query_time_ms,
+                error=str(e)
+            )
+
+    async def execute_batch(self, requests: List[ToolRequest]) -> List[QueryResult]:
+        """
+        Run several query functions in one network round trip.
+
+        Async equivalent of GraphTools.execute_batch().
+
+        Args:
+            requests: List of (query function name, kwargs) tuples
+
+        Returns:
+            One QueryResult per request, in request order
+        """
+        if not requests:
+            return []
+
+        built = [self.build_query(tool, params) for tool, params in requests]
+
+        if len(requests) == 1:
+            return [await self._execute_query(*built[0])]
+
+        start_time = time.perf_counter()
+
+        try:
+            pipe = self.db.connection.pipeline(transaction=False)
+            for command in self._graph_query_commands(built):
+                pipe.execute_command(*command)
+            responses = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            return self._batch_failure(requests, e, (time.perf_counter() - start_time) * 1000)
+
+        total_ms = (time.perf_counter() - start_time) * 1000
+
+        parsed = []
+        for response in responses:
+            if isinstance(response, Exception):
+                parsed.append(response)
+                continue
+            try:
+                result = AsyncFalkorQueryResult(self.graph)
+                await result.parse(response)
+                parsed.append(result)
+            except Exception as e:
+                parsed.append(e)
+
+        return self._batch_results(requests, parsed, total_ms)
+
+    # ========================================================================
+    # THE 8 QUERY FUNCTIONS (see GraphTools for documentation)
+    # ========================================================================
+
+    async def query_partnerships(self, partner_id: str, citizen: str = "felix") -> QueryResult:
+        """Find partnership information for a specific partner."""
+        return await self._execute_query(*self._build_query_partnerships(partner_id, citizen))
+
+    async def query_conversations(
+        self,
+        partner_id: str,
+        keywords: Optional[List[str]] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find conversations with a partner, optionally filtered by topic."""
+        return await self._execute_query(*self._build_query_conversations(partner_id, keywords, citizen, limit))
+
+    async def query_technical_context(
+        self,
+        term: str,
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find technical information about code, systems, or bugs."""
+        return await self._execute_query(*self._build_query_technical_context(term, issue_type, citizen, limit))
+
+    async def query_technical_context_many(
+        self,
+        terms: List[str],
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find technical information matching any of several terms, in one query."""
+        return await self._execute_query(*self._build_query_technical_context_many(terms, issue_type, citizen, limit))
+
+    async def query_emotional_state(
+        self,
+        context_similar_to: str,
+        emotion: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 3
+    ) -> QueryResult:
+        """Find emotional patterns for situations."""
+        return await self._execute_query(*self._build_query_emotional_state(context_similar_to, emotion, citizen, limit))
+
+    async def query_strategy_patterns(
+        self,
+        situation_type: str,
+        min_success_rate: float = 0.5,
+        citizen: str = "felix",
+        limit: int = 3
+    ) -> QueryResult:
+        """Find proven approaches for situations."""
+        return await self._execute_query(*self._build_query_strategy_patterns(situation_type, min_success_rate, citizen, limit))
+
+    async def query_related_code(
+        self,
+        filename: str,
+        citizen: str = "felix",
+        include_dependencies: bool = True,
+        limit: int = 5
+    ) -> QueryResult:
+        """Find code file information and dependencies."""
+        return await self._execute_query(*self._build_query_related_code(filename, citizen, include_dependencies, limit))
+
+    async def query_failed_attempts(
+        self,
+        context: str,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find past failures to avoid repeating."""
+        return await self._execute_query(*self._build_query_failed_attempts(context, citizen, limit))
+
+    async def query_active_constraints(
+        self,
+        constraint_type: Optional[str] = None,
+        min_severity: str = "medium",
+        citizen: str = "felix",
+        limit: int = 10,
+        component: Optional[str] = None
+    ) -> QueryResult:
+        """Find active pressures and deadlines."""
+        return await self._execute_query(*self._build_query_active_constraints(
+            constraint_type, min_severity, citizen, limit, component
+        ))
+
+    async def query_neighborhood(
+        self,
+        sender: str,
+        citizen: str = "felix",
+        max_depth: int = 2,
+        limit: int = 200,
+        relationships: Optional[List[str]] = None
+    ) -> QueryResult:
+        """Memories connected to the sender, by walking typed relationships."""
+        return await self._execute_query(*self._build_query_neighborhood(
+            sender, citizen, max_depth, limit, relationships
+        ))
+
+    async def query_term_vocabulary(self, citizen: str = "felix") -> QueryResult:
+        """Component names and file paths the graph knows, for term extraction."""
+        return await self._execute_query(*self._build_query_term_vocabulary(citizen))
+
+    async def query_context_bundle(
+        self,
+        sender: str,
+        keywords: Optional[List[str]] = None,
+        terms: Optional[List[str]] = None,
+        citizen: str = "felix",
+        content: str = ""
+    ) -> Dict[str, LensPayload]:
+        """Fetch the data for all 8 lenses in one Cypher statement."""
+        cypher, params = self._build_context_bundle(sender, keywords, terms, citizen, content)
+        start_time = time.perf_counter()
+
+        try:
+            result = await self.graph.query(cypher, params)
+        except Exception as e:
+            return self._bundle_failure(e)
+
+        return self._bundle_payloads(self._bundle_row(result), params, (time.perf_counter() - start_time) * 1000)
+
+
+# ============================================================================
+# USAGE EXAMPLE
+# ============================================================================
+
+if __name__ == "__main__":
+    import asyncio
+
+    async def main():
+        tools = AsyncGraphTools(host="localhost", port=6379)
+        results = await tools.execute_batch([
+            ("query_partnerships", {"partner_id": "nicolas"}),
+            ("query_active_constraints", {}),
+        ])
+        for result in results:
+            print(f"found={result.found}, time={result.query_time_ms:.2f}ms, error={result.error}")
+
+    try:
+        asyncio.run(main())
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        print("Make sure FalkorDB is running: docker run -p 6379:6379 falkordb/falkordb")
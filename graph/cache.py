@@ -0,0 +1,171 @@
+"""
+Query Result Cache - Graph-Versioned LRU/TTL Cache for GraphTools
+
+Purpose: Skip re-querying nodes that rarely change (partnerships, constraints, strategies)
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+Opt-in: GraphTools(cache=QueryCache()).
+
+- Keyed by (graph, cypher, normalized params)
+- A graph's entries are invalidated when its version moves (graph/version.py);
+  one cache shared by GraphTools on several graphs tracks each version apart
+- Bounded by entry count, total estimated bytes and per-entry TTL
+- Hits return a copy of the stored QueryResult with query_time_ms=0.0
+  and cached=True; data is identical, so synthesis output is unchanged
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, Optional, Tuple
+
+from graph.tools import QueryResult, normalize_params
+
+
+# Cache defaults
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024   # 16 MB
+DEFAULT_TTL_S = 300.0                  # 5 minutes
+
+
+def estimate_bytes(value: Any) -> int:
+    """Rough in-memory size of a cached value (repr length)."""
+    return len(repr(value))
+
+
+class QueryCache:
+    """
+    LRU + TTL cache of QueryResults, invalidated by graph version.
+
+    Thread-safe. Only successful results (no error) are stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_s: float = DEFAULT_TTL_S
+    ):
+        """
+        Args:
+            max_entries: Max cached results
+            max_bytes: Memory cap across all entries (estimated)
+            ttl_s: Seconds an entry stays valid (0 = no expiry)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+
+        # key -> (result, size_bytes, stored_at)
+        self._entries: "OrderedDict[Tuple, Tuple[QueryResult, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._versions: Dict[str, int] = {}  # graph name -> version its entries were stored at
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(graph_name: str, cypher: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """Cache key for one query."""
+        return (graph_name, cypher, normalize_params(params))
+
+    def _check_version(self, graph_name: str, version: int):
+        """Drop a graph's entries if it moved since they were stored."""
+        if self._versions.get(graph_name) == version:
+            return
+        stale = [key for key in self._entries if key[0] == graph_name]
+        for key in stale:
+            self._bytes -= self._entries.pop(key)[1]
+        self.invalidations += len(stale)
+        self._versions[graph_name] = version
+
+    def get(self, key: Tuple, version: int) -> Optional[QueryResult]:
+        """
+        Look up a query result.
+
+        Args:
+            key: From make_key()
+            version: Current version of the key's graph
+
+        Returns:
+            Copy of the cached QueryResult (cached=True, 0 ms) or None on miss
+        """
+        with self._lock:
+            self._check_version(key[0], version)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, size, stored_at = entry
+            if self.ttl_s and time.monotonic() - stored_at > self.ttl_s:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return replace(result, data=copy.deepcopy(result.data), query_time_ms=0.0, cached=True)
+
+    def put(self, key: Tuple, version: int, result: QueryResult):
+        """Store a successful query result computed at version `version` of the key's graph."""
+        if result.error is not None:
+            return
+
+        stored = replace(result, data=copy.deepcopy(result.data))
+        size = estimate_bytes(key) + estimate_bytes(stored.data)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._check_version(key[0], version)
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (stored, size, time.monotonic())
+            self._bytes += size
+
+            # Evict least recently used until within bounds
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and occupancy snapshot."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "graph_versions": dict(self._versions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
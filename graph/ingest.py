@@ -0,0 +1,259 @@
+"""
+Bulk Ingestion - Batched UNWIND/MERGE Writes of Memory Records
+
+Purpose: Load citizen histories in a few round trips instead of thousands
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+Write paths (seed_data.py, synthetic.py, memory capture) hand lists of
+NodeRecord/RelationshipRecord to GraphIngestor instead of one graph.query()
+per node and per relationship:
+
+- One UNWIND $rows ... MERGE statement per label (or relationship type)
+  and batch of batch_size records
+- Idempotent: nodes MERGE on their key property (default "id"),
+  relationships MERGE on (source, type, target); re-ingesting updates
+  properties instead of duplicating
+- Relationship endpoints are always matched by "id": a label written with
+  another key can't be an endpoint (write_relationships() rejects it), and
+  "id" is only unique where it is the key
+- Derived properties (<prop>_lc shadows, severity_rank) are added on the
+  way in (with_derived_properties), so queries and indices see them
+- Key indices are created before the first write to a label, so MERGE and
+  relationship endpoint lookups are index seeks
+- The graph version is bumped once per ingest() (invalidates graph/cache.py)
+
+Usage:
+    ingestor = GraphIngestor(graph, db.connection, "strange_loop")
+    ingestor.ingest(
+        [NodeRecord("Person", {"id": "nicolas", "name": "Nicolas"})],
+        [RelationshipRecord("Conversation_Memory", "conv_1", "WITH_PERSON", "Person", "nicolas")]
+    )
+"""
+
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+from graph.tools import with_derived_properties
+from graph.migrations import create_index
+from graph.version import bump_graph_version
+
+
+# Rows per UNWIND statement
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class NodeRecord:
+    """One node to write, identified by properties[key]."""
+    label: str
+    properties: Dict[str, Any]
+    key: str = "id"
+
+
+@dataclass
+class RelationshipRecord:
+    """
+    One relationship between two nodes, each identified by its "id".
+
+    Endpoint labels must be keyed by "id" (NodeRecord.key): ids are not
+    unique under another key, so a record could match several nodes.
+    """
+    source_label: str
+    source_id: Any
+    type: str
+    target_label: str
+    target_id: Any
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class IngestResult:
+    """What one ingest() wrote."""
+    nodes: int = 0                  # Node records merged
+    relationships: int = 0          # Relationships merged
+    missing_endpoints: int = 0      # Relationship records skipped (endpoint not found)
+    statements: int = 0             # Round trips
+    elapsed_ms: float = 0.0
+    version: Optional[int] = None   # Graph version after the write (None if not bumped)
+
+
+def _check_name(name: str) -> str:
+    """Labels, types and keys are interpolated into Cypher: allow identifiers only."""
+    if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name or ""):
+        raise ValueError(f"Invalid label, relationship type or key: {name!r}")
+    return name
+
+
+def _batches(rows: List[Any], batch_size: int) -> Iterator[List[Any]]:
+    for i in range(0, len(rows), batch_size):
+        yield rows[i:i + batch_size]
+
+
+class GraphIngestor:
+    """Batched, idempotent writer for one FalkorDB graph."""
+
+    def __init__(
+        self,
+        graph,
+        connection: Any = None,
+        graph_name: str = "strange_loop",
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Args:
+            graph: FalkorDB graph handle (db.select_graph(name))
+            connection: Redis client for the version bump (db.connection);
+                None skips the bump (callers bump themselves)
+            graph_name: Graph database name
+            batch_size: Records per UNWIND statement
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+        self.graph = graph
+        self.connection = connection
+        self.graph_name = graph_name
+        self.batch_size = batch_size
+        self._indexed: Set[Tuple[str, str]] = set()
+        self._keys: Dict[str, Set[str]] = {}  # label -> keys its nodes were written with
+
+    def _ensure_index(self, label: str, key: str):
+        """Create the key index of a label once per ingestor."""
+        if (label, key) not in self._indexed:
+            create_index(self.graph, label, key)
+            self._indexed.add((label, key))
+
+    def write_nodes(self, records: List[NodeRecord], result: IngestResult = None) -> IngestResult:
+        """
+        MERGE nodes on their key and set their properties.
+
+        Returns:
+            IngestResult counting the records written (added to result if given)
+        """
+        result = result or IngestResult()
+
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for record in records:
+            if record.properties.get(record.key) is None:
+                raise ValueError(f"{record.label} record without key property '{record.key}'")
+            groups.setdefault((_check_name(record.label), _check_name(record.key)), []).append({
+                "key": record.properties[record.key],
+                "props": with_derived_properties(record.label, record.properties)
+            })
+
+        for (label, key), rows in groups.items():
+            self._keys.setdefault(label, set()).add(key)
+            self._ensure_index(label, key)
+            for batch in _batches(rows, self.batch_size):
+                self.graph.query(f"""
+                UNWIND $rows AS row
+                MERGE (n:{label} {{{key}: row.key}})
+                SET n += row.props
+                """, {"rows": batch})
+                result.nodes += len(batch)
+                result.statements += 1
+
+        return result
+
+    def write_relationships(self, records: List[RelationshipRecord], result: IngestResult = None) -> IngestResult:
+        """
+        MERGE relationships between existing nodes (matched by "id").
+
+        Records whose source or target doesn't exist are skipped and counted
+        in missing_endpoints.
+
+        Returns:
+            IngestResult counting the relationships written (added to result if given)
+
+        Raises:
+            ValueError: An endpoint label was written (by this ingestor) with
+                a key other than "id"
+        """
+        result = result or IngestResult()
+
+        groups: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        self._check_endpoint_keys(records, self._keys)
+        for record in records:
+            group = (_check_name(record.source_label), _check_name(record.type), _check_name(record.target_label))
+            rows = groups.setdefault(group, [])
+            rows.append({
+                "i": len(rows),
+                "src": record.source_id,
+                "dst": record.target_id,
+                "props": record.properties
+            })
+
+        for (source_label, rel_type, target_label), rows in groups.items():
+            self._ensure_index(source_label, "id")
+            self._ensure_index(target_label, "id")
+            for batch in _batches(rows, self.batch_size):
+                response = self.graph.query(f"""
+                UNWIND $rows AS row
+                MATCH (a:{source_label} {{id: row.src}}), (b:{target_label} {{id: row.dst}})
+                MERGE (a)-[r:{rel_type}]->(b)
+                SET r += row.props
+                RETURN count(r), count(DISTINCT row.i)
+                """, {"rows": batch})
+                # A row can match several (a, b) pairs: count rows, not relationships, as found
+                written, matched = response.result_set[0] if response.result_set else (0, 0)
+                result.relationships += written
+                result.missing_endpoints += len(batch) - matched
+                result.statements += 1
+
+        return result
+
+    @staticmethod
+    def _check_endpoint_keys(records: List[RelationshipRecord], keys: Dict[str, Set[str]]):
+        """Reject relationships whose endpoint label is keyed by something other than "id"."""
+        for record in records:
+            for label in (record.source_label, record.target_label):
+                if keys.get(label, {"id"}) - {"id"}:
+                    raise ValueError(
+                        f"{label} nodes are keyed by {sorted(keys[label])}, "
+                        f"but relationship endpoints are matched by 'id'"
+                    )
+
+    def ingest(
+        self,
+        nodes: List[NodeRecord] = None,
+        relationships: List[RelationshipRecord] = None,
+        bump_version: bool = True
+    ) -> IngestResult:
+        """
+        Write nodes, then relationships, then bump the graph version.
+
+        Args:
+            nodes: Node records
+            relationships: Relationship records (endpoints may be in nodes)
+            bump_version: Bump the graph version if anything was written
+                (needs a connection)
+
+        Returns:
+            IngestResult
+
+        Raises:
+            ValueError: Before anything is written, if a relationship endpoint
+                label is keyed by something other than "id"
+        """
+        start_time = time.time()
+        result = IngestResult()
+
+        keys = {label: set(label_keys) for label, label_keys in self._keys.items()}
+        for record in nodes or []:
+            keys.setdefault(record.label, set()).add(record.key)
+        self._check_endpoint_keys(relationships or [], keys)
+
+        self.write_nodes(nodes or [], result)
+        self.write_relationships(relationships or [], result)
+
+        if bump_version and self.connection is not None and (result.nodes or result.relationships):
+            result.version = bump_graph_version(self.connection, self.graph_name)
+
+        result.elapsed_ms = (time.time() - start_time) * 1000
+        return result
@@ -0,0 +1,790 @@
+"""
+In-Memory Graph Tools - The 8 Query Functions Over a Loaded Snapshot
+
+Purpose: Microsecond graph reads for hot paths, CI and benchmarks
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+InMemoryGraphTools answers the same 8 query functions (plus execute_batch(),
+query_neighborhood() and query_term_vocabulary()) as GraphTools, from a
+GraphSnapshot held in process: dict indices on label/citizen and the
+exact-match properties, node lists pre-sorted by each query's ORDER BY,
+lowercased text kept next to each node. Results follow the Cypher in graph/tools.py row for row, so lens
+findings are identical.
+
+Two ways to run it:
+- Standalone: InMemoryGraphTools(GraphSnapshot.load("snapshot.json")) -
+  no FalkorDB needed (CI, benchmarks, lens tests)
+- Hot tier: InMemoryGraphTools(backing=GraphTools(...)) - loads the graph
+  once and reloads it when the graph version moves (graph/version.py), so
+  reads stay consistent with FalkorDB without a round trip per query
+
+Free-text filters use CONTAINS semantics (SEARCH_CONTAINS); a backing
+GraphTools in SEARCH_FULLTEXT mode is rejected rather than silently answered
+differently. query_context_bundle() is answered here too, row for row like
+its Cypher, so explore_all_bundled() takes no round trip at all.
+
+Usage (write a snapshot of a FalkorDB graph):
+    python graph/memory_tools.py [host] [port] [graph_name] [output.json]
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+from graph.tools import (
+    BaseGraphTools, GraphTools, LensPayload, QueryResult, ToolRequest,
+    BUNDLE_DEFAULTS, MATCHED_TERMS_COLUMN, QUERY_FUNCTIONS, NEIGHBORHOOD_RELATIONSHIPS, SEARCH_CONTAINS, SEVERITY_RANK,
+    normalize_value, rows_to_query_result, unique_terms, with_derived_properties
+)
+
+
+# Properties matched by equality, indexed per (label, citizen)
+EXACT_PROPERTIES = {
+    "Partnership": ("partner_name_lc",),
+    "Conversation_Memory": ("partner",),
+    "Technical_Context": ("issue_type_lc",),
+    "Emotional_State": ("emotion_lc",),
+    "Constraint": ("constraint_type_lc",),
+}
+
+# ORDER BY ... DESC of each label's query function (nodes are kept in this order)
+SORT_PROPERTIES = {
+    "Conversation_Memory": "timestamp",
+    "Technical_Context": "updated_at",
+    "Emotional_State": "intensity",
+    "Strategy_Pattern": "success_rate",
+    "Failed_Attempt": "timestamp",
+}
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+@dataclass
+class GraphSnapshot:
+    """
+    A whole graph as plain data.
+
+    nodes: [{"id": int, "labels": [str], "properties": {...}}]
+    edges: [{"src": int, "type": str, "dst": int}]
+    version: Graph version the snapshot was read at (0 if unknown)
+    """
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    edges: List[Dict[str, Any]] = field(default_factory=list)
+    version: int = 0
+    graph_name: str = "strange_loop"
+
+    @classmethod
+    def from_graph(cls, graph, version: int = 0, graph_name: str = "strange_loop") -> "GraphSnapshot":
+        """
+        Read every node and relationship of a FalkorDB graph.
+
+        Args:
+            graph: FalkorDB graph handle (db.select_graph(name))
+            version: Graph version read BEFORE this call, so writes made
+                while reading leave the snapshot stale rather than "current"
+            graph_name: Graph database name
+        """
+        nodes = [
+            {"id": node.id, "labels": list(node.labels), "properties": dict(node.properties)}
+            for node, in graph.query("MATCH (n) RETURN n").result_set
+        ]
+        edges = [
+            {"src": src, "type": rel_type, "dst": dst}
+            for src, rel_type, dst in graph.query(
+                "MATCH (a)-[r]->(b) RETURN id(a), type(r), id(b)"
+            ).result_set
+        ]
+        return cls(nodes=nodes, edges=edges, version=version, graph_name=graph_name)
+
+    @classmethod
+    def from_records(cls, nodes: List[Any], relationships: List[Any] = None,
+                     graph_name: str = "strange_loop") -> "GraphSnapshot":
+        """
+        Snapshot of NodeRecords/RelationshipRecords (graph/ingest.py), as
+        GraphIngestor would write them: derived properties added, relationships
+        whose endpoint is missing skipped.
+        """
+        snapshot = cls(graph_name=graph_name)
+        ids: Dict[Tuple[str, Any], int] = {}
+        for record in nodes:
+            ids[(record.label, record.properties.get("id"))] = len(snapshot.nodes)
+            snapshot.nodes.append({"id": len(snapshot.nodes), "labels": [record.label],
+                                   "properties": with_derived_properties(record.label, record.properties)})
+        for record in relationships or []:
+            src = ids.get((record.source_label, record.source_id))
+            dst = ids.get((record.target_label, record.target_id))
+            if src is not None and dst is not None:
+                snapshot.edges.append({"src": src, "type": record.type, "dst": dst})
+        return snapshot
+
+    @classmethod
+    def load(cls, path: str) -> "GraphSnapshot":
+        """Read a snapshot written by save()."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            nodes=data.get("nodes", []),
+            edges=data.get("edges", []),
+            version=data.get("version", 0),
+            graph_name=data.get("graph_name", "strange_loop")
+        )
+
+    def save(self, path: str):
+        """Write the snapshot as JSON."""
+        with open(path, "w") as f:
+            json.dump({
+                "graph_name": self.graph_name,
+                "version": self.version,
+                "nodes": self.nodes,
+                "edges": self.edges
+            }, f, indent=1)
+
+
+@dataclass
+class _Node:
+    """An indexed node: properties plus lowercased string properties."""
+    id: int
+    label: str
+    properties: Dict[str, Any]
+    text: Dict[str, str]
+
+
+def _desc_key(prop: str) -> Callable[[_Node], Tuple]:
+    """Sort key for ORDER BY prop DESC with reverse=True (null sorts first, as in Cypher)."""
+    def key(node: _Node) -> Tuple:
+        value = node.properties.get(prop)
+        return (value is None, value if value is not None else 0)
+    return key
+
+
+def _constraint_key(node: _Node) -> Tuple:
+    """ORDER BY c.severity_rank DESC, c.deadline ASC (null deadline last)."""
+    rank = node.properties.get("severity_rank")
+    deadline = node.properties.get("deadline")
+    return (rank is not None, -(rank or 0), deadline is None, deadline or "")
+
+
+class _Index:
+    """Immutable lookup structures for one snapshot (swapped whole on reload)."""
+
+    def __init__(self, snapshot: GraphSnapshot):
+        self.version = snapshot.version
+        self.nodes: Dict[int, _Node] = {}
+        self.by_label: Dict[Tuple[str, Any], List[_Node]] = {}
+        self.exact: Dict[Tuple[str, Any, str, Any], List[_Node]] = {}
+        self.persons: Dict[Any, _Node] = {}
+        self.adjacency: Dict[int, List[Tuple[str, int]]] = {}
+        self.depends_on: Dict[int, List[int]] = {}
+
+        for raw in snapshot.nodes:
+            label = raw["labels"][0] if raw.get("labels") else ""
+            # Derived properties as graph/migrations.py would backfill them
+            properties = with_derived_properties(label, raw.get("properties", {}))
+            text = {k: v.lower() for k, v in properties.items() if isinstance(v, str)}
+            node = _Node(raw["id"], label, properties, text)
+            self.nodes[node.id] = node
+            self.by_label.setdefault((label, properties.get("citizen")), []).append(node)
+            if label == "Person":
+                self.persons.setdefault(properties.get("id"), node)
+
+        for (label, _), nodes in self.by_label.items():
+            if label in SORT_PROPERTIES:
+                nodes.sort(key=_desc_key(SORT_PROPERTIES[label]), reverse=True)
+            elif label == "Constraint":
+                nodes.sort(key=_constraint_key)
+
+        # Exact-match indices keep the sorted order
+        for (label, citizen), nodes in self.by_label.items():
+            for prop in EXACT_PROPERTIES.get(label, ()):
+                for node in nodes:
+                    value = node.properties.get(prop)
+                    if value is not None:
+                        self.exact.setdefault((label, citizen, prop, value), []).append(node)
+
+        for edge in snapshot.edges:
+            src, rel_type, dst = edge["src"], edge["type"], edge["dst"]
+            if src not in self.nodes or dst not in self.nodes:
+                continue
+            self.adjacency.setdefault(src, []).append((rel_type, dst))
+            self.adjacency.setdefault(dst, []).append((rel_type, src))
+            if rel_type == "DEPENDS_ON":
+                self.depends_on.setdefault(src, []).append(dst)
+
+    def label(self, label: str, citizen: str) -> List[_Node]:
+        return self.by_label.get((label, citizen), [])
+
+    def lookup(self, label: str, citizen: str, prop: str, value: Any) -> List[_Node]:
+        return self.exact.get((label, citizen, prop, value), [])
+
+
+def _contains(node: _Node, prop: str, needle: str) -> bool:
+    """toLower(node.prop) CONTAINS toLower(needle); false for missing/non-string."""
+    text = node.text.get(prop)
+    return text is not None and needle.lower() in text
+
+
+def _take(nodes, limit: int) -> List[_Node]:
+    """First `limit` nodes of an iterable (LIMIT)."""
+    rows = []
+    for node in nodes:
+        if len(rows) >= limit:
+            break
+        rows.append(node)
+    return rows
+
+
+def _properties(value: Any) -> Any:
+    """Replace nodes by their properties in an answer row (as GraphTools returns them)."""
+    if isinstance(value, _Node):
+        return value.properties
+    if isinstance(value, dict):
+        return {k: _properties(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_properties(v) for v in value]
+    return value
+
+
+# ============================================================================
+# IN-MEMORY GRAPH TOOLS
+# ============================================================================
+
+class InMemoryGraphTools(BaseGraphTools):
+    """
+    8 query functions for Dreamer memory access, answered in process.
+
+    Same anti-hallucination guarantee as GraphTools: actual nodes (from the
+    snapshot) or None. Thread-safe; a reload swaps the indices atomically.
+    """
+
+    def __init__(
+        self,
+        snapshot: Optional[GraphSnapshot] = None,
+        backing: Optional[GraphTools] = None
+    ):
+        """
+        Args:
+            snapshot: Graph to serve (default: loaded from backing)
+            backing: GraphTools to load from, reload from when its graph
+                version moves
+
+        Raises:
+            ValueError: Without snapshot and backing, or if backing uses
+                a search mode other than SEARCH_CONTAINS
+        """
+        if snapshot is None and backing is None:
+            raise ValueError("InMemoryGraphTools needs a snapshot or a backing GraphTools")
+        if backing is not None and backing.search_mode != SEARCH_CONTAINS:
+            raise ValueError(
+                f"InMemoryGraphTools answers {SEARCH_CONTAINS} semantics only "
+                f"(backing uses {backing.search_mode})"
+            )
+
+        self.backing = backing
+        self.graph_name = backing.graph_name if backing else snapshot.graph_name
+        self._reload_lock = threading.Lock()
+        self._index = _Index(snapshot) if snapshot is not None else self._load_backing()
+
+    @classmethod
+    def from_file(cls, path: str) -> "InMemoryGraphTools":
+        """Standalone tools over a snapshot file (see GraphSnapshot.save)."""
+        return cls(GraphSnapshot.load(path))
+
+    # ========================================================================
+    # SNAPSHOT LIFECYCLE
+    # ========================================================================
+
+    def graph_version(self) -> int:
+        """Graph version of the snapshot being served."""
+        return self._index.version
+
+    def _load_backing(self) -> _Index:
+        """Index a fresh snapshot of the backing graph."""
+        version = self.backing.graph_version()
+        return _Index(GraphSnapshot.from_graph(self.backing.graph, version, self.graph_name))
+
+    def refresh(self) -> bool:
+        """
+        Reload from the backing graph if its version moved.
+
+        Called before every query; GraphVersion caches the version for its
+        check interval, so this is usually free.
+
+        Returns:
+            True if the snapshot was reloaded
+        """
+        if self.backing is None or self.backing.graph_version() == self._index.version:
+            return False
+
+        with self._reload_lock:
+            # Another thread may have reloaded while we waited
+            if self.backing.graph_version() == self._index.version:
+                return False
+            self._index = self._load_backing()
+            return True
+
+    def load(self, snapshot: GraphSnapshot):
+        """Serve a different snapshot (standalone use)."""
+        self._index = _Index(snapshot)
+
+    def __len__(self) -> int:
+        return len(self._index.nodes)
+
+    def nodes(self) -> List[_Node]:
+        """Every node being served (with derived properties), in snapshot order."""
+        return list(self._index.nodes.values())
+
+    # ========================================================================
+    # EXECUTION
+    # ========================================================================
+
+    def _run(self, tool: str, params: Dict[str, Any]) -> QueryResult:
+        """Answer one request from the current snapshot."""
+        start_time = time.perf_counter()
+
+        try:
+            self.refresh()
+        except Exception:
+            pass  # Backing graph unreachable: keep serving the snapshot
+
+        try:
+            rows = self.answer(tool, params)
+        except TypeError:
+            raise  # Bad arguments, like calling the GraphTools method
+        except Exception as e:
+            return QueryResult(
+                found=False,
+                data=None,
+                confidence=0.0,
+                query_time_ms=(time.perf_counter() - start_time) * 1000,
+                error=str(e)
+            )
+
+        # Like GraphTools: the matched terms column goes to result.matched_terms
+        data, matched_terms = [], None
+        for row in rows:
+            row = _properties(row)
+            if isinstance(row, dict) and MATCHED_TERMS_COLUMN in row:
+                matched_terms = (matched_terms or []) + [row.pop(MATCHED_TERMS_COLUMN)]
+                row = next(iter(row.values())) if len(row) == 1 else row
+            data.append(row)
+
+        return rows_to_query_result(data, (time.perf_counter() - start_time) * 1000,
+                                    matched_terms=matched_terms)
+
+    def answer(self, tool: str, params: Dict[str, Any]) -> List[Any]:
+        """
+        Raw answer rows of a query function, as its Cypher returns them.
+
+        Rows are _Node objects, or dicts of column -> node/value for
+        multi-column queries (query_related_code, query_neighborhood).
+        """
+        return getattr(self, f"_answer_{tool}")(self._index, **params)
+
+    def execute_batch(self, requests: List[ToolRequest]) -> List[QueryResult]:
+        """
+        Answer several query functions (same contract as GraphTools.execute_batch).
+
+        Args:
+            requests: List of (query function name, kwargs) tuples
+
+        Returns:
+            One QueryResult per request, in request order
+        """
+        for tool, _ in requests:
+            if tool not in QUERY_FUNCTIONS:
+                raise ValueError(f"Unknown query function: {tool}")
+        return [self._run(tool, params) for tool, params in requests]
+
+    # ========================================================================
+    # THE 8 QUERY FUNCTIONS (see GraphTools for documentation)
+    # ========================================================================
+
+    def query_partnerships(self, partner_id: str, citizen: str = "felix") -> QueryResult:
+        """Find partnership information for a specific partner."""
+        return self._run("query_partnerships", {"partner_id": partner_id, "citizen": citizen})
+
+    def query_conversations(
+        self,
+        partner_id: str,
+        keywords: Optional[List[str]] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find conversations with a partner, optionally filtered by topic."""
+        return self._run("query_conversations", {
+            "partner_id": partner_id, "keywords": keywords, "citizen": citizen, "limit": limit
+        })
+
+    def query_technical_context(
+        self,
+        term: str,
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find technical information about code, systems, or bugs."""
+        return self._run("query_technical_context", {
+            "term": term, "issue_type": issue_type, "citizen": citizen, "limit": limit
+        })
+
+    def query_technical_context_many(
+        self,
+        terms: List[str],
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find technical information matching any of several terms, in one query."""
+        return self._run("query_technical_context_many", {
+            "terms": terms, "issue_type": issue_type, "citizen": citizen, "limit": limit
+        })
+
+    def query_emotional_state(
+        self,
+        context_similar_to: str,
+        emotion: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 3
+    ) -> QueryResult:
+        """Find emotional patterns for situations."""
+        return self._run("query_emotional_state", {
+            "context_similar_to": context_similar_to, "emotion": emotion,
+            "citizen": citizen, "limit": limit
+        })
+
+    def query_strategy_patterns(
+        self,
+        situation_type: str,
+        min_success_rate: float = 0.5,
+        citizen: str = "felix",
+        limit: int = 3
+    ) -> QueryResult:
+        """Find proven approaches for situations."""
+        return self._run("query_strategy_patterns", {
+            "situation_type": situation_type, "min_success_rate": min_success_rate,
+            "citizen": citizen, "limit": limit
+        })
+
+    def query_related_code(
+        self,
+        filename: str,
+        citizen: str = "felix",
+        include_dependencies: bool = True,
+        limit: int = 5
+    ) -> QueryResult:
+        """Find code file information and dependencies."""
+        return self._run("query_related_code", {
+            "filename": filename, "citizen": citizen,
+            "include_dependencies": include_dependencies, "limit": limit
+        })
+
+    def query_failed_attempts(
+        self,
+        context: str,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """Find past failures to avoid repeating."""
+        return self._run("query_failed_attempts", {"context": context, "citizen": citizen, "limit": limit})
+
+    def query_active_constraints(
+        self,
+        constraint_type: Optional[str] = None,
+        min_severity: str = "medium",
+        citizen: str = "felix",
+        limit: int = 10,
+        component: Optional[str] = None
+    ) -> QueryResult:
+        """Find active pressures and deadlines."""
+        return self._run("query_active_constraints", {
+            "constraint_type": constraint_type, "min_severity": min_severity,
+            "citizen": citizen, "limit": limit, "component": component
+        })
+
+    def query_neighborhood(
+        self,
+        sender: str,
+        citizen: str = "felix",
+        max_depth: int = 2,
+        limit: int = 200,
+        relationships: Optional[List[str]] = None
+    ) -> QueryResult:
+        """Memories connected to the sender, by walking typed relationships."""
+        return self._run("query_neighborhood", {
+            "sender": sender, "citizen": citizen, "max_depth": max_depth,
+            "limit": limit, "relationships": relationships
+        })
+
+    def query_term_vocabulary(self, citizen: str = "felix") -> QueryResult:
+        """Component names and file paths the graph knows, for term extraction."""
+        return self._run("query_term_vocabulary", {"citizen": citizen})
+
+    def query_context_bundle(
+        self,
+        sender: str,
+        keywords: Optional[List[str]] = None,
+        terms: Optional[List[str]] = None,
+        citizen: str = "felix",
+        content: str = ""
+    ) -> Dict[str, LensPayload]:
+        """Fetch the data for all 8 lenses in one answer (see GraphTools.query_context_bundle)."""
+        _, params = self._build_context_bundle(sender, keywords, terms, citizen, content)
+        start_time = time.perf_counter()
+
+        try:
+            self.refresh()
+        except Exception:
+            pass  # Backing graph unreachable: keep serving the snapshot
+
+        try:
+            [row] = self.answer("query_context_bundle", {
+                "sender": sender, "keywords": keywords, "terms": params["terms"],
+                "citizen": citizen, "content": content, **BUNDLE_DEFAULTS
+            })
+        except Exception as e:
+            return self._bundle_failure(e)
+
+        return self._bundle_payloads(row, params, (time.perf_counter() - start_time) * 1000)
+
+    # ========================================================================
+    # ANSWERS (mirror the Cypher of the BaseGraphTools._build_* methods)
+    #
+    # Rows are nodes (or dicts of nodes/values) as the Cypher returns them;
+    # _run() turns nodes into their properties, graph/standin.py into
+    # FalkorDB node replies.
+    # ========================================================================
+
+    def _answer_query_partnerships(self, index: _Index, partner_id: str, citizen: str = "felix"):
+        return index.lookup("Partnership", citizen, "partner_name_lc", normalize_value(partner_id))
+
+    def _answer_query_conversations(self, index: _Index, partner_id: str,
+                                    keywords: Optional[List[str]] = None,
+                                    citizen: str = "felix", limit: int = 5):
+        nodes = index.lookup("Conversation_Memory", citizen, "partner", partner_id)
+        if keywords:
+            nodes = (n for n in nodes if any(_contains(n, "topic", kw) for kw in keywords))
+        return _take(nodes, limit)
+
+    def _answer_query_technical_context(self, index: _Index, term: str,
+                                        issue_type: Optional[str] = None,
+                                        citizen: str = "felix", limit: int = 5):
+        if issue_type:
+            nodes = index.lookup("Technical_Context", citizen, "issue_type_lc", normalize_value(issue_type))
+        else:
+            nodes = index.label("Technical_Context", citizen)
+        return _take((n for n in nodes
+                      if _contains(n, "component", term) or _contains(n, "description", term)), limit)
+
+    def _answer_query_technical_context_many(self, index: _Index, terms: List[str],
+                                             issue_type: Optional[str] = None,
+                                             citizen: str = "felix", limit: int = 5):
+        terms = unique_terms(terms)
+        if issue_type:
+            nodes = index.lookup("Technical_Context", citizen, "issue_type_lc", normalize_value(issue_type))
+        else:
+            nodes = index.label("Technical_Context", citizen)
+
+        rows = []
+        for node in nodes:
+            matched = [term for term in terms
+                       if _contains(node, "component", term) or _contains(node, "description", term)]
+            if matched:
+                rows.append({"t": node, MATCHED_TERMS_COLUMN: matched})
+
+        # Stable sort: nodes are already in updated_at DESC order within a match count
+        rows.sort(key=lambda row: len(row[MATCHED_TERMS_COLUMN]), reverse=True)
+        return rows[:limit]
+
+    def _answer_query_emotional_state(self, index: _Index, context_similar_to: str,
+                                      emotion: Optional[str] = None,
+                                      citizen: str = "felix", limit: int = 3):
+        if emotion:
+            nodes = index.lookup("Emotional_State", citizen, "emotion_lc", normalize_value(emotion))
+        else:
+            nodes = index.label("Emotional_State", citizen)
+        return _take((n for n in nodes if _contains(n, "context", context_similar_to)), limit)
+
+    def _answer_query_strategy_patterns(self, index: _Index, situation_type: str,
+                                        min_success_rate: float = 0.5,
+                                        citizen: str = "felix", limit: int = 3):
+        return _take((
+            n for n in index.label("Strategy_Pattern", citizen)
+            if _contains(n, "applicability", situation_type)
+            and n.properties.get("success_rate") is not None
+            and n.properties["success_rate"] >= min_success_rate
+        ), limit)
+
+    def _answer_query_related_code(self, index: _Index, filename: str, citizen: str = "felix",
+                                   include_dependencies: bool = True, limit: int = 5):
+        nodes = [n for n in index.label("Code_Reference", citizen) if _contains(n, "file_path", filename)]
+        if not include_dependencies:
+            return _take(nodes, limit)
+
+        return [
+            {
+                "cr": node,
+                "dependencies": [
+                    index.nodes[dep] for dep in index.depends_on.get(node.id, [])
+                    if index.nodes[dep].label == "Code_Reference"
+                ]
+            }
+            for node in nodes[:limit]
+        ]
+
+    def _answer_query_failed_attempts(self, index: _Index, context: str,
+                                      citizen: str = "felix", limit: int = 5):
+        return _take((n for n in index.label("Failed_Attempt", citizen)
+                      if _contains(n, "context", context) or _contains(n, "approach", context)), limit)
+
+    def _answer_query_active_constraints(self, index: _Index, constraint_type: Optional[str] = None,
+                                         min_severity: str = "medium", citizen: str = "felix",
+                                         limit: int = 10, component: Optional[str] = None):
+        if constraint_type:
+            nodes = index.lookup("Constraint", citizen, "constraint_type_lc", normalize_value(constraint_type))
+        else:
+            nodes = index.label("Constraint", citizen)
+
+        min_rank = SEVERITY_RANK.get(min_severity.lower(), 1)
+        qualifying = [
+            n for n in nodes
+            if n.properties.get("status") == "active"
+            and n.properties.get("severity_rank") is not None
+            and n.properties["severity_rank"] >= min_rank
+        ]
+
+        if component:
+            # Constraints mentioning the component; all qualifying ones if none do
+            relevant = [n for n in qualifying if _contains(n, "description", normalize_value(component))]
+            qualifying = relevant or qualifying
+
+        return _take(qualifying, limit)
+
+    def _answer_query_context_bundle(self, index: _Index, sender: str,
+                                     keywords: Optional[List[str]] = None,
+                                     terms: Optional[List[str]] = None,
+                                     citizen: str = "felix", content: str = "",
+                                     conversation_limit: int = 5, technical_limit: int = 5,
+                                     emotional_limit: int = 3, strategy_limit: int = 3,
+                                     min_success_rate: float = 0.7, failure_limit: int = 5,
+                                     min_severity: str = "medium", constraint_limit: int = 10,
+                                     code_limit: int = 5):
+        partnerships = self._answer_query_partnerships(index, sender, citizen)
+        conversations = self._answer_query_conversations(index, sender, keywords, citizen, conversation_limit)
+        technical = self._answer_query_technical_context_many(index, terms or [], citizen=citizen,
+                                                              limit=technical_limit)
+
+        # t0 / h0: the rows the other lenses derive their parameters from
+        t0 = technical[0]["t"].properties if technical else None
+        h0 = conversations[0].properties if conversations else None
+        if t0 is not None:
+            situation = t0.get("issue_type") or t0.get("description") or ""
+            failure_context = t0.get("description") or t0.get("component") or ""
+        else:
+            situation = (h0.get("topic") or "") if h0 is not None else content
+            failure_context = content
+        situation_type = (t0.get("issue_type") or None) if t0 is not None else None
+        component = (t0.get("component") or "") if t0 is not None else ""
+
+        return [{
+            "partnerships": partnerships,
+            "conversations": conversations,
+            "technical": [row["t"] for row in technical],
+            "technical_terms": [row[MATCHED_TERMS_COLUMN] for row in technical],
+            "emotions": self._answer_query_emotional_state(index, situation, citizen=citizen,
+                                                           limit=emotional_limit),
+            "strategies": self._answer_query_strategy_patterns(
+                index, situation_type, min_success_rate, citizen, strategy_limit
+            ) if situation_type is not None else [],
+            "failures": self._answer_query_failed_attempts(
+                index, failure_context, citizen, failure_limit
+            ) if failure_context else [],
+            "constraints": self._answer_query_active_constraints(
+                index, min_severity=min_severity, citizen=citizen,
+                limit=constraint_limit, component=component or None
+            ),
+            "code": self._answer_query_related_code(
+                index, component, citizen, True, code_limit
+            ) if component else [],
+            "situation": situation,
+            "situation_type": situation_type,
+            "failure_context": failure_context,
+            "component": component,
+        }]
+
+    def _answer_query_term_vocabulary(self, index: _Index, citizen: str = "felix"):
+        components = [n.properties.get("component") for n in index.label("Technical_Context", citizen)]
+        file_paths = [n.properties.get("file_path") for n in index.label("Code_Reference", citizen)]
+        return [{
+            "components": list(dict.fromkeys(c for c in components if c is not None)),
+            "file_paths": list(dict.fromkeys(f for f in file_paths if f is not None))
+        }]
+
+    def _answer_query_neighborhood(self, index: _Index, sender: str, citizen: str = "felix",
+                                   max_depth: int = 2, limit: int = 200,
+                                   relationships: Optional[List[str]] = None):
+        max_depth = int(max_depth)
+        if max_depth < 1:
+            raise ValueError(f"max_depth must be >= 1, got {max_depth}")
+        types = set(relationships or NEIGHBORHOOD_RELATIONSHIPS)
+
+        sender_lc = normalize_value(sender)
+        anchors = index.lookup("Partnership", citizen, "partner_name_lc", sender_lc)[:1]
+        if sender_lc in index.persons:
+            anchors.append(index.persons[sender_lc])
+
+        # Breadth-first: depth is the shortest hop count, as min(length(path))
+        depth = {node.id: 0 for node in anchors}
+        queue = deque(node.id for node in anchors)
+        while queue:
+            current = queue.popleft()
+            if depth[current] >= max_depth:
+                continue
+            for rel_type, neighbor in index.adjacency.get(current, []):
+                if rel_type in types and neighbor not in depth:
+                    depth[neighbor] = depth[current] + 1
+                    queue.append(neighbor)
+
+        rows = []
+        for node_id, hops in sorted(depth.items(), key=lambda item: item[1]):
+            node = index.nodes[node_id]
+            node_citizen = node.properties.get("citizen")
+            if hops == 0 or node_citizen is None or node_citizen == citizen:
+                rows.append({"label": node.label, "node": node, "depth": hops})
+        return rows[:limit]
+
+
+# ============================================================================
+# SNAPSHOT EXPORT
+# ============================================================================
+
+if __name__ == "__main__":
+    # Allow custom host/port/graph_name/output via command line
+    host = sys.argv[1] if len(sys.argv) > 1 else "localhost"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 6379
+    graph_name = sys.argv[3] if len(sys.argv) > 3 else "strange_loop"
+    output = sys.argv[4] if len(sys.argv) > 4 else f"{graph_name}_snapshot.json"
+
+    try:
+        backing = GraphTools(host=host, port=port, graph_name=graph_name)
+        start_time = time.perf_counter()
+        snapshot = GraphSnapshot.from_graph(backing.graph, backing.graph_version(), graph_name)
+        print(f"✓ Read {len(snapshot.nodes)} nodes, {len(snapshot.edges)} relationships "
+              f"(version {snapshot.version}) in {(time.perf_counter() - start_time) * 1000:.1f}ms")
+
+        snapshot.save(output)
+        print(f"✓ Snapshot written to {output}")
+        print(f"\nServe it with: InMemoryGraphTools.from_file('{output}')")
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        print("\nMake sure FalkorDB is running:")
+        print("  docker run -p 6379:6379 falkordb/falkordb")
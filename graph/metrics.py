@@ -0,0 +1,413 @@
+"""
+Query Metrics - Per-Tool Latency Histograms, Counters and Slow-Query Log
+
+Purpose: Find slow lenses by measuring instead of guessing
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-25
+
+Opt-in: GraphTools(metrics=QueryMetrics()).
+
+Per query function (query_partnerships, ..., query_context_bundle):
+- Latency histogram over fixed buckets (monotonic clock, ms), with
+  percentiles estimated from the buckets
+- Calls, rows returned, errors, payload bytes (JSON size of the returned
+  data), cache hits (served by QueryCache, not timed)
+
+Slow-query log: queries slower than slow_threshold_ms are kept (bounded,
+newest last) with their Cypher, params and, when profiling is on, the
+GRAPH.PROFILE output of a re-run. Profiling re-executes the query, so it
+runs at most once per tool per profile_cooldown_s, on a background worker:
+the entry is logged at once and its profile filled in when the re-run is
+done, never on the caller's round trip.
+
+Exposed through snapshot() (plain dict, JSON-ready), to_prometheus()
+(text exposition format) and start_http_exporter() (GET /metrics).
+
+Usage:
+    metrics = QueryMetrics(slow_threshold_ms=50)
+    tools = GraphTools(metrics=metrics)
+    ...
+    metrics.snapshot()["tools"]["query_technical_context"]["latency_ms"]["p95"]
+    print(metrics.to_prometheus())
+"""
+
+import json
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Histogram bucket upper bounds (ms); a final +Inf bucket is implicit
+DEFAULT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Slow-query log defaults
+DEFAULT_SLOW_THRESHOLD_MS = 100.0
+DEFAULT_SLOW_LOG_SIZE = 50
+DEFAULT_PROFILE_COOLDOWN_S = 60.0
+
+# Reported percentiles
+PERCENTILES = (50, 95, 99)
+
+# Prometheus metric name prefix
+DEFAULT_PROMETHEUS_PREFIX = "strange_loop_graph"
+
+
+# ============================================================================
+# HISTOGRAM
+# ============================================================================
+
+class LatencyHistogram:
+    """Cumulative-ready bucket counts of latencies (ms). Not thread-safe alone."""
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.bounds = tuple(sorted(buckets_ms))
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket: +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimated p-th percentile: linear within the bucket holding the rank
+        (as Prometheus histogram_quantile). The +Inf bucket reports max_ms.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = self.count * p / 100
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.bounds):
+                    return self.max_ms
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = min(self.bounds[i], self.max_ms)
+                return lower + (max(upper, lower) - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max_ms
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, le in ms, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, bucket_count in zip(self.bounds + (float("inf"),), self.counts):
+            total += bucket_count
+            pairs.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return pairs
+
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+@dataclass
+class ToolStats:
+    """Everything recorded for one query function."""
+    calls: int = 0            # Executed queries (cache hits excluded)
+    errors: int = 0
+    rows: int = 0
+    payload_bytes: int = 0
+    cache_hits: int = 0
+    slow: int = 0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+@dataclass
+class SlowQuery:
+    """One slow-query log entry."""
+    tool: str
+    query_time_ms: float
+    cypher: str
+    params: Dict[str, Any]
+    rows: int
+    error: Optional[str]
+    timestamp: float                       # Wall clock (time.time())
+    profile: Optional[List[str]] = None    # GRAPH.PROFILE lines, if profiled
+    profile_error: Optional[str] = None
+
+
+def payload_bytes(data: Any) -> int:
+    """Size of returned data as compact JSON (non-JSON values via str())."""
+    if data is None:
+        return 0
+    return len(json.dumps(data, default=str, separators=(",", ":")))
+
+
+def row_count(data: Any) -> int:
+    """Rows in a QueryResult.data (dict = one row)."""
+    if data is None:
+        return 0
+    return len(data) if isinstance(data, list) else 1
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class QueryMetrics:
+    """
+    Per-tool query metrics and slow-query log.
+
+    Thread-safe; recording is a few dict/list updates under one lock.
+    Slow queries are profiled by a background worker (started on first use).
+    """
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS,
+        slow_log_size: int = DEFAULT_SLOW_LOG_SIZE,
+        profile_slow: bool = True,
+        profile_cooldown_s: float = DEFAULT_PROFILE_COOLDOWN_S,
+        buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS
+    ):
+        """
+        Args:
+            slow_threshold_ms: Queries at least this slow go to the slow log
+            slow_log_size: Slow-log entries kept (oldest dropped)
+            profile_slow: Attach GRAPH.PROFILE output to slow entries
+            profile_cooldown_s: Min seconds between profiles of one tool
+            buckets_ms: Histogram bucket upper bounds
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.profile_slow = profile_slow
+        self.profile_cooldown_s = profile_cooldown_s
+        self.buckets_ms = tuple(buckets_ms)
+
+        self.tools: Dict[str, ToolStats] = {}
+        self.slow_log: deque = deque(maxlen=slow_log_size)
+        self.started_at = time.time()
+        self._profiled_at: Dict[str, float] = {}
+        self._profiles: "queue.Queue" = queue.Queue()
+        self._profile_worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _stats(self, tool: str) -> ToolStats:
+        stats = self.tools.get(tool)
+        if stats is None:
+            stats = self.tools[tool] = ToolStats(histogram=LatencyHistogram(self.buckets_ms))
+        return stats
+
+    def record(
+        self,
+        tool: str,
+        result: Any,
+        cypher: str = "",
+        params: Optional[Dict[str, Any]] = None,
+        profiler: Optional[Callable[[str, Dict[str, Any]], List[str]]] = None
+    ):
+        """
+        Record one QueryResult of a query function.
+
+        Args:
+            tool: Query function name
+            result: QueryResult (cached results count as cache hits only)
+            cypher: Statement that ran (for the slow log)
+            params: Its parameters
+            profiler: Returns GRAPH.PROFILE lines for (cypher, params);
+                called from the background worker for slow queries when
+                profiling is due
+        """
+        if result.cached:
+            with self._lock:
+                self._stats(tool).cache_hits += 1
+            return
+
+        rows = row_count(result.data)
+        size = payload_bytes(result.data)
+        slow = result.query_time_ms >= self.slow_threshold_ms
+
+        with self._lock:
+            stats = self._stats(tool)
+            stats.calls += 1
+            stats.rows += rows
+            stats.payload_bytes += size
+            stats.errors += 1 if result.error else 0
+            stats.histogram.observe(result.query_time_ms)
+            if not slow:
+                return
+            stats.slow += 1
+
+            now = time.monotonic()
+            profile_due = (
+                self.profile_slow and profiler is not None and cypher
+                and now - self._profiled_at.get(tool, float("-inf")) >= self.profile_cooldown_s
+            )
+            if profile_due:
+                self._profiled_at[tool] = now
+
+        entry = SlowQuery(
+            tool=tool,
+            query_time_ms=round(result.query_time_ms, 3),
+            cypher=" ".join(cypher.split()),
+            params=dict(params or {}),
+            rows=rows,
+            error=result.error,
+            timestamp=time.time()
+        )
+        with self._lock:
+            self.slow_log.append(entry)
+            if profile_due:
+                self._start_profile_worker()
+        if profile_due:
+            self._profiles.put((entry, profiler, cypher, dict(params or {})))
+
+    def _start_profile_worker(self):
+        """Start the profiling thread if it isn't running (caller holds the lock)."""
+        if self._profile_worker is None:
+            self._profile_worker = threading.Thread(target=self._run_profiles, name="query-profiler", daemon=True)
+            self._profile_worker.start()
+
+    def _run_profiles(self):
+        """Background worker: profile queued slow queries one at a time."""
+        while True:
+            entry, profiler, cypher, params = self._profiles.get()
+            try:
+                profile = [str(line) for line in profiler(cypher, params)]
+                with self._lock:
+                    entry.profile = profile
+            except Exception as e:
+                with self._lock:
+                    entry.profile_error = str(e)
+            finally:
+                self._profiles.task_done()
+
+    def wait_for_profiles(self):
+        """Block until every queued profile is attached to its slow-log entry."""
+        self._profiles.join()
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.tools.clear()
+            self.slow_log.clear()
+            self._profiled_at.clear()
+            self.started_at = time.time()
+
+    # ========================================================================
+    # EXPORT
+    # ========================================================================
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy of all metrics as plain data (JSON-ready)."""
+        with self._lock:
+            tools = {}
+            for tool, stats in sorted(self.tools.items()):
+                histogram = stats.histogram
+                latency = {f"p{p}": round(histogram.percentile(p), 3) for p in PERCENTILES}
+                latency["mean"] = round(histogram.sum_ms / histogram.count, 3) if histogram.count else 0.0
+                latency["max"] = round(histogram.max_ms, 3)
+                latency["buckets"] = dict(histogram.cumulative())
+                tools[tool] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "rows": stats.rows,
+                    "payload_bytes": stats.payload_bytes,
+                    "cache_hits": stats.cache_hits,
+                    "slow": stats.slow,
+                    "latency_ms": latency
+                }
+            return {
+                "since": self.started_at,
+                "slow_threshold_ms": self.slow_threshold_ms,
+                "tools": tools,
+                "slow_queries": [asdict(entry) for entry in self.slow_log]
+            }
+
+    def to_prometheus(self, prefix: str = DEFAULT_PROMETHEUS_PREFIX, labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Prometheus text exposition of the metrics.
+
+        Latencies are exported in seconds (Prometheus convention).
+
+        Args:
+            prefix: Metric name prefix
+            labels: Extra labels on every sample (e.g. {"graph": "strange_loop"})
+        """
+        def label_set(tool: str, **extra) -> str:
+            pairs = {**(labels or {}), "tool": tool, **extra}
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in pairs.values())
+            return "{" + ",".join(f'{k}="{v}"' for k, v in zip(pairs, escaped)) + "}"
+
+        counters = (
+            ("queries_total", "calls", "Executed queries"),
+            ("query_errors_total", "errors", "Queries that returned an error"),
+            ("query_rows_total", "rows", "Rows returned"),
+            ("query_payload_bytes_total", "payload_bytes", "JSON bytes of returned data"),
+            ("query_cache_hits_total", "cache_hits", "Results served by QueryCache"),
+            ("slow_queries_total", "slow", "Queries over the slow-query threshold"),
+        )
+
+        with self._lock:
+            tools = sorted(self.tools.items())
+            lines = [
+                f"# HELP {prefix}_query_duration_seconds Query latency per query function",
+                f"# TYPE {prefix}_query_duration_seconds histogram",
+            ]
+            for tool, stats in tools:
+                histogram = stats.histogram
+                for le, total in histogram.cumulative():
+                    le_s = le if le == "+Inf" else f"{float(le) / 1000:g}"
+                    lines.append(f"{prefix}_query_duration_seconds_bucket{label_set(tool, le=le_s)} {total}")
+                lines.append(f"{prefix}_query_duration_seconds_sum{label_set(tool)} {histogram.sum_ms / 1000:.6f}")
+                lines.append(f"{prefix}_query_duration_seconds_count{label_set(tool)} {histogram.count}")
+
+            for name, attribute, help_text in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for tool, stats in tools:
+                    lines.append(f"{prefix}_{name}{label_set(tool)} {getattr(stats, attribute)}")
+
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# HTTP EXPORTER
+# ============================================================================
+
+def start_http_exporter(
+    metrics: QueryMetrics,
+    port: int = 9464,
+    host: str = "0.0.0.0",
+    prefix: str = DEFAULT_PROMETHEUS_PREFIX,
+    labels: Optional[Dict[str, str]] = None
+) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics (Prometheus text) and GET /metrics.json (snapshot)
+    from a daemon thread.
+
+    Returns:
+        The running server (call .shutdown() to stop it)
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = metrics.to_prometheus(prefix, labels).encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body = json.dumps(metrics.snapshot(), default=str).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes are not worth a log line each
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -0,0 +1,195 @@
+"""
+Graph Migrations - Backfill Derived Properties on Existing Graphs
+
+Purpose: Bring graphs created before a schema change up to date
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+New write paths (seed_data.py, ingestion) store derived properties directly.
+Graphs written before that need a one-off backfill:
+
+- Normalized shadows (<prop>_lc, see NORMALIZED_PROPERTIES in graph/tools.py)
+  and their indices, so exact matches use an index instead of toLower() scans
+- Constraint.severity_rank (see SEVERITY_RANK) and its index, so severity
+  filtering happens in Cypher before LIMIT
+
+Every migration is idempotent: it only touches nodes whose derived property
+is missing or stale, and re-running it is a no-op. The graph version is
+bumped when anything changed (invalidates graph/cache.py).
+
+Queries filter on the derived properties only, so an unmigrated graph doesn't
+fail - the partnership, emotional and constraint lenses just find nothing.
+pending_migrations() counts the nodes still missing one (read-only);
+scripts/preflight_check.py fails on any, naming MIGRATION_COMMAND.
+
+Usage:
+    python graph/migrations.py [host] [port] [graph_name]
+"""
+
+import sys
+from typing import Dict
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+from graph.tools import NORMALIZED_PROPERTIES, SEVERITY_RANK, shadow_property
+from graph.version import bump_graph_version
+
+# What to run on a graph with pending migrations
+MIGRATION_COMMAND = "python graph/migrations.py"
+
+# Label -> (derived property, property it is computed from)
+DERIVED_PROPERTIES = {
+    label: [(shadow_property(prop), prop) for prop in properties]
+    for label, properties in NORMALIZED_PROPERTIES.items()
+}
+DERIVED_PROPERTIES["Constraint"].append(("severity_rank", "severity"))
+
+# FalkorDB client (pip install FalkorDB)
+try:
+    from falkordb import FalkorDB
+except ImportError:
+    print("WARNING: FalkorDB not installed. Run: pip install FalkorDB")
+    FalkorDB = None
+
+
+def create_index(graph, label: str, prop: str) -> bool:
+    """
+    Create a range index (idempotent).
+
+    Returns:
+        True if created, False if it already existed
+    """
+    try:
+        graph.query(f"CREATE INDEX FOR (n:{label}) ON (n.{prop})")
+        return True
+    except Exception as e:
+        if "already indexed" not in str(e).lower():
+            raise
+        return False
+
+
+def backfill_normalized_properties(graph) -> Dict[str, int]:
+    """
+    Create the <prop>_lc indices and fill missing/stale shadow values.
+
+    Args:
+        graph: FalkorDB graph handle
+
+    Returns:
+        Nodes updated per "Label.prop"
+    """
+    updated = {}
+    for label, properties in NORMALIZED_PROPERTIES.items():
+        for prop in properties:
+            shadow = shadow_property(prop)
+            create_index(graph, label, shadow)
+
+            result = graph.query(f"""
+            MATCH (n:{label})
+            WHERE n.{prop} IS NOT NULL
+              AND (n.{shadow} IS NULL OR n.{shadow} <> toLower(n.{prop}))
+            SET n.{shadow} = toLower(n.{prop})
+            RETURN count(n)
+            """)
+            updated[f"{label}.{prop}"] = result.result_set[0][0] if result.result_set else 0
+
+    return updated
+
+
+def backfill_severity_rank(graph) -> Dict[str, int]:
+    """
+    Create the Constraint.severity_rank index and fill missing/stale ranks.
+
+    Unknown severities rank like "low" (0).
+
+    Args:
+        graph: FalkorDB graph handle
+
+    Returns:
+        Nodes updated, as {"Constraint.severity_rank": n}
+    """
+    create_index(graph, "Constraint", "severity_rank")
+
+    cases = "\n".join(
+        f"                WHEN '{severity}' THEN {rank}"
+        for severity, rank in SEVERITY_RANK.items()
+    )
+    result = graph.query(f"""
+    MATCH (c:Constraint)
+    WITH c,
+         CASE toLower(coalesce(c.severity, 'low'))
+{cases}
+                ELSE 0
+         END AS rank
+    WHERE c.severity_rank IS NULL OR c.severity_rank <> rank
+    SET c.severity_rank = rank
+    RETURN count(c)
+    """)
+    return {"Constraint.severity_rank": result.result_set[0][0] if result.result_set else 0}
+
+
+def pending_migrations(graph) -> Dict[str, int]:
+    """
+    Count nodes missing a derived property (read-only).
+
+    Args:
+        graph: FalkorDB graph handle
+
+    Returns:
+        Nodes to backfill per "Label.derived_property" (only those with any)
+    """
+    pending = {}
+    for label, derived in DERIVED_PROPERTIES.items():
+        for prop, source in derived:
+            result = graph.query(
+                f"MATCH (n:{label}) WHERE n.{source} IS NOT NULL AND n.{prop} IS NULL RETURN count(n)"
+            )
+            count = result.result_set[0][0] if result.result_set else 0
+            if count:
+                pending[f"{label}.{prop}"] = count
+    return pending
+
+
+def migrate(host: str = "localhost", port: int = 6379, graph_name: str = "strange_loop") -> Dict[str, int]:
+    """
+    Run every migration against a graph.
+
+    Args:
+        host: FalkorDB host
+        port: FalkorDB port
+        graph_name: Graph database name
+
+    Returns:
+        Nodes updated per migrated "Label.prop"
+    """
+    if FalkorDB is None:
+        raise ImportError("FalkorDB not installed. Run: pip install FalkorDB")
+
+    db = FalkorDB(host=host, port=port)
+    graph = db.select_graph(graph_name)
+
+    updated = {}
+    updated.update(backfill_normalized_properties(graph))
+    updated.update(backfill_severity_rank(graph))
+
+    if any(updated.values()):
+        bump_graph_version(db.connection, graph_name)
+
+    return updated
+
+
+if __name__ == "__main__":
+    # Allow custom host/port/graph_name via command line
+    host = sys.argv[1] if len(sys.argv) > 1 else "localhost"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 6379
+    graph_name = sys.argv[3] if len(sys.argv) > 3 else "strange_loop"
+
+    try:
+        print(f"Migrating graph '{graph_name}' at {host}:{port}...")
+        for name, count in migrate(host, port, graph_name).items():
+            print(f"  {name}: {count} nodes updated")
+        print("\n✓ Migration complete")
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        print("\nMake sure FalkorDB is running:")
+        print("  docker run -p 6379:6379 falkordb/falkordb")
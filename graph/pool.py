@@ -0,0 +1,266 @@
+"""
+FalkorDB Connection Pool - Shared Connections Per Host/Port
+
+Purpose: One bounded, health-checked connection pool per FalkorDB server
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+GraphTools, LensExplorer and DreamerAgent all borrow from the pool returned by
+get_pool(host, port) instead of opening their own client. Dreaming thousands of
+times an hour then pays TCP/handshake setup once per connection, not per dream.
+
+- Bounded: at most max_connections sockets; callers wait (up to timeout)
+  for a free connection instead of opening more
+- Health-checked: idle connections are PINGed before reuse
+  (health_check_interval) and dead ones are replaced transparently
+- Graph handles from select_graph() are cached and shared
+
+AsyncFalkorDBPool / get_async_pool() are the asyncio equivalents used by
+AsyncGraphTools. Async pools belong to the event loop that first uses them.
+"""
+
+import threading
+from typing import Dict, Tuple, Any
+
+# FalkorDB client (pip install FalkorDB) - runs on redis-py
+try:
+    import redis
+    from falkordb import FalkorDB
+except ImportError:
+    redis = None
+    FalkorDB = None
+
+try:
+    import redis.asyncio as redis_asyncio
+    from falkordb.asyncio import FalkorDB as AsyncFalkorDB
+except ImportError:
+    redis_asyncio = None
+    AsyncFalkorDB = None
+
+
+# Pool defaults
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_TIMEOUT_S = 5.0                # Max wait for a free connection
+DEFAULT_HEALTH_CHECK_INTERVAL_S = 30   # PING connections idle longer than this
+
+
+class FalkorDBPool:
+    """
+    Bounded connection pool for one FalkorDB server.
+
+    Thread-safe: connections are checked out per command, so any number of
+    GraphTools instances and threads can share one pool.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT_S,
+        health_check_interval: int = DEFAULT_HEALTH_CHECK_INTERVAL_S
+    ):
+        """
+        Create the pool (connections are opened lazily).
+
+        Args:
+            host: FalkorDB host
+            port: FalkorDB port
+            max_connections: Upper bound on open connections
+            timeout: Seconds to wait for a free connection before failing
+            health_check_interval: Seconds of idleness before a connection is PINGed
+        """
+        if FalkorDB is None:
+            raise ImportError("FalkorDB not installed. Run: pip install FalkorDB")
+
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+
+        self.connection_pool = redis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            max_connections=max_connections,
+            timeout=timeout,
+            health_check_interval=health_check_interval,
+            socket_keepalive=True,
+            # What FalkorDB() sets on its own connections; a pool passed in
+            # overrides them, and falkordb-py parses str replies over RESP2
+            decode_responses=True,
+            protocol=2
+        )
+        self.db = FalkorDB(connection_pool=self.connection_pool)
+
+        self._graphs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def select_graph(self, graph_name: str):
+        """Return the shared graph handle for graph_name (created once)."""
+        with self._lock:
+            graph = self._graphs.get(graph_name)
+            if graph is None:
+                graph = self.db.select_graph(graph_name)
+                self._graphs[graph_name] = graph
+            return graph
+
+    def ping(self) -> bool:
+        """Health check: True if the server answers PING."""
+        try:
+            return bool(self.db.connection.ping())
+        except Exception:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection usage snapshot for debugging/monitoring."""
+        pool = self.connection_pool
+        return {
+            "host": self.host,
+            "port": self.port,
+            "max_connections": self.max_connections,
+            "open_connections": len(getattr(pool, "_connections", [])),
+            "graphs": sorted(self._graphs),
+        }
+
+    def close(self):
+        """Close every connection in the pool."""
+        with self._lock:
+            self._graphs.clear()
+        self.connection_pool.disconnect()
+
+
+class AsyncFalkorDBPool:
+    """
+    Bounded asyncio connection pool for one FalkorDB server.
+
+    Coroutines wait for a free connection instead of opening more, so one
+    worker can keep hundreds of dreams in flight on max_connections sockets.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT_S,
+        health_check_interval: int = DEFAULT_HEALTH_CHECK_INTERVAL_S
+    ):
+        """
+        Create the pool (connections are opened lazily).
+
+        Args:
+            host: FalkorDB host
+            port: FalkorDB port
+            max_connections: Upper bound on open connections
+            timeout: Seconds to wait for a free connection before failing
+            health_check_interval: Seconds of idleness before a connection is PINGed
+        """
+        if AsyncFalkorDB is None:
+            raise ImportError("FalkorDB not installed. Run: pip install FalkorDB")
+
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+
+        self.connection_pool = redis_asyncio.BlockingConnectionPool(
+            host=host,
+            port=port,
+            max_connections=max_connections,
+            timeout=timeout,
+            health_check_interval=health_check_interval,
+            socket_keepalive=True,
+            # What FalkorDB() sets on its own connections; a pool passed in
+            # overrides them, and falkordb-py parses str replies over RESP2
+            decode_responses=True,
+            protocol=2
+        )
+        self.db = AsyncFalkorDB(connection_pool=self.connection_pool)
+
+        self._graphs: Dict[str, Any] = {}
+
+    def select_graph(self, graph_name: str):
+        """Return the shared graph handle for graph_name (created once)."""
+        graph = self._graphs.get(graph_name)
+        if graph is None:
+            graph = self.db.select_graph(graph_name)
+            self._graphs[graph_name] = graph
+        return graph
+
+    async def ping(self) -> bool:
+        """Health check: True if the server answers PING."""
+        try:
+            return bool(await self.db.connection.ping())
+        except Exception:
+            return False
+
+    async def close(self):
+        """Close every connection in the pool."""
+        self._graphs.clear()
+        await self.connection_pool.disconnect()
+
+
+# ============================================================================
+# PROCESS-WIDE REGISTRY
+# ============================================================================
+
+_pools: Dict[Tuple[str, int], FalkorDBPool] = {}
+_async_pools: Dict[Tuple[str, int], AsyncFalkorDBPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(host: str = "localhost", port: int = 6379, **kwargs) -> FalkorDBPool:
+    """
+    Get the process-wide pool for host:port, creating it on first use.
+
+    Args:
+        host: FalkorDB host
+        port: FalkorDB port
+        **kwargs: FalkorDBPool options, only used when the pool is created
+
+    Returns:
+        Shared FalkorDBPool
+    """
+    key = (host, port)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = FalkorDBPool(host=host, port=port, **kwargs)
+            _pools[key] = pool
+        return pool
+
+
+def get_async_pool(host: str = "localhost", port: int = 6379, **kwargs) -> AsyncFalkorDBPool:
+    """
+    Get the process-wide asyncio pool for host:port, creating it on first use.
+
+    Args:
+        host: FalkorDB host
+        port: FalkorDB port
+        **kwargs: AsyncFalkorDBPool options, only used when the pool is created
+
+    Returns:
+        Shared AsyncFalkorDBPool
+    """
+    key = (host, port)
+    with _pools_lock:
+        pool = _async_pools.get(key)
+        if pool is None:
+            pool = AsyncFalkorDBPool(host=host, port=port, **kwargs)
+            _async_pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """
+    Close and forget every sync pool (e.g. at shutdown or between tests).
+
+    Async pools are forgotten too; close them with `await pool.close()`
+    from their event loop first.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _async_pools.clear()
+
+    for pool in pools:
+        pool.close()
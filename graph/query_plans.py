@@ -0,0 +1,258 @@
+"""
+Query Plan Check - Do the Tool Queries Use the graph/schema.cypher Indices?
+
+Purpose: Catch missing indices (e.g. after a restore) before they cost slow dreams
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-25
+
+Every statement the GraphTools builders produce (query_templates() in
+graph/tools.py) starts from an indexed property - citizen, partner_name_lc,
+Person.id - or, in fulltext mode, from a full-text index. This module:
+
+- Reads the indices declared in graph/schema.cypher and compares them with
+  CALL db.indexes() (missing_indices)
+- Creates the missing ones, idempotently (ensure_indices)
+- Runs GRAPH.EXPLAIN on every template and classifies the scans in the plan
+  (check_query_plans): index scans / full-text procedure calls are fine, a
+  "Node By Label Scan" or "All Node Scan" means the template degraded to a
+  full scan and fails the check
+
+scripts/preflight_check.py runs the verification (not the creation) as a
+non-critical check.
+
+Usage:
+    python graph/query_plans.py [host] [port] [graph_name] [--fulltext] [--no-create]
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+from graph.tools import (
+    SEARCH_CONTAINS, SEARCH_FULLTEXT, build_params_header, create_fulltext_indices, query_templates
+)
+from graph.migrations import create_index
+
+# FalkorDB client (pip install FalkorDB)
+try:
+    from falkordb import FalkorDB
+except ImportError:
+    print("WARNING: FalkorDB not installed. Run: pip install FalkorDB")
+    FalkorDB = None
+
+
+# Schema file declaring the indices
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema.cypher")
+
+# Plan operations that read through an index / scan a whole label or graph
+INDEX_OPERATIONS = ("Node By Index Scan", "Node By Id Seek", "ProcedureCall")
+SCAN_OPERATIONS = ("Node By Label Scan", "All Node Scan")
+
+_RANGE_INDEX = re.compile(r"CREATE INDEX FOR \(\w+:(\w+)\) ON \(\w+\.(\w+)\)")
+_FULLTEXT_INDEX = re.compile(r"CALL db\.idx\.fulltext\.createNodeIndex\(([^)]*)\)")
+
+
+# ============================================================================
+# INDICES
+# ============================================================================
+
+def schema_indices(path: str = SCHEMA_PATH) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Indices declared in schema.cypher.
+
+    Returns:
+        {"range": [(label, property)], "fulltext": [(label, property)]}
+    """
+    indices = {"range": [], "fulltext": []}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("//"):
+                continue
+            match = _RANGE_INDEX.search(line)
+            if match:
+                indices["range"].append((match.group(1), match.group(2)))
+            match = _FULLTEXT_INDEX.search(line)
+            if match:
+                label, *properties = [arg.strip().strip("'\"") for arg in match.group(1).split(",")]
+                indices["fulltext"].extend((label, prop) for prop in properties)
+    return indices
+
+
+def existing_indices(graph) -> Dict[str, Set[Tuple[str, str]]]:
+    """
+    Indices present in a graph, from CALL db.indexes().
+
+    Per-property index types are read where the server reports them
+    (FalkorDB 4.x); otherwise every indexed property counts as a range index.
+    """
+    indices = {"range": set(), "fulltext": set()}
+    try:
+        rows = graph.query("CALL db.indexes() YIELD label, properties, types").result_set
+    except Exception:
+        rows = [row + [None] for row in graph.query("CALL db.indexes() YIELD label, properties").result_set]
+
+    for label, properties, types in rows:
+        for prop in properties:
+            prop_types = [str(t).upper() for t in (types or {}).get(prop, ["RANGE"])]
+            if "RANGE" in prop_types:
+                indices["range"].add((label, prop))
+            if "FULLTEXT" in prop_types:
+                indices["fulltext"].add((label, prop))
+    return indices
+
+
+def missing_indices(graph, fulltext: bool = False, path: str = SCHEMA_PATH) -> Dict[str, List[Tuple[str, str]]]:
+    """Declared indices the graph doesn't have (fulltext ones only if asked)."""
+    declared = schema_indices(path)
+    present = existing_indices(graph)
+    kinds = ("range", "fulltext") if fulltext else ("range",)
+    return {kind: [index for index in declared[kind] if index not in present[kind]] for kind in kinds}
+
+
+def ensure_indices(graph, fulltext: bool = False, path: str = SCHEMA_PATH) -> List[str]:
+    """
+    Create the declared indices the graph is missing (idempotent).
+
+    Returns:
+        "Label.property" of every index created
+    """
+    missing = missing_indices(graph, fulltext, path)
+    created = []
+    for label, prop in missing.get("range", []):
+        if create_index(graph, label, prop):
+            created.append(f"{label}.{prop}")
+    if missing.get("fulltext"):
+        labels = set(create_fulltext_indices(graph))
+        created.extend(f"{label}.{prop} (fulltext)" for label, prop in missing["fulltext"] if label in labels)
+    return created
+
+
+# ============================================================================
+# PLANS
+# ============================================================================
+
+@dataclass
+class PlanReport:
+    """GRAPH.EXPLAIN verdict for one template."""
+    name: str                                   # e.g. "query_technical_context(term, issue_type)"
+    search_mode: str
+    plan: List[str] = field(default_factory=list)
+    index_scans: List[str] = field(default_factory=list)
+    label_scans: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        """"error", "degraded" (full scan), "indexed" or "no scan"."""
+        if self.error:
+            return "error"
+        if self.label_scans:
+            return "degraded"
+        return "indexed" if self.index_scans else "no scan"
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("indexed", "no scan")
+
+
+def classify_plan(plan: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Scan operations of an execution plan.
+
+    Returns:
+        (index scans, label/all-node scans), each as "Operation | (alias:Label)"
+    """
+    index_scans, label_scans = [], []
+    for line in plan:
+        step = str(line).strip()
+        operation = step.split("|")[0].strip()
+        if operation in INDEX_OPERATIONS:
+            index_scans.append(step)
+        elif operation in SCAN_OPERATIONS:
+            label_scans.append(step)
+    return index_scans, label_scans
+
+
+def explain(db, graph_name: str, cypher: str, params: Dict[str, Any]) -> List[str]:
+    """GRAPH.EXPLAIN lines of a parameterized statement (not executed)."""
+    plan = db.connection.execute_command("GRAPH.EXPLAIN", graph_name, build_params_header(params) + cypher)
+    return [line.decode() if isinstance(line, bytes) else str(line) for line in plan]
+
+
+def check_query_plans(db, graph_name: str = "strange_loop",
+                      search_modes: Tuple[str, ...] = (SEARCH_CONTAINS,)) -> List[PlanReport]:
+    """
+    EXPLAIN every query template of the given search modes.
+
+    Args:
+        db: FalkorDB client (FalkorDB(...) or a pool's .db)
+        graph_name: Graph to explain against
+        search_modes: Modes whose templates are checked (fulltext templates
+            need the full-text indices)
+
+    Returns:
+        One PlanReport per template; a report with ok=False fails the check
+    """
+    reports = []
+    for search_mode in search_modes:
+        for tool, kwargs, cypher, params in query_templates(search_mode):
+            name = f"{tool}({', '.join(kwargs)})"
+            report = PlanReport(name=name, search_mode=search_mode)
+            try:
+                report.plan = explain(db, graph_name, cypher, params)
+                report.index_scans, report.label_scans = classify_plan(report.plan)
+            except Exception as e:
+                report.error = str(e)
+            reports.append(report)
+    return reports
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+if __name__ == "__main__":
+    # Allow custom host/port/graph_name via command line
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    host = args[0] if len(args) > 0 else "localhost"
+    port = int(args[1]) if len(args) > 1 else 6379
+    graph_name = args[2] if len(args) > 2 else "strange_loop"
+    fulltext = "--fulltext" in sys.argv
+    create = "--no-create" not in sys.argv
+
+    try:
+        db = FalkorDB(host=host, port=port)
+        graph = db.select_graph(graph_name)
+
+        missing = missing_indices(graph, fulltext)
+        for kind, indices in missing.items():
+            for label, prop in indices:
+                print(f"✗ Missing {kind} index: {label}.{prop}")
+        if create and any(missing.values()):
+            for index in ensure_indices(graph, fulltext):
+                print(f"✓ Created index: {index}")
+
+        modes = (SEARCH_CONTAINS, SEARCH_FULLTEXT) if fulltext else (SEARCH_CONTAINS,)
+        reports = check_query_plans(db, graph_name, modes)
+        print()
+        for report in reports:
+            mark = "✓" if report.ok else "✗"
+            scans = report.label_scans or report.index_scans or ([report.error] if report.error else [])
+            print(f"{mark} {report.status:<9} {report.name} [{report.search_mode}]")
+            for scan in scans:
+                print(f"      {scan}")
+
+        failed = [r for r in reports if not r.ok]
+        print(f"\n{len(reports) - len(failed)}/{len(reports)} templates use indices")
+        sys.exit(1 if failed else 0)
+
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        print("\nMake sure FalkorDB is running:")
+        print("  docker run -p 6379:6379 falkordb/falkordb")
+        sys.exit(1)
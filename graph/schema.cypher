@@ -43,6 +43,31 @@ CREATE INDEX FOR (c:Constraint) ON (c.status);
 CREATE INDEX FOR (c:Constraint) ON (c.severity);
 CREATE INDEX FOR (c:Constraint) ON (c.deadline);
 
+// Normalized (lowercased) shadows for exact matching - written alongside the
+// original property; graph/migrations.py backfills older graphs.
+// Keep in sync with NORMALIZED_PROPERTIES in graph/tools.py.
+CREATE INDEX FOR (p:Partnership) ON (p.partner_name_lc);
+CREATE INDEX FOR (t:Technical_Context) ON (t.issue_type_lc);
+CREATE INDEX FOR (e:Emotional_State) ON (e.emotion_lc);
+CREATE INDEX FOR (c:Constraint) ON (c.constraint_type_lc);
+
+// Numeric severity (low 0, medium 1, high 2, critical 3) so min_severity
+// filters and sorts server-side. See SEVERITY_RANK in graph/tools.py.
+CREATE INDEX FOR (c:Constraint) ON (c.severity_rank);
+
+// ------------------------------------------------------------
+// FULL-TEXT INDICES (GraphTools search_mode="fulltext")
+// ------------------------------------------------------------
+// Free-text filters (topic, component, context, ...) can't use the range
+// indices above with CONTAINS. These back db.idx.fulltext.queryNodes.
+// Keep in sync with FULLTEXT_INDICES in graph/tools.py.
+
+CALL db.idx.fulltext.createNodeIndex('Conversation_Memory', 'topic');
+CALL db.idx.fulltext.createNodeIndex('Technical_Context', 'component', 'description');
+CALL db.idx.fulltext.createNodeIndex('Emotional_State', 'context');
+CALL db.idx.fulltext.createNodeIndex('Strategy_Pattern', 'applicability');
+CALL db.idx.fulltext.createNodeIndex('Failed_Attempt', 'context', 'approach');
+
 // ============================================================
 // Schema indices created.
 // Next: Run seed_data.py to create nodes and relationships
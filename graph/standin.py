@@ -0,0 +1,910 @@
+"""
+FalkorDB Stand-In - RESP Server Over an In-Memory Graph, With Injected Latency
+
+Purpose: Benchmark round-trip-sensitive changes without a live database
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-25
+
+A small asyncio server that speaks enough of the Redis protocol (RESP2/RESP3) for
+falkordb-py / redis-py clients: GraphTools, PreflightChecker and
+scripts/benchmark.py point at it by host/port like at FalkorDB. Answers come
+from InMemoryGraphTools over a GraphSnapshot, encoded as FalkorDB --compact
+replies (real nodes, label and property-key ids), so client-side parsing is
+exercised exactly as in production.
+
+Latency is injected per connection, the way a network and a busy server add it:
+- rtt_ms: round trip, paid once per burst of commands that arrive together,
+  so a pipeline of 8 queries pays it once and 8 sequential queries pay it 8x
+- command_ms: server time per command (queued behind earlier commands of the
+  same connection; separate connections run in parallel, as FalkorDB's
+  read thread pool does)
+- jitter_ms: random extra delay per burst, uniform in [0, jitter_ms]
+  (seeded; replies are never reordered)
+
+Supported GRAPH.QUERY / GRAPH.RO_QUERY / GRAPH.PROFILE / GRAPH.EXPLAIN statements (anything
+else is an error reply, never a guess):
+- The Cypher of the 8 query functions, query_technical_context_many,
+  query_neighborhood, query_term_vocabulary and query_context_bundle, in
+  SEARCH_CONTAINS mode, recognized by their text as built by BaseGraphTools
+  (fulltext queries are not supported)
+- The statements of scripts/preflight_check.py, GraphSnapshot.from_graph,
+  ExistenceSummary and graph/migrations.py pending_migrations() (counts,
+  label/type distributions, RETURN n LIMIT k)
+- CALL db.labels() / db.propertyKeys() / db.relationshipTypes()
+- CALL db.indexes() YIELD label, properties[, types]: every graph/schema.cypher
+  index is reported present (graph/query_plans.py then finds nothing to create)
+Plain keys (GET/SET/INCR/INCRBY/DEL) hold the graph version counter (graph/version.py).
+Graphs are read-only: write statements are rejected.
+
+Usage:
+    python graph/standin.py [--port 6390] [--snapshot snap.json | --seed-data | --nodes 100000]
+                            [--rtt-ms 40] [--command-ms 0.5] [--jitter-ms 10]
+
+    # In process (tests, benchmarks):
+    with StandInServer({"strange_loop": snapshot}, port=0, latency=LatencyProfile(rtt_ms=40)) as server:
+        tools = GraphTools(port=server.port)
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+from graph.tools import BUNDLE_DEFAULTS, SEARCH_CONTAINS, SEVERITY_RANK, query_templates
+from graph.memory_tools import GraphSnapshot, InMemoryGraphTools, _Node
+from graph.query_plans import schema_indices
+from graph.version import version_key
+
+
+# Port the CLI listens on (next to FalkorDB's 6379/6380)
+DEFAULT_PORT = 6390
+
+# FalkorDB --compact scalar types (falkordb/query_result.py ResultSetScalarTypes)
+VALUE_NULL = 1
+VALUE_STRING = 2
+VALUE_INTEGER = 3
+VALUE_BOOLEAN = 4
+VALUE_DOUBLE = 5
+VALUE_ARRAY = 6
+VALUE_NODE = 8
+VALUE_MAP = 10
+
+# Header column type for scalar/node columns
+COLUMN_SCALAR = 1
+
+
+# ============================================================================
+# LATENCY
+# ============================================================================
+
+@dataclass
+class LatencyProfile:
+    """Injected latency (milliseconds), see module docstring."""
+    rtt_ms: float = 0.0
+    command_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self):
+        if min(self.rtt_ms, self.command_ms, self.jitter_ms) < 0:
+            raise ValueError(f"Latencies must be >= 0: {self}")
+
+
+# ============================================================================
+# RESP ENCODING
+# ============================================================================
+
+class SimpleString(str):
+    """Reply sent as a RESP simple string (+OK) instead of a bulk string."""
+
+
+class ReplyError(Exception):
+    """Reply sent as a RESP error (-ERR ...)."""
+
+
+def encode_reply(value: Any, protocol: int = 2) -> bytes:
+    """
+    RESP encoding of a reply.
+
+    RESP3 (after HELLO 3) differs only in nulls and maps for what we send.
+    """
+    if value is None:
+        return b"_\r\n" if protocol == 3 else b"$-1\r\n"
+    if isinstance(value, ReplyError):
+        return b"-ERR " + str(value).replace("\r\n", " ").encode() + b"\r\n"
+    if isinstance(value, SimpleString):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(v, protocol) for v in value)
+    if isinstance(value, dict):
+        items = [encode_reply(k, protocol) + encode_reply(v, protocol) for k, v in value.items()]
+        return (b"%%%d\r\n" % len(value) if protocol == 3 else b"*%d\r\n" % (2 * len(value))) + b"".join(items)
+    data = value if isinstance(value, bytes) else str(value).encode()
+    return b"$%d\r\n" % len(data) + data + b"\r\n"
+
+
+def parse_commands(buffer: bytearray) -> List[List[str]]:
+    """
+    Pop every complete command from buffer (RESP arrays or inline commands).
+
+    Incomplete trailing data stays in buffer for the next read.
+
+    Raises:
+        ReplyError: Malformed request (the connection should be closed)
+    """
+    commands = []
+    while buffer:
+        if buffer[:1] != b"*":
+            # Inline command (telnet / redis-cli without RESP)
+            end = buffer.find(b"\r\n")
+            if end < 0:
+                break
+            line = bytes(buffer[:end]).decode(errors="replace")
+            del buffer[:end + 2]
+            if line.strip():
+                commands.append(line.split())
+            continue
+
+        end = buffer.find(b"\r\n")
+        if end < 0:
+            break
+        count = int(buffer[1:end])
+        pos = end + 2
+        args = []
+        for _ in range(count):
+            end = buffer.find(b"\r\n", pos)
+            if end < 0:
+                break
+            if buffer[pos:pos + 1] != b"$":
+                raise ReplyError("Protocol error: expected '$'")
+            length = int(buffer[pos + 1:end])
+            start = end + 2
+            if len(buffer) < start + length + 2:
+                break
+            args.append(bytes(buffer[start:start + length]).decode(errors="replace"))
+            pos = start + length + 2
+        if len(args) < count:
+            break
+        del buffer[:pos]
+        commands.append(args)
+    return commands
+
+
+# ============================================================================
+# CYPHER PARAMETERS
+# ============================================================================
+
+_NUMBER = re.compile(r"-?\d+(\.\d*)?([eE][-+]?\d+)?")
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_LITERAL_WORDS = {"null": None, "true": True, "false": False}
+
+
+class _LiteralParser:
+    """Cypher literals as written by build_params_header() and falkordb-py."""
+
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+
+    def skip_space(self):
+        while self.pos < len(self.text) and self.text[self.pos].isspace():
+            self.pos += 1
+
+    def value(self) -> Any:
+        self.skip_space()
+        char = self.text[self.pos:self.pos + 1]
+        if char in ('"', "'"):
+            return self.string(char)
+        if char == "[":
+            return self.sequence("]", self.value)
+        if char == "{":
+            return dict(self.sequence("}", self.entry))
+        number = _NUMBER.match(self.text, self.pos)
+        if number:
+            self.pos = number.end()
+            literal = number.group()
+            return float(literal) if number.group(1) or number.group(2) else int(literal)
+        word = _IDENTIFIER.match(self.text, self.pos)
+        if word and word.group().lower() in _LITERAL_WORDS:
+            self.pos = word.end()
+            return _LITERAL_WORDS[word.group().lower()]
+        raise ValueError(f"Unsupported parameter literal at: {self.text[self.pos:self.pos + 20]!r}")
+
+    def string(self, quote: str) -> str:
+        chars = []
+        self.pos += 1
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            if char == "\\" and self.pos + 1 < len(self.text):
+                chars.append(self.text[self.pos + 1])
+                self.pos += 2
+            elif char == quote:
+                self.pos += 1
+                return "".join(chars)
+            else:
+                chars.append(char)
+                self.pos += 1
+        raise ValueError("Unterminated string parameter")
+
+    def sequence(self, close: str, item: Callable[[], Any]) -> List[Any]:
+        items = []
+        self.pos += 1
+        self.skip_space()
+        if self.text[self.pos:self.pos + 1] == close:
+            self.pos += 1
+            return items
+        while True:
+            items.append(item())
+            self.skip_space()
+            char = self.text[self.pos:self.pos + 1]
+            self.pos += 1
+            if char == close:
+                return items
+            if char != ",":
+                raise ValueError(f"Expected ',' or '{close}' in parameter")
+
+    def entry(self) -> Tuple[str, Any]:
+        self.skip_space()
+        key = _IDENTIFIER.match(self.text, self.pos)
+        if not key or self.text[key.end():key.end() + 1] != ":":
+            raise ValueError("Expected key: value in map parameter")
+        self.pos = key.end() + 1
+        return key.group(), self.value()
+
+
+def split_params_header(query: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Split 'CYPHER k=v ... <cypher>' into (cypher, params).
+
+    Raises:
+        ValueError: Malformed parameter literal
+    """
+    stripped = query.lstrip()
+    if not stripped[:7].upper() == "CYPHER ":
+        return query, {}
+
+    parser = _LiteralParser(stripped, 7)
+    params = {}
+    while True:
+        parser.skip_space()
+        # falkordb-py backquotes the names: `citizen`="felix"
+        name = re.compile(r"`?([A-Za-z_][A-Za-z0-9_]*)`?\s*=").match(parser.text, parser.pos)
+        if not name:
+            break
+        parser.pos = name.end()
+        params[name.group(1)] = parser.value()
+    return parser.text[parser.pos:], params
+
+
+def normalize_cypher(cypher: str) -> str:
+    """Whitespace-insensitive form used to recognize statements."""
+    return " ".join(cypher.split())
+
+
+# ============================================================================
+# QUERY FUNCTION TEMPLATES
+# ============================================================================
+
+# Variable-length pattern of query_neighborhood (types and depth are inlined)
+_NEIGHBORHOOD_PATTERN = re.compile(r"\[:([A-Z_|]+)\*1\.\.(\d+)\]")
+_NEIGHBORHOOD_PLACEHOLDER = "[:TYPES*1..DEPTH]"
+
+# Query function kwarg -> query parameter carrying it
+_ARGUMENTS = {
+    "query_partnerships": {"partner_id": "partner_id", "citizen": "citizen"},
+    "query_conversations": {"partner_id": "partner_id", "keywords": "keywords",
+                            "citizen": "citizen", "limit": "limit"},
+    "query_technical_context": {"term": "term", "issue_type": "issue_type",
+                                "citizen": "citizen", "limit": "limit"},
+    "query_technical_context_many": {"terms": "terms", "issue_type": "issue_type",
+                                     "citizen": "citizen", "limit": "limit"},
+    "query_emotional_state": {"context_similar_to": "context_similar_to", "emotion": "emotion",
+                              "citizen": "citizen", "limit": "limit"},
+    "query_strategy_patterns": {"situation_type": "situation_type", "min_success_rate": "min_success_rate",
+                                "citizen": "citizen", "limit": "limit"},
+    "query_related_code": {"filename": "filename", "citizen": "citizen", "limit": "limit"},
+    "query_failed_attempts": {"context": "context", "citizen": "citizen", "limit": "limit"},
+    "query_active_constraints": {"constraint_type": "constraint_type", "component": "component_lc",
+                                 "citizen": "citizen", "limit": "limit"},
+    "query_neighborhood": {"sender": "partner_lc", "citizen": "citizen", "limit": "limit"},
+    "query_term_vocabulary": {"citizen": "citizen"},
+    "query_context_bundle": {"sender": "partner_id", "keywords": "keywords", "terms": "terms",
+                             "citizen": "citizen", "content": "content",
+                             **{name: name for name in BUNDLE_DEFAULTS if name != "min_severity"}},
+}
+
+# Optional kwargs the builders send as "" / [] when not given
+_OPTIONAL_ARGUMENTS = {"keywords", "issue_type", "emotion", "constraint_type", "component"}
+
+@dataclass
+class _Template:
+    """A recognized query function statement."""
+    tool: str
+    columns: List[str]
+    include_dependencies: Optional[bool] = None
+
+
+def _return_columns(cypher: str) -> List[str]:
+    """Column names of the final RETURN clause of a normalized statement."""
+    clause = cypher.rsplit(" RETURN ", 1)[1]
+    clause = re.split(r" ORDER BY | LIMIT ", clause)[0]
+    return [part.split(" AS ")[-1].strip() for part in clause.split(",")]
+
+
+def _build_templates() -> Dict[str, _Template]:
+    """Normalized Cypher of every builder variant the stand-in answers -> template."""
+    templates = {}
+    for tool, kwargs, cypher, _ in query_templates(SEARCH_CONTAINS):
+        if tool not in _ARGUMENTS:
+            continue
+        cypher = _NEIGHBORHOOD_PATTERN.sub(_NEIGHBORHOOD_PLACEHOLDER, normalize_cypher(cypher))
+        include = kwargs.get("include_dependencies", True) if tool == "query_related_code" else None
+        templates[cypher] = _Template(tool, _return_columns(cypher), include)
+    return templates
+
+
+_TEMPLATES = _build_templates()
+
+
+def _severity_for_rank(rank: Any) -> str:
+    """min_severity name whose SEVERITY_RANK is rank (min_rank parameter)."""
+    for name, value in SEVERITY_RANK.items():
+        if value == rank:
+            return name
+    raise ValueError(f"Unknown severity rank: {rank}")
+
+
+# ============================================================================
+# GRAPH
+# ============================================================================
+
+class StandInGraph:
+    """One read-only graph answering GRAPH.QUERY statements with --compact replies."""
+
+    def __init__(self, snapshot: GraphSnapshot):
+        self.tools = InMemoryGraphTools(snapshot)
+        self.nodes: List[_Node] = self.tools.nodes()
+        node_ids = {node.id for node in self.nodes}
+        self.edges: List[Tuple[int, str, int]] = [
+            (edge["src"], edge["type"], edge["dst"]) for edge in snapshot.edges
+            if edge["src"] in node_ids and edge["dst"] in node_ids
+        ]
+
+        # falkordb-py resolves ids through CALL db.labels() / db.propertyKeys()
+        self.labels = sorted({node.label for node in self.nodes})
+        self.property_keys = sorted({key for node in self.nodes for key in node.properties})
+        self.relationship_types = sorted({rel_type for _, rel_type, _ in self.edges})
+        self._label_ids = {label: i for i, label in enumerate(self.labels)}
+        self._property_ids = {key: i for i, key in enumerate(self.property_keys)}
+
+        self._statements: List[Tuple[re.Pattern, Callable]] = [
+            (re.compile(r"RETURN (-?\d+) AS (\w+)"), self._return_literal),
+            (re.compile(r"MATCH \((\w+)(?::(\w+))?\) RETURN count\(\1\)(?: AS (\w+))?"), self._count_nodes),
+            (re.compile(r"MATCH \((\w+):(\w+)\) WHERE \1\.(\w+) IS NOT NULL AND \1\.(\w+) IS NULL "
+                        r"RETURN count\(\1\)(?: AS (\w+))?"), self._count_missing),
+            (re.compile(r"MATCH \(\)-\[(\w+)(?::(\w+))?\]->\(\) RETURN count\(\1\)(?: AS (\w+))?"),
+             self._count_edges),
+            (re.compile(r"MATCH \((\w+)\) RETURN labels\(\1\)\[0\] AS (\w+), count\(\1\) AS (\w+)"
+                        r"(?: ORDER BY \2)?"), self._label_distribution),
+            (re.compile(r"MATCH \(\)-\[(\w+)\]->\(\) RETURN type\(\1\) AS (\w+), count\(\1\) AS (\w+)"
+                        r"(?: ORDER BY \2)?"), self._type_distribution),
+            (re.compile(r"MATCH \((\w+)\) RETURN labels\(\1\)\[0\] AS (\w+), \1\.(\w+) AS (\w+), "
+                        r"count\(\1\) AS (\w+)"), self._label_property_distribution),
+            (re.compile(r"MATCH \((\w+):(\w+)\) RETURN DISTINCT \1\.(\w+) AS (\w+), \1\.(\w+) AS (\w+)"),
+             self._distinct_properties),
+            (re.compile(r"MATCH \((\w+)(?::(\w+))?\) RETURN \1(?: LIMIT (\d+))?"), self._match_nodes),
+            (re.compile(r"MATCH \((\w+)\)-\[(\w+)\]->\((\w+)\) RETURN id\(\1\), type\(\2\), id\(\3\)"),
+             self._match_edges),
+            (re.compile(r"CALL db\.(labels|propertyKeys|relationshipTypes)\(\)", re.IGNORECASE), self._procedure),
+            (re.compile(r"CALL db\.indexes\(\) YIELD label, properties(, types)?", re.IGNORECASE), self._indexes),
+        ]
+
+    # ========================================================================
+    # ENCODING
+    # ========================================================================
+
+    def encode(self, value: Any) -> List[Any]:
+        """--compact [type, value] cell of a node or value."""
+        if value is None:
+            return [VALUE_NULL, None]
+        if isinstance(value, _Node):
+            properties = [[self._property_ids[k], *self.encode(v)] for k, v in value.properties.items()]
+            return [VALUE_NODE, [value.id, [self._label_ids[value.label]], properties]]
+        if isinstance(value, bool):
+            return [VALUE_BOOLEAN, "true" if value else "false"]
+        if isinstance(value, int):
+            return [VALUE_INTEGER, value]
+        if isinstance(value, float):
+            return [VALUE_DOUBLE, repr(value)]
+        if isinstance(value, (list, tuple)):
+            return [VALUE_ARRAY, [self.encode(v) for v in value]]
+        if isinstance(value, dict):
+            flat = []
+            for k, v in value.items():
+                flat.extend([k, self.encode(v)])
+            return [VALUE_MAP, flat]
+        return [VALUE_STRING, str(value)]
+
+    def reply(self, columns: List[str], rows: List[List[Any]], elapsed_ms: float) -> List[Any]:
+        """Full --compact reply: header, records, statistics."""
+        return [
+            [[COLUMN_SCALAR, name] for name in columns],
+            [[self.encode(value) for value in row] for row in rows],
+            ["Cached execution: 0", f"Query internal execution time: {elapsed_ms:.6f} milliseconds"]
+        ]
+
+    # ========================================================================
+    # EXECUTION
+    # ========================================================================
+
+    def query(self, query: str) -> List[Any]:
+        """
+        Run one GRAPH.QUERY statement (with its CYPHER params header).
+
+        Raises:
+            ReplyError: Unsupported statement, bad parameters or query failure
+        """
+        start_time = time.perf_counter()
+        _, columns, rows = self._execute(query)
+        return self.reply(columns, rows, (time.perf_counter() - start_time) * 1000)
+
+    def profile(self, query: str) -> List[str]:
+        """
+        GRAPH.PROFILE lines for a statement: the stand-in has no plan, so it
+        reports the one operation it ran (query function or statement).
+        """
+        start_time = time.perf_counter()
+        operation, _, rows = self._execute(query)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        stats = f"Records produced: {len(rows)}, Execution time: {elapsed_ms:.6f} ms"
+        return [f"Results | {stats}", f"    {operation} | {stats}"]
+
+    def explain(self, query: str) -> List[str]:
+        """
+        GRAPH.EXPLAIN lines for a statement: the answering operation, which
+        never scans a label (graph/query_plans.py reports it as "no scan").
+        Statements the stand-in can't run (fulltext queries) are explained
+        as not planned rather than rejected - EXPLAIN executes nothing.
+        """
+        try:
+            operation, _, _ = self._execute(query)
+        except ReplyError:
+            operation = "Not Planned (not supported by the FalkorDB stand-in)"
+        return ["Results", f"    {operation}"]
+
+    def _execute(self, query: str) -> Tuple[str, List[str], List[List[Any]]]:
+        """(operation name, columns, rows) of a statement."""
+        try:
+            cypher, params = split_params_header(query)
+        except ValueError as e:
+            raise ReplyError(str(e))
+        statement = normalize_cypher(cypher)
+
+        match = _NEIGHBORHOOD_PATTERN.search(statement)
+        template = _TEMPLATES.get(_NEIGHBORHOOD_PATTERN.sub(_NEIGHBORHOOD_PLACEHOLDER, statement))
+        if template is not None:
+            return (f"In-Memory Answer ({template.tool})",
+                    *self._query_function(template, params, match))
+
+        for pattern, handler in self._statements:
+            found = pattern.fullmatch(statement)
+            if found:
+                return (f"In-Memory Statement ({handler.__name__.lstrip('_')})",
+                        *handler(*found.groups()))
+        raise ReplyError(f"Statement not supported by the FalkorDB stand-in: {statement[:120]}")
+
+    def _query_function(self, template: _Template, params: Dict[str, Any],
+                        neighborhood: Optional[re.Match]) -> Tuple[List[str], List[List[Any]]]:
+        """Answer a query function statement through InMemoryGraphTools."""
+        kwargs = {}
+        for kwarg, param in _ARGUMENTS[template.tool].items():
+            if param not in params:
+                raise ReplyError(f"Missing parameter: {param}")
+            value = params[param]
+            kwargs[kwarg] = value if value or kwarg not in _OPTIONAL_ARGUMENTS else None
+
+        if template.tool in ("query_active_constraints", "query_context_bundle"):
+            kwargs["min_severity"] = _severity_for_rank(params.get("min_rank"))
+        elif template.tool == "query_related_code":
+            kwargs["include_dependencies"] = template.include_dependencies
+        elif template.tool == "query_neighborhood":
+            kwargs["relationships"] = neighborhood.group(1).split("|")
+            kwargs["max_depth"] = int(neighborhood.group(2))
+
+        try:
+            answer = self.tools.answer(template.tool, kwargs)
+        except Exception as e:
+            raise ReplyError(str(e))
+
+        rows = [
+            [row[column] for column in template.columns] if isinstance(row, dict) else [row]
+            for row in answer
+        ]
+        return template.columns, rows
+
+    # ========================================================================
+    # GENERIC STATEMENTS (preflight checks, snapshots, client id lookups)
+    # ========================================================================
+
+    def _return_literal(self, value, alias):
+        return [alias], [[int(value)]]
+
+    def _count_nodes(self, var, label, alias):
+        count = sum(1 for node in self.nodes if label is None or node.label == label)
+        return [alias or f"count({var})"], [[count]]
+
+    def _count_missing(self, var, label, source, prop, alias):
+        count = sum(1 for node in self.nodes
+                    if node.label == label and node.properties.get(source) is not None
+                    and node.properties.get(prop) is None)
+        return [alias or f"count({var})"], [[count]]
+
+    def _count_edges(self, var, rel_type, alias):
+        count = sum(1 for _, t, _ in self.edges if rel_type is None or t == rel_type)
+        return [alias or f"count({var})"], [[count]]
+
+    def _label_distribution(self, var, type_alias, count_alias):
+        counts: Dict[str, int] = {}
+        for node in self.nodes:
+            counts[node.label] = counts.get(node.label, 0) + 1
+        return [type_alias, count_alias], [[label, counts[label]] for label in sorted(counts)]
+
+    def _type_distribution(self, var, type_alias, count_alias):
+        counts: Dict[str, int] = {}
+        for _, rel_type, _ in self.edges:
+            counts[rel_type] = counts.get(rel_type, 0) + 1
+        return [type_alias, count_alias], [[rel_type, counts[rel_type]] for rel_type in sorted(counts)]
+
+    def _label_property_distribution(self, var, label_alias, prop, prop_alias, count_alias):
+        counts: Dict[Tuple[str, Any], int] = {}
+        for node in self.nodes:
+            key = (node.label, node.properties.get(prop))
+            counts[key] = counts.get(key, 0) + 1
+        return [label_alias, prop_alias, count_alias], [[label, value, count] for (label, value), count in counts.items()]
+
+    def _distinct_properties(self, var, label, first, first_alias, second, second_alias):
+        pairs = {
+            (node.properties.get(first), node.properties.get(second))
+            for node in self.nodes if node.label == label
+        }
+        return [first_alias, second_alias], [list(pair) for pair in pairs]
+
+    def _match_nodes(self, var, label, limit):
+        nodes = [node for node in self.nodes if label is None or node.label == label]
+        if limit is not None:
+            nodes = nodes[:int(limit)]
+        return [var], [[node] for node in nodes]
+
+    def _match_edges(self, src, rel, dst):
+        return [f"id({src})", f"type({rel})", f"id({dst})"], [list(edge) for edge in self.edges]
+
+    def _procedure(self, name):
+        values, column = {
+            "labels": (self.labels, "label"),
+            "propertykeys": (self.property_keys, "propertyKey"),
+            "relationshiptypes": (self.relationship_types, "relationshipType"),
+        }[name.lower()]
+        return [column], [[value] for value in values]
+
+    def _indexes(self, with_types):
+        # In-memory lookups need no index: report every schema.cypher index as present
+        indices = schema_indices()
+        types: Dict[str, Dict[str, List[str]]] = {}
+        for kind, label_props in (("RANGE", indices["range"]), ("FULLTEXT", indices["fulltext"])):
+            for label, prop in label_props:
+                types.setdefault(label, {}).setdefault(prop, []).append(kind)
+        rows = [[label, list(props), props] for label, props in sorted(types.items())]
+        if with_types:
+            return ["label", "properties", "types"], rows
+        return ["label", "properties"], [row[:2] for row in rows]
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class _Connection(asyncio.Protocol):
+    """One client connection: parse, answer, reply after the injected delay."""
+
+    def __init__(self, server: "StandInServer"):
+        self.server = server
+        self.buffer = bytearray()
+        self.transport = None
+        self.protocol = 2           # RESP version (HELLO switches it)
+        self.busy_until = 0.0       # Loop time the last command finishes "executing"
+        self.last_reply_at = 0.0    # Replies leave in order
+        self.pending: List[Tuple[float, bytes]] = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.loop = asyncio.get_running_loop()
+
+    def data_received(self, data: bytes):
+        self.buffer.extend(data)
+        try:
+            commands = parse_commands(self.buffer)
+        except (ReplyError, ValueError) as e:
+            self.transport.write(encode_reply(ReplyError(f"Protocol error: {e}")))
+            self.transport.close()
+            return
+        if not commands:
+            return
+
+        arrived = self.loop.time()
+        payload = b"".join(self._reply(command) for command in commands)
+
+        latency = self.server.latency
+        computed = self.loop.time() - arrived
+        self.busy_until = (max(arrived, self.busy_until) + computed
+                           + len(commands) * latency.command_ms / 1000)
+        jitter = self.server.random.uniform(0, latency.jitter_ms) if latency.jitter_ms else 0.0
+        reply_at = max(self.busy_until + (latency.rtt_ms + jitter) / 1000, self.last_reply_at)
+        self.last_reply_at = reply_at
+
+        self.pending.append((reply_at, payload))
+        self.loop.call_at(reply_at, self._flush)
+
+    def _reply(self, command: List[str]) -> bytes:
+        if command[0].upper() != "HELLO":
+            return encode_reply(self.server.execute(command), self.protocol)
+
+        # HELLO [protover ...] (redis-py sends HELLO 3 on connect) is per connection
+        protocol = int(command[1]) if len(command) > 1 and command[1].isdigit() else self.protocol
+        if protocol not in (2, 3):
+            return encode_reply(ReplyError("NOPROTO unsupported protocol version"))
+        self.protocol = protocol
+        return encode_reply({
+            "server": "redis", "version": "7.2.0", "proto": protocol, "id": id(self),
+            "mode": "standalone", "role": "master", "modules": []
+        }, protocol)
+
+    def _flush(self):
+        now = self.loop.time()
+        while self.pending and self.pending[0][0] <= now:
+            _, payload = self.pending.pop(0)
+            if not self.transport.is_closing():
+                self.transport.write(payload)
+
+
+class StandInServer:
+    """
+    RESP server answering FalkorDB clients from in-memory graphs.
+
+    Run it in the foreground (serve_forever) or in a background thread
+    (start/stop, or as a context manager).
+    """
+
+    def __init__(
+        self,
+        graphs: Optional[Dict[str, GraphSnapshot]] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        latency: Optional[LatencyProfile] = None
+    ):
+        """
+        Args:
+            graphs: Graph name -> snapshot to serve (more via add_graph())
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port, see .port once started)
+            latency: Injected latency (default: none)
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency or LatencyProfile()
+        self.random = random.Random(self.latency.seed)
+        self.graphs: Dict[str, StandInGraph] = {}
+        self.keys: Dict[str, str] = {}
+        self.commands = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+        for name, snapshot in (graphs or {}).items():
+            self.add_graph(snapshot, name)
+
+    def add_graph(self, snapshot: GraphSnapshot, graph_name: Optional[str] = None):
+        """Serve snapshot as graph_name (default: snapshot.graph_name), seeding its version key."""
+        graph_name = graph_name or snapshot.graph_name
+        self.graphs[graph_name] = StandInGraph(snapshot)
+        self.keys[version_key(graph_name)] = str(snapshot.version)
+
+    # ========================================================================
+    # COMMANDS
+    # ========================================================================
+
+    def execute(self, args: List[str]) -> Any:
+        """Reply to one command (errors are returned as ReplyError, not raised)."""
+        self.commands += 1
+        name = args[0].upper() if args else ""
+        handler = getattr(self, "_cmd_" + name.replace(".", "_"), None)
+        if handler is None:
+            return ReplyError(f"unknown command '{name}'")
+        try:
+            return handler(*args[1:])
+        except ReplyError as e:
+            return e
+        except TypeError:
+            return ReplyError(f"wrong number of arguments for '{name}' command")
+        except Exception as e:
+            return ReplyError(str(e))
+
+    def _cmd_PING(self, message=None):
+        return SimpleString("PONG") if message is None else message
+
+    def _cmd_ECHO(self, message):
+        return message
+
+    def _cmd_SELECT(self, db):
+        return SimpleString("OK")
+
+    def _cmd_CLIENT(self, *args):
+        # SETINFO / SETNAME from redis-py on connect
+        return SimpleString("OK")
+
+    def _cmd_INFO(self, *sections):
+        # falkordb-py checks redis_mode for sentinel/cluster deployments
+        return "# Server\r\nredis_version:7.2.0\r\nredis_mode:standalone\r\n"
+
+    def _cmd_GET(self, key):
+        return self.keys.get(key)
+
+    def _cmd_SET(self, key, value, *options):
+        self.keys[key] = value
+        return SimpleString("OK")
+
+    def _cmd_INCR(self, key):
+        return self._cmd_INCRBY(key, 1)
+
+    def _cmd_INCRBY(self, key, increment):
+        # redis-py's incr() sends INCRBY key 1
+        try:
+            value = int(self.keys.get(key, 0)) + int(increment)
+        except ValueError:
+            raise ReplyError("value is not an integer or out of range")
+        self.keys[key] = str(value)
+        return value
+
+    def _cmd_DEL(self, *keys):
+        return sum(1 for key in keys if self.keys.pop(key, None) is not None)
+
+    def _cmd_GRAPH_LIST(self):
+        return sorted(self.graphs)
+
+    def _cmd_GRAPH_QUERY(self, graph_name, query, *options):
+        if "--compact" not in options:
+            raise ReplyError("The FalkorDB stand-in only replies in --compact mode")
+        if graph_name not in self.graphs:
+            raise ReplyError("Invalid graph operation on empty key")
+        return self.graphs[graph_name].query(query)
+
+    _cmd_GRAPH_RO_QUERY = _cmd_GRAPH_QUERY
+
+    def _cmd_GRAPH_PROFILE(self, graph_name, query, *options):
+        if graph_name not in self.graphs:
+            raise ReplyError("Invalid graph operation on empty key")
+        return self.graphs[graph_name].profile(query)
+
+    def _cmd_GRAPH_EXPLAIN(self, graph_name, query, *options):
+        if graph_name not in self.graphs:
+            raise ReplyError("Invalid graph operation on empty key")
+        return self.graphs[graph_name].explain(query)
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    async def _listen(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await self._loop.create_server(lambda: _Connection(self), self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def serve_forever(self):
+        """Listen in the foreground until interrupted."""
+        async def run():
+            await self._listen()
+            print(f"✓ FalkorDB stand-in listening on {self.host}:{self.port}")
+            async with self._server:
+                await self._server.serve_forever()
+
+        asyncio.run(run())
+
+    def start(self) -> "StandInServer":
+        """Listen in a background thread; returns once the port is bound."""
+        ready = threading.Event()
+        errors: List[Exception] = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self._listen())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            loop.run_forever()
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="falkordb-standin", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop(self):
+        """Stop a server started with start()."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="FalkorDB stand-in over an in-memory graph")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--graph", help="Graph name to serve (default: from the snapshot)")
+    parser.add_argument("--snapshot", help="GraphSnapshot JSON (python graph/memory_tools.py ...)")
+    parser.add_argument("--seed-data", action="store_true",
+                        help="Serve the graph/seed_data.py graph (what preflight_check.py expects)")
+    parser.add_argument("--nodes", type=int, default=1000,
+                        help="Without --snapshot: synthetic graph of ~this many nodes")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic graph seed (also seeds jitter)")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Round trip per burst of commands")
+    parser.add_argument("--command-ms", type=float, default=0.0, help="Server time per command")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay per burst (max)")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        snapshot = GraphSnapshot.load(args.snapshot)
+    elif args.seed_data:
+        from graph.seed_data import SEED_NODES, SEED_RELATIONSHIPS
+        snapshot = GraphSnapshot.from_records(SEED_NODES, SEED_RELATIONSHIPS)
+    else:
+        from graph.synthetic import SyntheticConfig, SyntheticGraph
+        snapshot = SyntheticGraph(SyntheticConfig.for_nodes(args.nodes, seed=args.seed)).snapshot()
+
+    latency = LatencyProfile(args.rtt_ms, args.command_ms, args.jitter_ms, args.seed)
+    server = StandInServer({args.graph or snapshot.graph_name: snapshot}, args.host, args.port, latency)
+    print(f"✓ Serving '{args.graph or snapshot.graph_name}': {len(snapshot.nodes)} nodes, "
+          f"{len(snapshot.edges)} relationships")
+    print(f"  Latency: rtt {latency.rtt_ms}ms, command {latency.command_ms}ms, jitter {latency.jitter_ms}ms")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+    except OSError as e:
+        print(f"\n✗ Cannot listen on {args.host}:{args.port}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Existence Summary - Which Query Functions Are Guaranteed to Come Back Empty
+
+Purpose: Skip queries for labels (or keys) a citizen has no nodes for
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-26
+
+Opt-in: GraphTools(summary=ExistenceSummary()).
+
+Many citizens have no Failed_Attempt or Emotional_State nodes at all, yet the
+lenses pay a full query to learn that. The summary holds:
+
+- Node count per (citizen, label): a query function over a label the citizen
+  has no nodes of can only return nothing
+- A Bloom filter over the exact-match keys the query functions filter on
+  (partner, issue type, emotion, constraint type): a key the filter has
+  never seen has no node either. Bloom filters have false positives, never
+  false negatives, so a "maybe" just runs the query
+
+Free-text filters (CONTAINS / full-text) are never judged: only a missing
+label or key proves a result empty.
+
+Reloaded as a whole when the graph version moves (graph/version.py), like
+QueryCache. Writes from another process are seen after the version check
+interval, the same window the cache has.
+
+The reload (one count query, one DISTINCT scan per keyed label) runs on a
+background thread by default, off the lens path: until it lands,
+known_empty() answers False for everything, so queries just run.
+"""
+
+import hashlib
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from graph.tools import normalize_value
+
+
+# Query function -> label it reads
+SUMMARY_LABELS = {
+    "query_partnerships": "Partnership",
+    "query_conversations": "Conversation_Memory",
+    "query_technical_context": "Technical_Context",
+    "query_technical_context_many": "Technical_Context",
+    "query_emotional_state": "Emotional_State",
+    "query_strategy_patterns": "Strategy_Pattern",
+    "query_related_code": "Code_Reference",
+    "query_failed_attempts": "Failed_Attempt",
+    "query_active_constraints": "Constraint",
+}
+
+# Query function -> (kwarg, property it must equal, normalization of the kwarg)
+SUMMARY_KEYS: Dict[str, Tuple[str, str, Optional[Callable[[Any], Any]]]] = {
+    "query_partnerships": ("partner_id", "partner_name_lc", normalize_value),
+    "query_conversations": ("partner_id", "partner", None),
+    "query_technical_context": ("issue_type", "issue_type_lc", normalize_value),
+    "query_technical_context_many": ("issue_type", "issue_type_lc", normalize_value),
+    "query_emotional_state": ("emotion", "emotion_lc", normalize_value),
+    "query_active_constraints": ("constraint_type", "constraint_type_lc", normalize_value),
+}
+
+# Bloom filter false positive rate (a false positive only costs the query)
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+
+# ============================================================================
+# BLOOM FILTER
+# ============================================================================
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity: int, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE):
+        """
+        Args:
+            capacity: Expected number of keys
+            false_positive_rate: Target rate at capacity
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _bloom_key(citizen: Any, label: str, prop: str, value: Any) -> str:
+    return f"{citizen}\x1f{label}\x1f{prop}\x1f{value}"
+
+
+# ============================================================================
+# SUMMARY
+# ============================================================================
+
+class ExistenceSummary:
+    """
+    Per-(citizen, label) node counts plus a Bloom filter of exact-match keys.
+
+    Thread-safe. known_empty() only answers True when the summary proves the
+    query empty; anything unknown (not loaded, being rebuilt, unsupported
+    tool) is False.
+    """
+
+    def __init__(self, bloom: bool = True, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+                 background: bool = True):
+        """
+        Args:
+            bloom: Also keep the key Bloom filter (else label counts only)
+            false_positive_rate: Bloom filter false positive rate
+            background: Rebuild on a daemon thread (else inside refresh())
+        """
+        self.bloom = bloom
+        self.false_positive_rate = false_positive_rate
+        self.background = background
+
+        self._counts: Dict[Tuple[Any, str], int] = {}
+        self._keys: Optional[BloomFilter] = None
+        self._key_count = 0
+        self._version: Optional[int] = None     # Version the summary was built at
+        self._target: Optional[int] = None      # Latest version asked for
+        self._building = False
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.checks = 0
+        self.skipped = 0
+        self.loads = 0
+        self.failures = 0
+
+    @staticmethod
+    def count_query() -> str:
+        """Cypher counting nodes per label and citizen."""
+        return "MATCH (n) RETURN labels(n)[0] AS label, n.citizen AS citizen, count(n) AS nodes"
+
+    @staticmethod
+    def key_query(label: str, prop: str) -> str:
+        """Cypher listing the distinct (citizen, key) pairs of one label."""
+        return f"MATCH (n:{label}) RETURN DISTINCT n.citizen AS citizen, n.{prop} AS value"
+
+    def refresh(self, graph, version: int) -> bool:
+        """
+        Reload from the graph if it moved since the summary was built.
+
+        In the background (default) this only starts the rebuild and
+        returns; a rebuild already running picks up the newest version when
+        it is done. A failed background rebuild is retried at the next
+        version change.
+
+        Args:
+            graph: FalkorDB graph handle
+            version: Current graph version
+
+        Returns:
+            True if the summary was reloaded (background: a rebuild started)
+        """
+        if not self.background:
+            if self._version == version:
+                return False
+            with self._lock:
+                if self._version == version:
+                    return False
+                self._target = version
+                self._install(version, self._build(graph))
+                return True
+
+        if self._target == version:
+            return False
+
+        with self._lock:
+            if self._target == version:
+                return False
+            self._target = version
+            self._ready.clear()
+            if self._building:
+                return True
+            self._building = True
+
+        threading.Thread(target=self._rebuild, args=(graph,), name="existence-summary", daemon=True).start()
+        return True
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the summary is built at the latest version asked for (True) or timeout."""
+        return self._ready.wait(timeout)
+
+    def _rebuild(self, graph):
+        """Background rebuild loop: build, then again while the version moved meanwhile."""
+        while True:
+            version = self._target
+            try:
+                built = self._build(graph)
+            except Exception:
+                built = None
+
+            with self._lock:
+                if built is None:
+                    self.failures += 1
+                elif self._target == version:
+                    self._install(version, built)
+                if built is None or self._target == version:
+                    self._building = False
+                    self._ready.set()
+                    return
+
+    def _build(self, graph) -> Tuple[Dict[Tuple[Any, str], int], Optional[BloomFilter], int]:
+        """(label counts, key Bloom filter, key count) read from the graph."""
+        counts = {}
+        for label, citizen, nodes in graph.query(self.count_query()).result_set:
+            counts[(citizen, label)] = nodes
+
+        keys, key_count = None, 0
+        if self.bloom:
+            pairs = []
+            for label, prop in sorted({(SUMMARY_LABELS[tool], prop) for tool, (_, prop, _) in SUMMARY_KEYS.items()}):
+                pairs.extend(
+                    _bloom_key(citizen, label, prop, value)
+                    for citizen, value in graph.query(self.key_query(label, prop)).result_set
+                    if value is not None
+                )
+            keys, key_count = BloomFilter(len(pairs), self.false_positive_rate), len(pairs)
+            for pair in pairs:
+                keys.add(pair)
+
+        return counts, keys, key_count
+
+    def _install(self, version: int, built: Tuple):
+        """Swap in a built summary (caller holds the lock)."""
+        self._counts, self._keys, self._key_count = built
+        self._version = version
+        self.loads += 1
+
+    def count(self, citizen: Any, label: str) -> int:
+        """Nodes of a label a citizen has (0 if none or not loaded)."""
+        return self._counts.get((citizen, label), 0)
+
+    def known_empty(self, tool: str, params: Dict[str, Any]) -> bool:
+        """
+        Whether a query function call is guaranteed to return nothing.
+
+        Args:
+            tool: Query function name
+            params: Its keyword arguments (citizen defaults to "felix")
+        """
+        label = SUMMARY_LABELS.get(tool)
+        if label is None or self._version is None or self._version != self._target:
+            return False
+
+        citizen = params.get("citizen", "felix")
+        empty = self._counts.get((citizen, label), 0) == 0
+
+        if not empty and self._keys is not None and tool in SUMMARY_KEYS:
+            kwarg, prop, normalize = SUMMARY_KEYS[tool]
+            value = params.get(kwarg)
+            if value:
+                value = normalize(value) if normalize else value
+                empty = _bloom_key(citizen, label, prop, value) not in self._keys
+
+        with self._lock:
+            self.checks += 1
+            if empty:
+                self.skipped += 1
+        return empty
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and occupancy snapshot."""
+        with self._lock:
+            return {
+                "graph_version": self._version,
+                "ready": self._version is not None and self._version == self._target,
+                "labels": len(self._counts),
+                "keys": self._key_count,
+                "bloom_bytes": len(self._keys.bits) if self._keys is not None else 0,
+                "checks": self.checks,
+                "skipped": self.skipped,
+                "skip_rate": self.skipped / self.checks if self.checks else 0.0,
+                "loads": self.loads,
+                "failures": self.failures,
+            }
@@ -0,0 +1,485 @@
+"""
+Synthetic Graph Generator - Citizen Graphs at Production Scale
+
+Purpose: Measure lenses and query functions on realistic graph sizes
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+seed_data.py builds the 11-node B01 fixture. This builds N citizens x M
+partners x K memories per node type, with the same schema (see
+docs/schemas/graph_schema.md):
+
+- Realistic text: components, issue types, emotions and strategies drawn
+  from the vocabulary of the real graph, so CONTAINS/full-text filters hit
+  and miss the way they do in production
+- Skew: conversations, technical contexts and code dependencies follow a
+  Zipf-like distribution (a few hot partners/components, a long tail)
+- Relationships: every Citizen hub edge, plus WITH_PERSON, ABOUT_TOPIC and
+  DEPENDS_ON (what query_neighborhood walks)
+- Deterministic: the same config and seed always produce the same graph
+- Bulk writes: GraphIngestor (graph/ingest.py) UNWIND batches, one citizen
+  at a time, so 10^6 nodes never sit in memory at once (except with --snapshot)
+
+Nodes per graph: N * (1 + M + 7K) + M Persons.
+
+Usage:
+    python graph/synthetic.py --nodes 100000
+    python graph/synthetic.py --citizens 10 --partners 20 --memories 500 --seed 7
+    python graph/synthetic.py --nodes 1000 --snapshot synthetic.json   # no FalkorDB
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+from graph.ingest import DEFAULT_BATCH_SIZE, GraphIngestor, NodeRecord, RelationshipRecord
+from graph.tools import create_fulltext_indices
+from graph.memory_tools import GraphSnapshot
+from graph.version import bump_graph_version
+
+# FalkorDB client (pip install FalkorDB)
+try:
+    from falkordb import FalkorDB
+except ImportError:
+    print("WARNING: FalkorDB not installed. Run: pip install FalkorDB")
+    FalkorDB = None
+
+
+# Memory node types generated K times per citizen, with their hub relationship
+MEMORY_LABELS = {
+    "Conversation_Memory": "HAS_CONVERSATION",
+    "Technical_Context": "HAS_TECHNICAL_CONTEXT",
+    "Emotional_State": "HAS_EMOTIONAL_STATE",
+    "Strategy_Pattern": "KNOWS_STRATEGY",
+    "Code_Reference": "REFERENCES_CODE",
+    "Failed_Attempt": "LEARNED_FROM_FAILURE",
+    "Constraint": "SUBJECT_TO_CONSTRAINT",
+}
+
+
+# ============================================================================
+# VOCABULARY
+# ============================================================================
+
+CITIZEN_NAMES = ["felix", "lucia", "atlas", "iris", "victor", "marco", "elena", "orion"]
+PARTNER_NAMES = [
+    "Nicolas", "Ada", "Yann", "Sofia", "Tomas", "Mira", "Kenji", "Lea",
+    "Omar", "Ines", "Pavel", "Nora", "Raj", "Clara", "Hugo", "Amara"
+]
+ROLES = ["Co-Founder", "Engineer", "Researcher", "Designer", "Operator", "Investor"]
+COMMUNICATION_STYLES = [
+    "Direct, technical, values testing and systematic approaches",
+    "Exploratory, asks why before how",
+    "Concise, prefers decisions over discussion",
+    "Warm, collaborative, thinks out loud",
+]
+
+DIRECTORIES = ["orchestration/mechanisms", "orchestration", "graph", "dreamer", "loop", "telegram", "substrate"]
+COMPONENTS = [
+    "stimulus_integrator", "consciousness_engine_v2", "graph_physics", "traversal",
+    "memory_substrate", "energy_diffusion", "criticality_monitor", "working_memory",
+    "entity_extractor", "lens_explorer", "synthesis_engine", "upwelling_router",
+    "telegram_bridge", "session_store", "query_cache", "falkordb_pool",
+    "embedding_service", "decay_scheduler", "link_strengthener", "context_assembler",
+]
+ISSUE_TYPES = [
+    "race condition", "memory leak", "deadlock", "timeout", "performance regression",
+    "data corruption", "off-by-one", "null reference", "flaky test", "schema drift",
+]
+SYMPTOMS = [
+    "intermittent failures under concurrent load",
+    "latency spikes when the graph grows",
+    "inconsistent results between runs",
+    "crashes after long uptime",
+    "silently dropped updates",
+    "energy values drifting out of bounds",
+]
+STATUSES = ["investigating", "in progress", "resolved", "blocked", "monitoring"]
+EMOTIONS = ["frustration", "curiosity", "satisfaction", "anxiety", "determination", "pride", "fatigue"]
+EMOTION_CONTEXTS = [
+    "Bug recurrence represents unfinished work",
+    "Deadline approaching with open issues",
+    "Breakthrough after long debugging session",
+    "Unclear requirements from partner",
+    "Refactor landed cleanly",
+    "Tests failing for unknown reasons",
+]
+STRATEGIES = [
+    ("Systematic debugging for concurrency issues", "Race conditions, timing bugs, concurrency issues"),
+    ("Bisect recent changes", "Regressions, performance regression, flaky test"),
+    ("Add instrumentation before fixing", "Timeouts, latency spikes, intermittent failures"),
+    ("Write a failing test first", "Off-by-one, null reference, data corruption"),
+    ("Profile under production load", "Memory leak, performance regression"),
+    ("Pair review with partner", "Schema drift, unclear requirements"),
+]
+FAILED_APPROACHES = [
+    "Added sleep() delay to reduce race window",
+    "Increased timeout values",
+    "Wrapped everything in a global lock",
+    "Retried on failure without root cause",
+    "Cached results without invalidation",
+    "Disabled the flaky test",
+]
+CONSTRAINT_TYPES = ["deadline", "resource", "quality", "dependency", "compliance"]
+SEVERITIES = ["low", "medium", "high", "critical"]
+SEVERITY_WEIGHTS = [40, 35, 18, 7]
+COMPLEXITIES = ["low", "medium", "high"]
+
+
+# ============================================================================
+# GENERATOR
+# ============================================================================
+
+@dataclass
+class SyntheticConfig:
+    """Shape of a synthetic graph."""
+    citizens: int = 1                   # N
+    partners: int = 5                   # M (Person nodes, shared by all citizens)
+    memories: int = 10                  # K nodes per memory type per citizen
+    seed: int = 42
+    skew: float = 1.1                   # Zipf exponent (0 = uniform)
+    start: str = "2024-01-01T00:00:00"  # Earliest timestamp
+    span_days: int = 330                # Timestamps spread over this many days
+
+    @property
+    def node_count(self) -> int:
+        """Total nodes the config generates."""
+        return self.citizens * (1 + self.partners + len(MEMORY_LABELS) * self.memories) + self.partners
+
+    @classmethod
+    def for_nodes(cls, nodes: int, citizens: int = 1, partners: int = 5, **kwargs) -> "SyntheticConfig":
+        """Config whose node count is closest to `nodes` (K is derived)."""
+        per_citizen = (nodes - partners) / citizens - 1 - partners
+        memories = max(1, round(per_citizen / len(MEMORY_LABELS)))
+        return cls(citizens=citizens, partners=partners, memories=memories, **kwargs)
+
+
+def _zipf_weights(n: int, skew: float) -> List[float]:
+    """Cumulative Zipf-like weights for ranks 0..n-1."""
+    cumulative, total = [], 0.0
+    for rank in range(n):
+        total += 1.0 / (rank + 1) ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+def _pick_index(rng: random.Random, cumulative: List[float]) -> int:
+    """Index drawn with the given cumulative weights."""
+    return rng.choices(range(len(cumulative)), cum_weights=cumulative)[0]
+
+
+class SyntheticGraph:
+    """
+    Deterministic generator of citizen graphs.
+
+    persons() first, then citizen(i) for i in range(config.citizens); each
+    returns the nodes and the relationships among them (and to Persons).
+    """
+
+    def __init__(self, config: SyntheticConfig):
+        self.config = config
+        self.start = datetime.fromisoformat(config.start)
+        self.partner_ids = [self._partner_name(i).lower() for i in range(config.partners)]
+
+    def _partner_name(self, i: int) -> str:
+        base = PARTNER_NAMES[i % len(PARTNER_NAMES)]
+        return base if i < len(PARTNER_NAMES) else f"{base}_{i // len(PARTNER_NAMES)}"
+
+    def _citizen_id(self, i: int) -> str:
+        base = CITIZEN_NAMES[i % len(CITIZEN_NAMES)]
+        return base if i < len(CITIZEN_NAMES) else f"{base}_{i // len(CITIZEN_NAMES)}"
+
+    def _timestamp(self, rng: random.Random) -> str:
+        seconds = rng.randrange(self.config.span_days * 86400)
+        return (self.start + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def persons(self) -> List[NodeRecord]:
+        """The M Person nodes."""
+        rng = random.Random(f"{self.config.seed}:persons")
+        return [
+            NodeRecord("Person", {
+                "id": person_id,
+                "name": self._partner_name(i),
+                "role": rng.choice(ROLES),
+                "created_at": self.config.start + "Z"
+            })
+            for i, person_id in enumerate(self.partner_ids)
+        ]
+
+    def citizen(self, index: int) -> Tuple[List[NodeRecord], List[RelationshipRecord]]:
+        """All nodes and relationships of citizen `index`."""
+        config = self.config
+        rng = random.Random(f"{config.seed}:citizen:{index}")
+        citizen = self._citizen_id(index)
+        k = config.memories
+
+        partner_weights = _zipf_weights(len(self.partner_ids), config.skew)
+        component_weights = _zipf_weights(len(COMPONENTS), config.skew)
+        code_weights = _zipf_weights(k, config.skew)
+
+        nodes: List[NodeRecord] = [NodeRecord("Citizen", {
+            "id": citizen,
+            "name": citizen.capitalize(),
+            "role": "Runtime Engineer",
+            "focus_area": "Graph Physics",
+            "created_at": config.start + "Z",
+            "active": True
+        })]
+        edges: List[RelationshipRecord] = []
+
+        def add(label: str, properties: Dict[str, Any]):
+            nodes.append(NodeRecord(label, properties))
+            edges.append(RelationshipRecord("Citizen", citizen, MEMORY_LABELS.get(label, "HAS_PARTNERSHIP"),
+                                            label, properties["id"]))
+
+        for i, partner_id in enumerate(self.partner_ids):
+            add("Partnership", {
+                "id": f"partnership_{citizen}_{partner_id}",
+                "citizen": citizen,
+                "partner_name": self._partner_name(i),
+                "partner_role": rng.choice(ROLES),
+                "trust_level": round(rng.uniform(0.3, 1.0), 2),
+                "communication_style": rng.choice(COMMUNICATION_STYLES),
+                "relationship_type": "Professional Partnership",
+                "shared_history": [f"{rng.choice(COMPONENTS)} launch", f"{rng.randint(1, 24)} months collaboration"],
+                "partnership_duration": f"{rng.randint(1, 36)} months",
+                "created_at": self._timestamp(rng),
+                "updated_at": self._timestamp(rng)
+            })
+
+        # Technical contexts first: conversations are ABOUT_TOPIC them
+        tech_by_component: Dict[str, List[str]] = {}
+        for i in range(k):
+            component = COMPONENTS[_pick_index(rng, component_weights)]
+            tech_id = f"tech_{citizen}_{i}"
+            tech_by_component.setdefault(component, []).append(tech_id)
+            issue = rng.choice(ISSUE_TYPES)
+            add("Technical_Context", {
+                "id": tech_id,
+                "citizen": citizen,
+                "component": f"{component}.py",
+                "issue_type": issue,
+                "description": f"{issue.capitalize()} in {component} - {rng.choice(SYMPTOMS)}",
+                "status": rng.choice(STATUSES),
+                "recurrence_count": min(int(rng.paretovariate(1.5)), 20),
+                "related_code": [f"{c}.py" for c in rng.sample(COMPONENTS, 3)],
+                "created_at": self._timestamp(rng),
+                "updated_at": self._timestamp(rng)
+            })
+
+        for i in range(k):
+            partner_id = self.partner_ids[_pick_index(rng, partner_weights)]
+            component = COMPONENTS[_pick_index(rng, component_weights)]
+            issue = rng.choice(ISSUE_TYPES)
+            timestamp = self._timestamp(rng)
+            conv_id = f"conv_{citizen}_{i}"
+            add("Conversation_Memory", {
+                "id": conv_id,
+                "citizen": citizen,
+                "partner": partner_id,
+                "topic": f"{component} {issue}",
+                "message_count": rng.randint(2, 60),
+                "key_points": [rng.choice(SYMPTOMS).capitalize(), f"Check {rng.choice(COMPONENTS)}"],
+                "emotional_tone": rng.choice(EMOTIONS).capitalize(),
+                "outcome": rng.choice(STATUSES).capitalize(),
+                "timestamp": timestamp,
+                "created_at": timestamp
+            })
+            edges.append(RelationshipRecord("Conversation_Memory", conv_id, "WITH_PERSON", "Person", partner_id))
+            if component in tech_by_component:
+                edges.append(RelationshipRecord("Conversation_Memory", conv_id, "ABOUT_TOPIC", "Technical_Context",
+                                                rng.choice(tech_by_component[component])))
+
+        for i in range(k):
+            add("Emotional_State", {
+                "id": f"emotion_{citizen}_{i}",
+                "citizen": citizen,
+                "emotion": rng.choice(EMOTIONS),
+                "intensity": round(rng.uniform(0.1, 1.0), 2),
+                "context": f"{rng.choice(EMOTION_CONTEXTS)} ({rng.choice(ISSUE_TYPES)})",
+                "counterbalance": rng.choice(EMOTIONS).capitalize(),
+                "trigger_pattern": rng.choice(SYMPTOMS),
+                "created_at": self._timestamp(rng)
+            })
+
+        for i in range(k):
+            approach, applicability = rng.choice(STRATEGIES)
+            add("Strategy_Pattern", {
+                "id": f"strategy_{citizen}_{i}",
+                "citizen": citizen,
+                "approach": approach,
+                "success_rate": round(rng.betavariate(5, 2), 2),
+                "steps": [rng.choice(FAILED_APPROACHES).replace("Added", "Avoid"), "Verify under load"],
+                "applicability": applicability,
+                "created_at": self._timestamp(rng),
+                "updated_at": self._timestamp(rng)
+            })
+
+        for i in range(k):
+            component = COMPONENTS[i % len(COMPONENTS)]
+            suffix = "" if i < len(COMPONENTS) else f"_{i // len(COMPONENTS)}"
+            code_id = f"code_{citizen}_{i}"
+            add("Code_Reference", {
+                "id": code_id,
+                "citizen": citizen,
+                "file_path": f"{rng.choice(DIRECTORIES)}/{component}{suffix}.py",
+                "description": f"{component.replace('_', ' ').capitalize()} module",
+                "complexity": rng.choice(COMPLEXITIES),
+                "created_at": self._timestamp(rng),
+                "updated_at": self._timestamp(rng)
+            })
+            # Depend on earlier files, popular (low index) ones more often
+            for dep in {_pick_index(rng, code_weights[:i]) for _ in range(rng.randint(0, 3))} if i else ():
+                edges.append(RelationshipRecord("Code_Reference", code_id, "DEPENDS_ON", "Code_Reference",
+                                                f"code_{citizen}_{dep}", {"dependency_type": "import"}))
+
+        for i in range(k):
+            component = COMPONENTS[_pick_index(rng, component_weights)]
+            timestamp = self._timestamp(rng)
+            add("Failed_Attempt", {
+                "id": f"fail_{citizen}_{i}",
+                "citizen": citizen,
+                "context": f"Attempted quick fix for {component} {rng.choice(ISSUE_TYPES)}",
+                "approach": rng.choice(FAILED_APPROACHES),
+                "why_failed": "Didn't address root cause",
+                "lesson_learned": "Fix the cause, not the symptom",
+                "timestamp": timestamp,
+                "created_at": timestamp
+            })
+
+        for i in range(k):
+            component = COMPONENTS[_pick_index(rng, component_weights)]
+            add("Constraint", {
+                "id": f"constraint_{citizen}_{i}",
+                "citizen": citizen,
+                "constraint_type": rng.choice(CONSTRAINT_TYPES),
+                "description": f"{component}.py must be stable before release",
+                "severity": rng.choices(SEVERITIES, weights=SEVERITY_WEIGHTS)[0],
+                "deadline": self._timestamp(rng),
+                "impact": "Blocks release",
+                "status": "active" if rng.random() < 0.7 else "resolved",
+                "created_at": self._timestamp(rng),
+                "updated_at": self._timestamp(rng)
+            })
+
+        return nodes, edges
+
+    def snapshot(self, graph_name: str = "strange_loop") -> GraphSnapshot:
+        """The whole graph as a GraphSnapshot (for InMemoryGraphTools)."""
+        nodes, edges = self.persons(), []
+        for i in range(self.config.citizens):
+            citizen_nodes, citizen_edges = self.citizen(i)
+            nodes.extend(citizen_nodes)
+            edges.extend(citizen_edges)
+        return GraphSnapshot.from_records(nodes, edges, graph_name)
+
+
+# ============================================================================
+# FALKORDB WRITES
+# ============================================================================
+
+def generate(
+    config: SyntheticConfig,
+    host: str = "localhost",
+    port: int = 6379,
+    graph_name: str = "strange_loop_synthetic",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    clear: bool = True
+) -> Dict[str, int]:
+    """
+    Write a synthetic graph to FalkorDB (bulk, via GraphIngestor).
+
+    Args:
+        config: Graph shape
+        host: FalkorDB host
+        port: FalkorDB port
+        graph_name: Graph to write (cleared first unless clear=False)
+        batch_size: Rows per UNWIND statement
+        clear: Delete existing nodes first
+
+    Returns:
+        {"nodes": n, "relationships": r}
+    """
+    if FalkorDB is None:
+        raise ImportError("FalkorDB not installed. Run: pip install FalkorDB")
+
+    from graph.migrations import migrate
+
+    db = FalkorDB(host=host, port=port)
+    graph = db.select_graph(graph_name)
+    if clear:
+        graph.query("MATCH (n) DETACH DELETE n")
+
+    generator = SyntheticGraph(config)
+    ingestor = GraphIngestor(graph, db.connection, graph_name, batch_size)
+    result = ingestor.ingest(generator.persons(), bump_version=False)
+
+    # One citizen at a time; the version is bumped once at the end
+    for i in range(config.citizens):
+        nodes, edges = generator.citizen(i)
+        ingestor.write_nodes(nodes, result)
+        ingestor.write_relationships(edges, result)
+        print(f"  citizen {i + 1}/{config.citizens}: {result.nodes} nodes, "
+              f"{result.relationships} relationships")
+
+    # Query indices (_lc shadows, severity_rank, full-text)
+    migrate(host, port, graph_name)
+    create_fulltext_indices(graph)
+    bump_graph_version(db.connection, graph_name)
+
+    return {"nodes": result.nodes, "relationships": result.relationships}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Strange Loop graph")
+    parser.add_argument("--host", default="localhost", help="FalkorDB host")
+    parser.add_argument("--port", type=int, default=6379, help="FalkorDB port")
+    parser.add_argument("--graph", default="strange_loop_synthetic", help="Graph name")
+    parser.add_argument("--citizens", type=int, default=1, help="Citizens (N)")
+    parser.add_argument("--partners", type=int, default=5, help="Partners per citizen (M)")
+    parser.add_argument("--memories", type=int, default=10, help="Nodes per memory type per citizen (K)")
+    parser.add_argument("--nodes", type=int, help="Target total nodes (derives --memories)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent (0 = uniform)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per UNWIND write")
+    parser.add_argument("--snapshot", help="Write a GraphSnapshot JSON file instead of FalkorDB")
+    parser.add_argument("--keep", action="store_true", help="Don't clear the graph first")
+    args = parser.parse_args()
+
+    if args.nodes:
+        config = SyntheticConfig.for_nodes(args.nodes, args.citizens, args.partners,
+                                           seed=args.seed, skew=args.skew)
+    else:
+        config = SyntheticConfig(args.citizens, args.partners, args.memories, args.seed, args.skew)
+
+    print(f"Generating {config.citizens} citizens x {config.partners} partners x "
+          f"{config.memories} memories/type = {config.node_count} nodes (seed {config.seed})")
+    start_time = time.time()
+
+    try:
+        if args.snapshot:
+            snapshot = SyntheticGraph(config).snapshot(args.graph)
+            snapshot.save(args.snapshot)
+            counts = {"nodes": len(snapshot.nodes), "relationships": len(snapshot.edges)}
+        else:
+            counts = generate(config, args.host, args.port, args.graph, args.batch_size, not args.keep)
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        print("\nMake sure FalkorDB is running:")
+        print("  docker run -p 6379:6379 falkordb/falkordb")
+        sys.exit(1)
+
+    target = args.snapshot or f"graph '{args.graph}'"
+    print(f"\n✓ {counts['nodes']} nodes, {counts['relationships']} relationships "
+          f"written to {target} in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
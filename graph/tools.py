@@ -9,38 +9,1144 @@ Date: 2024-11-20
 These 8 functions are the ONLY way the Dreamer accesses memory.
 No free generation allowed - only verified data from FalkorDB.
 
+execute_batch() runs several of them in one pipelined round trip.
+
 See: docs/mechanisms/M01_graph_tools.md for specification
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
+import re
 import time
 
 # FalkorDB client (pip install FalkorDB)
 try:
     from falkordb import FalkorDB
+    from falkordb.query_result import QueryResult as FalkorQueryResult
 except ImportError:
     print("WARNING: FalkorDB not installed. Run: pip install FalkorDB")
     FalkorDB = None
+    FalkorQueryResult = None
+
+from graph.pool import FalkorDBPool, get_pool
+from graph.version import GraphVersion
+
+if TYPE_CHECKING:
+    from graph.cache import QueryCache
+    from graph.metrics import QueryMetrics
+    from graph.summary import ExistenceSummary
+
+
+# Search modes for the free-text filters (topic, component, context, ...)
+SEARCH_CONTAINS = "contains"   # toLower(prop) CONTAINS toLower($x): substring, label scan
+SEARCH_FULLTEXT = "fulltext"   # db.idx.fulltext.queryNodes: token match, index lookup
+SEARCH_MODES = (SEARCH_CONTAINS, SEARCH_FULLTEXT)
+
+# Full-text indices used by SEARCH_FULLTEXT: label -> indexed properties
+FULLTEXT_INDICES = {
+    "Conversation_Memory": ("topic",),
+    "Technical_Context": ("component", "description"),
+    "Emotional_State": ("context",),
+    "Strategy_Pattern": ("applicability",),
+    "Failed_Attempt": ("context", "approach"),
+}
+
+# Constraint severity ranking
+SEVERITY_RANK = {
+    "low": 0,
+    "medium": 1,
+    "high": 2,
+    "critical": 3
+}
+
+# Exact-match properties with a write-time lowercased shadow (<prop>_lc).
+# Equality filters hit the shadow's index instead of toLower(prop) scans.
+NORMALIZED_PROPERTIES = {
+    "Partnership": ("partner_name",),
+    "Technical_Context": ("issue_type",),
+    "Emotional_State": ("emotion",),
+    "Constraint": ("constraint_type",),
+}
+
+
+def normalize_value(value: Any) -> Any:
+    """Normalized form stored in <prop>_lc (lowercase; non-strings unchanged)."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def unique_terms(terms: Optional[List[str]]) -> List[str]:
+    """
+    Non-empty terms, each once ignoring case (first spelling kept).
+
+    Multi-term lookups rank nodes by how many terms they matched, so a
+    repeated term must not count twice.
+    """
+    unique, seen = [], set()
+    for term in terms or []:
+        if term and normalize_value(term) not in seen:
+            seen.add(normalize_value(term))
+            unique.append(term)
+    return unique
+
+
+def shadow_property(prop: str) -> str:
+    """Name of the normalized shadow of prop."""
+    return f"{prop}_lc"
+
+
+def severity_rank(severity: Optional[str]) -> int:
+    """Numeric rank stored in Constraint.severity_rank (unknown -> 0, like "low")."""
+    return SEVERITY_RANK.get((severity or "low").lower(), 0)
+
+
+def with_derived_properties(label: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Node properties plus the derived ones queries filter on, for write paths.
+
+    Adds normalized shadows (<prop>_lc) and, for Constraints, severity_rank.
+
+    Example:
+        with_derived_properties("Partnership", {"partner_name": "Nicolas"})
+        -> {"partner_name": "Nicolas", "partner_name_lc": "nicolas"}
+    """
+    result = dict(properties)
+    for prop in NORMALIZED_PROPERTIES.get(label, ()):
+        if prop in properties:
+            result[shadow_property(prop)] = normalize_value(properties[prop])
+    if label == "Constraint" and "severity" in properties:
+        result["severity_rank"] = severity_rank(properties["severity"])
+    return result
+
+
+# Column carrying the full-text relevance score (moved into QueryResult.scores)
+SCORE_COLUMN = "_relevance"
+
+# Column carrying the search terms each row matched (moved into QueryResult.matched_terms)
+MATCHED_TERMS_COLUMN = "_matched_terms"
+
+
+# The 8 query functions, in lens order, plus the multi-term technical lookup.
+# Batch requests name one of these.
+QUERY_FUNCTIONS = (
+    "query_partnerships",
+    "query_conversations",
+    "query_technical_context",
+    "query_technical_context_many",
+    "query_emotional_state",
+    "query_strategy_patterns",
+    "query_related_code",
+    "query_failed_attempts",
+    "query_active_constraints",
+)
+
+# A batch request: (query function name, keyword arguments)
+ToolRequest = Tuple[str, Dict[str, Any]]
+
+# Relationship types query_neighborhood walks. The Citizen hub edges
+# (HAS_*, KNOWS_STRATEGY, ...) are excluded: through the hub every memory of
+# the citizen is one hop away, which is exactly the scan to avoid.
+NEIGHBORHOOD_RELATIONSHIPS = (
+    "WITH_PERSON",      # Conversation_Memory -> Person
+    "ABOUT_TOPIC",      # Conversation_Memory -> Technical_Context
+    "DEPENDS_ON",       # Code_Reference -> Code_Reference
+)
+
+# Lenses answered by query_context_bundle, in lens order
+BUNDLE_LENSES = (
+    "relational",
+    "historical",
+    "technical",
+    "emotional",
+    "strategic",
+    "experiential",
+    "constraint",
+    "connective",
+)
+
+# Per-lens query parameters the bundle uses. Mirrors the requests made by
+# dreamer/lenses.py; a lens whose request differs is not answered by the bundle.
+BUNDLE_DEFAULTS = {
+    "conversation_limit": 5,
+    "technical_limit": 5,
+    "emotional_limit": 3,
+    "strategy_limit": 3,
+    "min_success_rate": 0.7,
+    "failure_limit": 5,
+    "min_severity": "medium",
+    "constraint_limit": 10,
+    "code_limit": 5,
+}
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Tuple:
+    """Hashable, order-independent form of query parameters."""
+    def freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(v) for v in value)
+        return value
+
+    return freeze(params or {})
+
+
+def _stringify_param(value: Any) -> str:
+    """Render a query parameter as a Cypher literal for the CYPHER params header."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_stringify_param(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k}:{_stringify_param(v)}" for k, v in value.items()) + "}"
+    return str(value)
+
+
+def build_params_header(params: Dict[str, Any]) -> str:
+    """Build the 'CYPHER k=v ...' prefix FalkorDB uses for parameterized queries."""
+    if not params:
+        return ""
+    return "CYPHER " + " ".join(f"{k}={_stringify_param(v)}" for k, v in params.items()) + " "
+
+
+def fulltext_query(*texts: str) -> str:
+    """
+    Full-text query matching any of the given texts.
+
+    Each text becomes a phrase of its word tokens ("race condition" ->
+    "\"race condition\""), so punctuation can't be read as query syntax.
+    Returns "" if no text has a word token.
+    """
+    phrases = []
+    for text in texts:
+        tokens = re.findall(r"\w+", (text or "").lower())
+        if len(tokens) == 1:
+            phrases.append(tokens[0])
+        elif tokens:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " | ".join(phrases)
+
+
+def create_fulltext_indices(graph) -> List[str]:
+    """
+    Create the FULLTEXT_INDICES on a FalkorDB graph (idempotent).
+
+    Args:
+        graph: FalkorDB graph handle (db.select_graph(name))
+
+    Returns:
+        Labels whose index was created (already indexed labels are skipped)
+    """
+    created = []
+    for label, properties in FULLTEXT_INDICES.items():
+        quoted = ", ".join(f"'{prop}'" for prop in properties)
+        try:
+            graph.query(f"CALL db.idx.fulltext.createNodeIndex('{label}', {quoted})")
+            created.append(label)
+        except Exception as e:
+            if "already indexed" not in str(e).lower():
+                raise
+    return created
+
+
+@dataclass
+class QueryResult:
+    """
+    Structured result from graph query.
+
+    Anti-hallucination guarantee: If found=False, data=None.
+    LLM cannot invent what doesn't exist.
+    """
+    found: bool
+    data: Optional[Any]  # Dict for single result, List[Dict] for multiple
+    confidence: float  # 0.0-1.0 (1.0 for exact match, <1.0 for partial)
+    query_time_ms: float
+    error: Optional[str] = None
+    cached: bool = False  # Served from QueryCache (query_time_ms is then 0.0)
+    scores: Optional[List[float]] = None  # Full-text relevance per row (fulltext mode only)
+    matched_terms: Optional[List[List[str]]] = None  # Search terms each row matched (multi-term lookups)
+
+
+def node_properties(value: Any) -> Any:
+    """
+    A returned value with every node as its property dict.
+
+    Nodes nested in lists (collect(dep) AS dependencies) are converted too,
+    so rows look the same on every backend (see InMemoryGraphTools).
+    """
+    if hasattr(value, 'properties'):
+        return value.properties
+    if isinstance(value, list):
+        return [node_properties(item) for item in value]
+    return value
+
+
+def rows_to_query_result(data: List[Any], query_time_ms: float,
+                         scores: Optional[List[float]] = None,
+                         matched_terms: Optional[List[List[str]]] = None) -> QueryResult:
+    """QueryResult for already-converted rows (dicts/values)."""
+    if not data:
+        return QueryResult(
+            found=False,
+            data=None,
+            confidence=0.0,
+            query_time_ms=query_time_ms
+        )
+
+    # Return single dict if only one result, else list
+    if len(data) == 1:
+        return QueryResult(
+            found=True,
+            data=data[0],
+            confidence=1.0,  # Exact match
+            query_time_ms=query_time_ms,
+            scores=scores,
+            matched_terms=matched_terms
+        )
+    else:
+        return QueryResult(
+            found=True,
+            data=data,
+            confidence=0.95,  # Multiple matches (slightly lower confidence)
+            query_time_ms=query_time_ms,
+            scores=scores,
+            matched_terms=matched_terms
+        )
+
+
+@dataclass
+class LensPayload:
+    """
+    One lens's share of a context bundle (see query_context_bundle).
+
+    requests[i] is the query function call whose answer is results[i], so
+    callers can check the bundle answered the request they would have made.
+    """
+    requests: List[ToolRequest] = field(default_factory=list)
+    results: List[QueryResult] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class BaseGraphTools:
+    """
+    Query building and result parsing shared by GraphTools and AsyncGraphTools.
+
+    Subclasses provide the transport: how a (cypher, params) pair or a batch
+    of them reaches FalkorDB.
+    """
+
+    # How free-text filters are matched (SEARCH_CONTAINS or SEARCH_FULLTEXT)
+    search_mode: str = SEARCH_CONTAINS
+
+    def _set_search_mode(self, search_mode: str):
+        """Validate and set the search mode."""
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search_mode} (expected one of {SEARCH_MODES})")
+        self.search_mode = search_mode
+
+    def _fulltext(self, *texts: str) -> str:
+        """Full-text query for texts, or "" when the CONTAINS form should be used."""
+        if self.search_mode != SEARCH_FULLTEXT:
+            return ""
+        return fulltext_query(*texts)
+
+    def build_query(self, tool: str, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the Cypher and parameters a query function would run.
+
+        Args:
+            tool: One of QUERY_FUNCTIONS (e.g. "query_partnerships")
+            params: Keyword arguments for that function
+
+        Returns:
+            (cypher, query_params) tuple
+        """
+        if tool not in QUERY_FUNCTIONS:
+            raise ValueError(f"Unknown query function: {tool}")
+        return getattr(self, f"_build_{tool}")(**params)
+
+    def _to_query_result(self, result, query_time_ms: float) -> QueryResult:
+        """Convert a FalkorDB result set into a QueryResult."""
+        if not result.result_set:
+            # No results found
+            return QueryResult(
+                found=False,
+                data=None,
+                confidence=0.0,
+                query_time_ms=query_time_ms
+            )
+
+        # Full-text queries return a relevance column, multi-term lookups a
+        # matched terms column; move them into scores / matched_terms
+        columns = [h[1] for h in result.header] if result.header else []
+        extra = {name: [] for name in (SCORE_COLUMN, MATCHED_TERMS_COLUMN) if name in columns}
+        extra_index = {name: columns.index(name) for name in extra}
+        columns = [name for name in columns if name not in extra]
+
+        # Parse results
+        data = []
+        for record in result.result_set:
+            if extra:
+                for name, index in extra_index.items():
+                    extra[name].append(record[index])
+                record = [value for i, value in enumerate(record) if i not in extra_index.values()]
+
+            # Convert record to dict
+            if len(record) == 1:
+                # Single node/value
+                data.append(node_properties(record[0]))
+            else:
+                # Multiple values - create dict from column names
+                row_dict = {}
+                for i, value in enumerate(record):
+                    col_name = columns[i] if columns else f"col_{i}"
+                    row_dict[col_name] = node_properties(value)
+                data.append(row_dict)
+
+        return rows_to_query_result(data, query_time_ms, extra.get(SCORE_COLUMN), extra.get(MATCHED_TERMS_COLUMN))
+
+    def request_key(self, tool: str, params: Dict[str, Any]) -> Tuple:
+        """
+        Identity of a request: the Cypher and normalized parameters it runs.
+
+        Requests that differ only in spelled-out defaults get the same key.
+        """
+        cypher, query_params = self.build_query(tool, params)
+        return (cypher, normalize_params(query_params))
+
+    # ========================================================================
+    # BATCH EXECUTION (one round trip for many queries)
+    # ========================================================================
+
+    def _graph_query_commands(self, built: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple]:
+        """GRAPH.QUERY commands for a batch of (cypher, params) pairs."""
+        return [
+            ("GRAPH.QUERY", self.graph_name, build_params_header(query_params) + cypher, "--compact")
+            for cypher, query_params in built
+        ]
+
+    def _batch_failure(self, batch: List[Any], error: Exception, elapsed_ms: float) -> List[QueryResult]:
+        """One error QueryResult per batch item when the whole batch failed."""
+        share_ms = elapsed_ms / len(batch)
+        return [
+            QueryResult(found=False, data=None, confidence=0.0,
+                        query_time_ms=share_ms, error=str(error))
+            for _ in batch
+        ]
+
+    def _batch_results(self, batch: List[Any], parsed: List[Any], total_ms: float) -> List[QueryResult]:
+        """
+        Turn parsed pipeline responses into QueryResults with attributed timing.
+
+        Each result gets its server execution time plus an equal share of the
+        remaining round-trip time. Exceptions become error results.
+        """
+        server_ms = [
+            0.0 if isinstance(result, Exception)
+            else float(getattr(result, "run_time_ms", 0.0) or 0.0)
+            for result in parsed
+        ]
+        overhead_ms = max(total_ms - sum(server_ms), 0.0) / len(batch)
+
+        results = []
+        for result, run_ms in zip(parsed, server_ms):
+            query_time_ms = run_ms + overhead_ms
+            if isinstance(result, Exception):
+                results.append(QueryResult(
+                    found=False,
+                    data=None,
+                    confidence=0.0,
+                    query_time_ms=query_time_ms,
+                    error=str(result)
+                ))
+            else:
+                results.append(self._to_query_result(result, query_time_ms))
+
+        return results
+
+    # ========================================================================
+    # QUERY BUILDERS (Cypher + parameters for each of the 8 functions)
+    # ========================================================================
+
+    def _build_query_partnerships(self, partner_id: str, citizen: str = "felix") -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_partnerships()."""
+        cypher = """
+        MATCH (p:Partnership {citizen: $citizen, partner_name_lc: $partner_lc})
+        RETURN p
+        """
+
+        return cypher, {
+            "citizen": citizen,
+            "partner_id": partner_id,
+            "partner_lc": normalize_value(partner_id)
+        }
+
+    def _build_query_conversations(
+        self,
+        partner_id: str,
+        keywords: Optional[List[str]] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_conversations()."""
+        query = self._fulltext(*keywords) if keywords else ""
+        if query:
+            # Filter by keywords via the topic full-text index
+            cypher = f"""
+            CALL db.idx.fulltext.queryNodes('Conversation_Memory', $query) YIELD node AS conv, score
+            WHERE conv.citizen = $citizen AND conv.partner = $partner_id
+            RETURN conv, score AS {SCORE_COLUMN}
+            ORDER BY conv.timestamp DESC
+            LIMIT $limit
+            """
+        elif keywords:
+            # Filter by keywords
+            cypher = """
+            MATCH (conv:Conversation_Memory {citizen: $citizen, partner: $partner_id})
+            WHERE ANY(kw IN $keywords WHERE toLower(conv.topic) CONTAINS toLower(kw))
+            RETURN conv
+            ORDER BY conv.timestamp DESC
+            LIMIT $limit
+            """
+        else:
+            # No keywords - return all conversations with partner
+            cypher = """
+            MATCH (conv:Conversation_Memory {citizen: $citizen, partner: $partner_id})
+            RETURN conv
+            ORDER BY conv.timestamp DESC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "partner_id": partner_id,
+            "keywords": keywords or [],
+            "limit": limit,
+            "query": query
+        }
+
+    def _build_query_technical_context(
+        self,
+        term: str,
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_technical_context()."""
+        query = self._fulltext(term)
+        if query:
+            # component/description full-text index, optional issue type filter
+            cypher = f"""
+            CALL db.idx.fulltext.queryNodes('Technical_Context', $query) YIELD node AS t, score
+            WHERE t.citizen = $citizen
+              AND ($issue_type_lc = "" OR t.issue_type_lc = $issue_type_lc)
+            RETURN t, score AS {SCORE_COLUMN}
+            ORDER BY t.updated_at DESC
+            LIMIT $limit
+            """
+        elif issue_type:
+            # Filter by issue type
+            cypher = """
+            MATCH (t:Technical_Context {citizen: $citizen, issue_type_lc: $issue_type_lc})
+            WHERE toLower(t.component) CONTAINS toLower($term)
+               OR toLower(t.description) CONTAINS toLower($term)
+            RETURN t
+            ORDER BY t.updated_at DESC
+            LIMIT $limit
+            """
+        else:
+            # No issue type filter
+            cypher = """
+            MATCH (t:Technical_Context {citizen: $citizen})
+            WHERE toLower(t.component) CONTAINS toLower($term)
+               OR toLower(t.description) CONTAINS toLower($term)
+            RETURN t
+            ORDER BY t.updated_at DESC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "term": term,
+            "issue_type": issue_type or "",
+            "issue_type_lc": normalize_value(issue_type or ""),
+            "limit": limit,
+            "query": query
+        }
+
+    def _build_query_technical_context_many(
+        self,
+        terms: List[str],
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_technical_context_many()."""
+        unique = unique_terms(terms)
+        queries = [self._fulltext(term) for term in unique]
+        if any(queries):
+            # One full-text lookup per term, merged per node
+            unique = [term for term, query in zip(unique, queries) if query]
+            cypher = f"""
+            UNWIND range(0, size($terms) - 1) AS i
+            CALL db.idx.fulltext.queryNodes('Technical_Context', $queries[i]) YIELD node AS t, score
+            WHERE t.citizen = $citizen
+              AND ($issue_type_lc = "" OR t.issue_type_lc = $issue_type_lc)
+            WITH t, collect($terms[i]) AS matched, max(score) AS relevance
+            RETURN t, matched AS {MATCHED_TERMS_COLUMN}, relevance AS {SCORE_COLUMN}
+            ORDER BY size({MATCHED_TERMS_COLUMN}) DESC, t.updated_at DESC
+            LIMIT $limit
+            """
+        else:
+            # Filter by issue type when given; one row per node, with every term it matched
+            pattern = "{citizen: $citizen, issue_type_lc: $issue_type_lc}" if issue_type else "{citizen: $citizen}"
+            cypher = f"""
+            UNWIND $terms AS term
+            MATCH (t:Technical_Context {pattern})
+            WHERE toLower(t.component) CONTAINS toLower(term)
+               OR toLower(t.description) CONTAINS toLower(term)
+            WITH t, collect(term) AS matched
+            RETURN t, matched AS {MATCHED_TERMS_COLUMN}
+            ORDER BY size({MATCHED_TERMS_COLUMN}) DESC, t.updated_at DESC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "terms": unique,
+            "queries": [query for query in queries if query],
+            "issue_type": issue_type or "",
+            "issue_type_lc": normalize_value(issue_type or ""),
+            "limit": limit
+        }
+
+    def _build_query_emotional_state(
+        self,
+        context_similar_to: str,
+        emotion: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 3
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_emotional_state()."""
+        query = self._fulltext(context_similar_to)
+        if query:
+            # context full-text index, optional emotion filter
+            cypher = f"""
+            CALL db.idx.fulltext.queryNodes('Emotional_State', $query) YIELD node AS e, score
+            WHERE e.citizen = $citizen
+              AND ($emotion_lc = "" OR e.emotion_lc = $emotion_lc)
+            RETURN e, score AS {SCORE_COLUMN}
+            ORDER BY e.intensity DESC
+            LIMIT $limit
+            """
+        elif emotion:
+            # Filter by specific emotion
+            cypher = """
+            MATCH (e:Emotional_State {citizen: $citizen, emotion_lc: $emotion_lc})
+            WHERE toLower(e.context) CONTAINS toLower($context_similar_to)
+            RETURN e
+            ORDER BY e.intensity DESC
+            LIMIT $limit
+            """
+        else:
+            # No emotion filter
+            cypher = """
+            MATCH (e:Emotional_State {citizen: $citizen})
+            WHERE toLower(e.context) CONTAINS toLower($context_similar_to)
+            RETURN e
+            ORDER BY e.intensity DESC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "context_similar_to": context_similar_to,
+            "emotion": emotion or "",
+            "emotion_lc": normalize_value(emotion or ""),
+            "limit": limit,
+            "query": query
+        }
+
+    def _build_query_strategy_patterns(
+        self,
+        situation_type: str,
+        min_success_rate: float = 0.5,
+        citizen: str = "felix",
+        limit: int = 3
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_strategy_patterns()."""
+        query = self._fulltext(situation_type)
+        if query:
+            # applicability full-text index
+            cypher = f"""
+            CALL db.idx.fulltext.queryNodes('Strategy_Pattern', $query) YIELD node AS s, score
+            WHERE s.citizen = $citizen AND s.success_rate >= $min_success_rate
+            RETURN s, score AS {SCORE_COLUMN}
+            ORDER BY s.success_rate DESC
+            LIMIT $limit
+            """
+        else:
+            cypher = """
+            MATCH (s:Strategy_Pattern {citizen: $citizen})
+            WHERE toLower(s.applicability) CONTAINS toLower($situation_type)
+              AND s.success_rate >= $min_success_rate
+            RETURN s
+            ORDER BY s.success_rate DESC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "situation_type": situation_type,
+            "min_success_rate": min_success_rate,
+            "limit": limit,
+            "query": query
+        }
+
+    def _build_query_related_code(
+        self,
+        filename: str,
+        citizen: str = "felix",
+        include_dependencies: bool = True,
+        limit: int = 5
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_related_code()."""
+        if include_dependencies:
+            # Return file + dependencies
+            cypher = """
+            MATCH (cr:Code_Reference {citizen: $citizen})
+            WHERE toLower(cr.file_path) CONTAINS toLower($filename)
+            OPTIONAL MATCH (cr)-[:DEPENDS_ON]->(dep:Code_Reference)
+            RETURN cr, collect(dep) AS dependencies
+            LIMIT $limit
+            """
+        else:
+            # Just the file
+            cypher = """
+            MATCH (cr:Code_Reference {citizen: $citizen})
+            WHERE toLower(cr.file_path) CONTAINS toLower($filename)
+            RETURN cr
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "filename": filename,
+            "limit": limit
+        }
+
+    def _build_query_failed_attempts(
+        self,
+        context: str,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_failed_attempts()."""
+        query = self._fulltext(context)
+        if query:
+            # context/approach full-text index
+            cypher = f"""
+            CALL db.idx.fulltext.queryNodes('Failed_Attempt', $query) YIELD node AS f, score
+            WHERE f.citizen = $citizen
+            RETURN f, score AS {SCORE_COLUMN}
+            ORDER BY f.timestamp DESC
+            LIMIT $limit
+            """
+        else:
+            cypher = """
+            MATCH (f:Failed_Attempt {citizen: $citizen})
+            WHERE toLower(f.context) CONTAINS toLower($context)
+               OR toLower(f.approach) CONTAINS toLower($context)
+            RETURN f
+            ORDER BY f.timestamp DESC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "context": context,
+            "limit": limit,
+            "query": query
+        }
+
+    def _build_query_active_constraints(
+        self,
+        constraint_type: Optional[str] = None,
+        min_severity: str = "medium",
+        citizen: str = "felix",
+        limit: int = 10,
+        component: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build Cypher and parameters for query_active_constraints().
+
+        Severity is filtered server-side on the indexed severity_rank, so
+        LIMIT applies to qualifying constraints only.
+        """
+        type_filter = "AND c.constraint_type_lc = $constraint_type_lc" if constraint_type else ""
+
+        if component:
+            # Constraints mentioning the component; all qualifying ones if none do
+            cypher = f"""
+            MATCH (c:Constraint {{citizen: $citizen, status: "active"}})
+            WHERE c.severity_rank >= $min_rank {type_filter}
+            WITH c
+            ORDER BY c.severity_rank DESC, c.deadline ASC
+            WITH collect(c) AS qualifying
+            WITH qualifying, [c IN qualifying WHERE toLower(c.description) CONTAINS $component_lc] AS relevant
+            UNWIND CASE WHEN size(relevant) > 0 THEN relevant ELSE qualifying END AS c
+            RETURN c
+            LIMIT $limit
+            """
+        else:
+            cypher = f"""
+            MATCH (c:Constraint {{citizen: $citizen, status: "active"}})
+            WHERE c.severity_rank >= $min_rank {type_filter}
+            RETURN c
+            ORDER BY c.severity_rank DESC, c.deadline ASC
+            LIMIT $limit
+            """
+
+        return cypher, {
+            "citizen": citizen,
+            "constraint_type": constraint_type or "",
+            "constraint_type_lc": normalize_value(constraint_type or ""),
+            "min_rank": SEVERITY_RANK.get(min_severity.lower(), 1),
+            "component_lc": normalize_value(component or ""),
+            "limit": limit
+        }
+
+    # ========================================================================
+    # NEIGHBORHOOD (relationship-anchored traversal)
+    # ========================================================================
+
+    def _build_query_neighborhood(
+        self,
+        sender: str,
+        citizen: str = "felix",
+        max_depth: int = 2,
+        limit: int = 200,
+        relationships: Optional[List[str]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_neighborhood()."""
+        max_depth = int(max_depth)
+        if max_depth < 1:
+            raise ValueError(f"max_depth must be >= 1, got {max_depth}")
+
+        types = relationships or NEIGHBORHOOD_RELATIONSHIPS
+        if not all(re.fullmatch(r"[A-Z_]+", t) for t in types):
+            raise ValueError(f"Invalid relationship types: {types}")
+
+        # Variable-length bounds and types can't be parameters
+        cypher = f"""
+        OPTIONAL MATCH (p:Partnership {{citizen: $citizen, partner_name_lc: $partner_lc}})
+        OPTIONAL MATCH (person:Person {{id: $partner_lc}})
+        WITH [a IN [p, person] WHERE a IS NOT NULL] AS anchors
+        UNWIND anchors AS anchor
+        OPTIONAL MATCH path = (anchor)-[:{'|'.join(types)}*1..{max_depth}]-(n)
+        WHERE n.citizen IS NULL OR n.citizen = $citizen
+        WITH anchors, n, min(length(path)) AS depth
+        WITH anchors, collect(CASE WHEN n IS NULL THEN NULL ELSE {{node: n, depth: depth}} END) AS reached
+        UNWIND [a IN anchors | {{node: a, depth: 0}}] + reached AS hit
+        WITH hit.node AS node, min(hit.depth) AS depth
+        RETURN labels(node)[0] AS label, node, depth
+        ORDER BY depth
+        LIMIT $limit
+        """
+
+        return cypher, {
+            "citizen": citizen,
+            "partner_lc": normalize_value(sender),
+            "limit": limit
+        }
+
+    # ========================================================================
+    # TERM VOCABULARY (technical term extraction, see dreamer/terms.py)
+    # ========================================================================
+
+    def _build_query_term_vocabulary(self, citizen: str = "felix") -> Tuple[str, Dict[str, Any]]:
+        """Build Cypher and parameters for query_term_vocabulary()."""
+        # One row even for an empty graph: aggregation without grouping keys
+        cypher = """
+        MATCH (t:Technical_Context {citizen: $citizen})
+        WITH collect(DISTINCT t.component) AS components
+        OPTIONAL MATCH (cr:Code_Reference {citizen: $citizen})
+        RETURN components, collect(DISTINCT cr.file_path) AS file_paths
+        """
+
+        return cypher, {"citizen": citizen}
+
+    # ========================================================================
+    # CONTEXT BUNDLE (all 8 lenses in one statement)
+    # ========================================================================
+
+    def _build_context_bundle(
+        self,
+        sender: str,
+        keywords: Optional[List[str]] = None,
+        terms: Optional[List[str]] = None,
+        citizen: str = "felix",
+        content: str = ""
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the Cypher and parameters for query_context_bundle().
+
+        Lenses that read other lenses' findings get their parameters derived
+        server-side from the primary technical context (t0) and the most recent
+        conversation (h0), exactly as dreamer/lenses.py derives them.
+        """
+        if self.search_mode != SEARCH_CONTAINS:
+            raise ValueError("query_context_bundle only supports search_mode='contains'")
+
+        cypher = """
+        OPTIONAL MATCH (p:Partnership {citizen: $citizen, partner_name_lc: $partner_lc})
+        WITH collect(p) AS partnerships
+
+        CALL {
+            MATCH (conv:Conversation_Memory {citizen: $citizen, partner: $partner_id})
+            WHERE size($keywords) = 0
+               OR ANY(kw IN $keywords WHERE toLower(conv.topic) CONTAINS toLower(kw))
+            WITH conv ORDER BY conv.timestamp DESC LIMIT $conversation_limit
+            RETURN collect(conv) AS conversations
+        }
+
+        CALL {
+            UNWIND $terms AS term
+            MATCH (t:Technical_Context {citizen: $citizen})
+            WHERE toLower(t.component) CONTAINS toLower(term)
+               OR toLower(t.description) CONTAINS toLower(term)
+            WITH t, collect(term) AS matched
+            ORDER BY size(matched) DESC, t.updated_at DESC
+            LIMIT $technical_limit
+            RETURN collect(t) AS technical, collect(matched) AS technical_terms
+        }
+
+        WITH partnerships, conversations, technical, technical_terms,
+             head(technical) AS t0,
+             head(conversations) AS h0
+        WITH partnerships, conversations, technical, technical_terms,
+             CASE
+                 WHEN t0 IS NOT NULL THEN
+                     CASE WHEN coalesce(t0.issue_type, '') <> '' THEN t0.issue_type
+                          ELSE coalesce(t0.description, '') END
+                 WHEN h0 IS NOT NULL THEN coalesce(h0.topic, '')
+                 ELSE $content
+             END AS situation,
+             CASE WHEN coalesce(t0.issue_type, '') <> '' THEN t0.issue_type END AS situation_type,
+             CASE
+                 WHEN t0 IS NOT NULL THEN
+                     CASE WHEN coalesce(t0.description, '') <> '' THEN t0.description
+                          ELSE coalesce(t0.component, '') END
+                 ELSE $content
+             END AS failure_context,
+             coalesce(t0.component, '') AS component
+
+        CALL {
+            WITH situation
+            MATCH (e:Emotional_State {citizen: $citizen})
+            WHERE toLower(e.context) CONTAINS toLower(situation)
+            WITH e ORDER BY e.intensity DESC LIMIT $emotional_limit
+            RETURN collect(e) AS emotions
+        }
+
+        CALL {
+            WITH situation_type
+            MATCH (s:Strategy_Pattern {citizen: $citizen})
+            WHERE situation_type IS NOT NULL
+              AND toLower(s.applicability) CONTAINS toLower(situation_type)
+              AND s.success_rate >= $min_success_rate
+            WITH s ORDER BY s.success_rate DESC LIMIT $strategy_limit
+            RETURN collect(s) AS strategies
+        }
+
+        CALL {
+            WITH failure_context
+            MATCH (f:Failed_Attempt {citizen: $citizen})
+            WHERE failure_context <> ''
+              AND (toLower(f.context) CONTAINS toLower(failure_context)
+                   OR toLower(f.approach) CONTAINS toLower(failure_context))
+            WITH f ORDER BY f.timestamp DESC LIMIT $failure_limit
+            RETURN collect(f) AS failures
+        }
+
+        CALL {
+            MATCH (c:Constraint {citizen: $citizen, status: "active"})
+            WHERE c.severity_rank >= $min_rank
+            WITH c ORDER BY c.severity_rank DESC, c.deadline ASC
+            RETURN collect(c) AS qualifying
+        }
+
+        CALL {
+            WITH component
+            MATCH (cr:Code_Reference {citizen: $citizen})
+            WHERE component <> '' AND toLower(cr.file_path) CONTAINS toLower(component)
+            OPTIONAL MATCH (cr)-[:DEPENDS_ON]->(dep:Code_Reference)
+            WITH cr, collect(dep) AS dependencies
+            LIMIT $code_limit
+            RETURN collect({cr: cr, dependencies: dependencies}) AS code
+        }
 
+        WITH partnerships, conversations, technical, technical_terms, emotions, strategies, failures, code,
+             situation, situation_type, failure_context, component, qualifying,
+             [c IN qualifying WHERE component <> ''
+                                AND toLower(c.description) CONTAINS toLower(component)] AS relevant
+        RETURN partnerships, conversations, technical, technical_terms, emotions, strategies, failures,
+               (CASE WHEN size(relevant) > 0 THEN relevant ELSE qualifying END)[0..$constraint_limit] AS constraints,
+               code, situation, situation_type, failure_context, component
+        """
 
-@dataclass
-class QueryResult:
+        params = dict(BUNDLE_DEFAULTS)
+        params.update({
+            "citizen": citizen,
+            "partner_id": sender,
+            "partner_lc": normalize_value(sender),
+            "keywords": keywords or [],
+            "terms": unique_terms(terms),
+            "content": content,
+            "min_rank": SEVERITY_RANK.get(BUNDLE_DEFAULTS["min_severity"], 1),
+        })
+        return cypher, params
+
+    def _node_rows(self, values: List[Any]) -> List[Any]:
+        """Rows as _to_query_result would build them (nodes -> properties)."""
+        rows = []
+        for value in values:
+            if isinstance(value, dict):
+                rows.append({key: node_properties(item) for key, item in value.items()})
+            else:
+                rows.append(node_properties(value))
+        return rows
+
+    def _bundle_row(self, result) -> Dict[str, Any]:
+        """The bundle statement's single row, as column -> value."""
+        columns = [h[1] for h in result.header]
+        return dict(zip(columns, result.result_set[0]))
+
+    def _bundle_payloads(self, row: Dict[str, Any], params: Dict[str, Any],
+                         query_time_ms: float) -> Dict[str, LensPayload]:
+        """Split the bundle's single row (column -> value) into per-lens payloads."""
+        sender = params["partner_id"]
+        citizen = params["citizen"]
+        payloads = {lens: LensPayload() for lens in BUNDLE_LENSES}
+
+        def answer(lens: str, tool: str, tool_params: Dict[str, Any], values: List[Any]):
+            payload = payloads[lens]
+            payload.requests.append((tool, dict(tool_params, citizen=citizen)))
+            payload.results.append(rows_to_query_result(self._node_rows(values), 0.0))
+
+        answer("relational", "query_partnerships", {"partner_id": sender}, row["partnerships"])
+        answer("historical", "query_conversations", {
+            "partner_id": sender,
+            "keywords": params["keywords"] or None,
+            "limit": params["conversation_limit"]
+        }, row["conversations"])
+
+        if params["terms"]:
+            answer("technical", "query_technical_context_many", {
+                "terms": params["terms"],
+                "limit": params["technical_limit"]
+            }, row["technical"])
+            payloads["technical"].results[-1].matched_terms = row["technical_terms"] or None
+
+        answer("emotional", "query_emotional_state", {
+            "context_similar_to": row["situation"],
+            "limit": params["emotional_limit"]
+        }, row["emotions"])
+
+        if row["situation_type"] is not None:
+            answer("strategic", "query_strategy_patterns", {
+                "situation_type": row["situation_type"],
+                "min_success_rate": params["min_success_rate"],
+                "limit": params["strategy_limit"]
+            }, row["strategies"])
+
+        if row["failure_context"]:
+            answer("experiential", "query_failed_attempts", {
+                "context": row["failure_context"],
+                "limit": params["failure_limit"]
+            }, row["failures"])
+
+        constraint_params = {"min_severity": params["min_severity"], "limit": params["constraint_limit"]}
+        if row["component"]:
+            constraint_params["component"] = row["component"]
+        answer("constraint", "query_active_constraints", constraint_params, row["constraints"])
+
+        if row["component"]:
+            answer("connective", "query_related_code", {
+                "filename": row["component"],
+                "include_dependencies": True,
+                "limit": params["code_limit"]
+            }, row["code"])
+
+        # One statement: attribute its time evenly across the answers
+        answered = [r for payload in payloads.values() for r in payload.results]
+        for query_result in answered:
+            query_result.query_time_ms = query_time_ms / len(answered)
+
+        return payloads
+
+    def _bundle_failure(self, error: Exception) -> Dict[str, LensPayload]:
+        """Per-lens payloads carrying the error when the bundle failed."""
+        return {lens: LensPayload(error=str(error)) for lens in BUNDLE_LENSES}
+
+
+# One call per Cypher variant the builders produce (see query_templates())
+TEMPLATE_CALLS: List[ToolRequest] = [
+    ("query_partnerships", {"partner_id": "x"}),
+    ("query_conversations", {"partner_id": "x"}),
+    ("query_conversations", {"partner_id": "x", "keywords": ["x"]}),
+    ("query_technical_context", {"term": "x"}),
+    ("query_technical_context", {"term": "x", "issue_type": "x"}),
+    ("query_technical_context_many", {"terms": ["x"]}),
+    ("query_technical_context_many", {"terms": ["x"], "issue_type": "x"}),
+    ("query_emotional_state", {"context_similar_to": "x"}),
+    ("query_emotional_state", {"context_similar_to": "x", "emotion": "x"}),
+    ("query_strategy_patterns", {"situation_type": "x"}),
+    ("query_related_code", {"filename": "x"}),
+    ("query_related_code", {"filename": "x", "include_dependencies": False}),
+    ("query_failed_attempts", {"context": "x"}),
+    ("query_active_constraints", {}),
+    ("query_active_constraints", {"constraint_type": "x"}),
+    ("query_active_constraints", {"component": "x"}),
+    ("query_active_constraints", {"constraint_type": "x", "component": "x"}),
+    ("query_neighborhood", {"sender": "x"}),
+    ("query_term_vocabulary", {}),
+    ("query_context_bundle", {"sender": "x", "keywords": ["x"], "terms": ["x"]}),
+]
+
+
+def query_templates(search_mode: str = SEARCH_CONTAINS) -> List[Tuple[str, Dict[str, Any], str, Dict[str, Any]]]:
     """
-    Structured result from graph query.
+    Every distinct statement the builders produce in a search mode.
 
-    Anti-hallucination guarantee: If found=False, data=None.
-    LLM cannot invent what doesn't exist.
+    Returns:
+        (tool, kwargs, cypher, params) per variant, in TEMPLATE_CALLS order
+        (variants a mode doesn't support, like the bundle in fulltext mode,
+        are left out)
     """
-    found: bool
-    data: Optional[Any]  # Dict for single result, List[Dict] for multiple
-    confidence: float  # 0.0-1.0 (1.0 for exact match, <1.0 for partial)
-    query_time_ms: float
-    error: Optional[str] = None
+    builder = BaseGraphTools()
+    builder._set_search_mode(search_mode)
+
+    templates, seen = [], set()
+    for tool, kwargs in TEMPLATE_CALLS:
+        build = getattr(builder, f"_build_{tool}", None) or builder._build_context_bundle
+        try:
+            cypher, params = build(**kwargs)
+        except ValueError:
+            continue
+        key = " ".join(cypher.split())
+        if key not in seen:
+            seen.add(key)
+            templates.append((tool, kwargs, cypher, params))
+    return templates
 
 
-class GraphTools:
+class GraphTools(BaseGraphTools):
     """
     8 query functions for Dreamer memory access.
 
@@ -48,89 +1154,160 @@ class GraphTools:
     Never fabricated data. Never hallucinated results.
     """
 
-    def __init__(self, host: str = "localhost", port: int = 6379, graph_name: str = "strange_loop"):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        graph_name: str = "strange_loop",
+        pool: FalkorDBPool = None,
+        cache: "QueryCache" = None,
+        search_mode: str = SEARCH_CONTAINS,
+        metrics: "QueryMetrics" = None,
+        summary: "ExistenceSummary" = None
+    ):
         """
         Initialize FalkorDB connection.
 
+        Connections come from the process-wide pool for host:port (see
+        graph/pool.py), so every GraphTools on the same server shares them.
+
         Args:
             host: FalkorDB host (default: localhost)
             port: FalkorDB port (default: 6379)
             graph_name: Graph database name (default: strange_loop)
+            pool: Pool to borrow from (default: get_pool(host, port))
+            cache: Optional QueryCache for read results (default: no caching)
+            search_mode: SEARCH_CONTAINS or SEARCH_FULLTEXT (needs the
+                FULLTEXT_INDICES, see create_fulltext_indices())
+            metrics: Optional QueryMetrics recording per-function latency,
+                rows, errors and slow queries (default: not recorded)
+            summary: Optional ExistenceSummary telling which queries are
+                guaranteed empty (see known_empty(); default: none)
         """
         if FalkorDB is None:
             raise ImportError("FalkorDB not installed. Run: pip install FalkorDB")
 
-        self.db = FalkorDB(host=host, port=port)
-        self.graph = self.db.select_graph(graph_name)
+        self.pool = pool or get_pool(host, port)
+        self.db = self.pool.db
+        self.graph = self.pool.select_graph(graph_name)
         self.graph_name = graph_name
+        self.cache = cache
+        self.metrics = metrics
+        self.summary = summary
+        self._set_search_mode(search_mode)
+        self.version = GraphVersion(self.db.connection, graph_name)
+
+    # ========================================================================
+    # GRAPH VERSION + CACHE + EXISTENCE SUMMARY
+    # ========================================================================
+
+    def graph_version(self) -> int:
+        """Current graph version (see graph/version.py)."""
+        return self.version.current()
+
+    def bump_graph_version(self) -> int:
+        """Mark the graph as changed. Every write path must call this."""
+        return self.version.bump()
+
+    def ingest(self, nodes: List[Any] = None, relationships: List[Any] = None,
+               batch_size: int = 500) -> Any:
+        """
+        Bulk-write memory records (see graph/ingest.py) and bump the version.
+
+        Args:
+            nodes: NodeRecords (MERGEd on their key)
+            relationships: RelationshipRecords between existing nodes
+            batch_size: Records per UNWIND statement
+
+        Returns:
+            IngestResult
+        """
+        from graph.ingest import GraphIngestor
 
-    def _execute_query(self, cypher: str, params: Dict[str, Any] = None) -> QueryResult:
+        result = GraphIngestor(self.graph, None, self.graph_name, batch_size).ingest(nodes, relationships)
+        if result.nodes or result.relationships:
+            result.version = self.bump_graph_version()
+        return result
+
+    def _cache_get(self, cypher: str, params: Dict[str, Any]) -> Optional[QueryResult]:
+        """Cached result for a query, or None (also None when caching is off)."""
+        if self.cache is None:
+            return None
+        key = self.cache.make_key(self.graph_name, cypher, params)
+        return self.cache.get(key, self.graph_version())
+
+    def _cache_put(self, cypher: str, params: Dict[str, Any], result: QueryResult):
+        """Store a fresh query result if caching is on."""
+        if self.cache is None:
+            return
+        key = self.cache.make_key(self.graph_name, cypher, params)
+        self.cache.put(key, self.graph_version(), result)
+
+    def known_empty(self, tool: str, params: Dict[str, Any]) -> bool:
+        """
+        Whether a query function call is guaranteed to return nothing.
+
+        Answered by the ExistenceSummary (rebuilt in the background when the
+        graph version moves); False when there is none or it isn't built for
+        the current version yet, so callers only skip queries that are
+        provably empty.
+        """
+        if self.summary is None:
+            return False
+        try:
+            self.summary.refresh(self.graph, self.graph_version())
+        except Exception:
+            return False
+        return self.summary.known_empty(tool, params)
+
+    def _record(self, tool: Optional[str], cypher: str, params: Dict[str, Any], result: QueryResult):
+        """Record a query function's result in the QueryMetrics, if enabled."""
+        if self.metrics is not None and tool is not None:
+            self.metrics.record(tool, result, cypher, params, self._profile)
+
+    def _profile(self, cypher: str, params: Dict[str, Any]) -> List[str]:
+        """GRAPH.PROFILE output (one line per operation) of a query (runs it again)."""
+        return self.db.connection.execute_command(
+            "GRAPH.PROFILE", self.graph_name, build_params_header(params) + cypher
+        )
+
+    def _execute_query(self, cypher: str, params: Dict[str, Any] = None, tool: str = None) -> QueryResult:
         """
         Execute Cypher query and return structured result.
 
+        Served from the QueryCache when enabled and fresh.
+
         Args:
             cypher: Cypher query string
             params: Query parameters
+            tool: Query function name the result is recorded under (QueryMetrics)
 
         Returns:
             QueryResult with found/data/confidence/time
         """
-        start_time = time.time()
         params = params or {}
 
+        cached = self._cache_get(cypher, params)
+        if cached is not None:
+            self._record(tool, cypher, params, cached)
+            return cached
+
+        result = self._query_uncached(cypher, params)
+        self._cache_put(cypher, params, result)
+        self._record(tool, cypher, params, result)
+        return result
+
+    def _query_uncached(self, cypher: str, params: Dict[str, Any]) -> QueryResult:
+        """Run one query against FalkorDB."""
+        start_time = time.perf_counter()
+
         try:
             result = self.graph.query(cypher, params)
-            query_time_ms = (time.time() - start_time) * 1000
-
-            if not result.result_set:
-                # No results found
-                return QueryResult(
-                    found=False,
-                    data=None,
-                    confidence=0.0,
-                    query_time_ms=query_time_ms
-                )
-
-            # Parse results
-            data = []
-            for record in result.result_set:
-                # Convert record to dict
-                if len(record) == 1:
-                    # Single node/value
-                    node = record[0]
-                    if hasattr(node, 'properties'):
-                        data.append(node.properties)
-                    else:
-                        data.append(node)
-                else:
-                    # Multiple values - create dict from column names
-                    row_dict = {}
-                    for i, value in enumerate(record):
-                        col_name = result.header[i][1] if result.header else f"col_{i}"
-                        if hasattr(value, 'properties'):
-                            row_dict[col_name] = value.properties
-                        else:
-                            row_dict[col_name] = value
-                    data.append(row_dict)
-
-            # Return single dict if only one result, else list
-            if len(data) == 1:
-                return QueryResult(
-                    found=True,
-                    data=data[0],
-                    confidence=1.0,  # Exact match
-                    query_time_ms=query_time_ms
-                )
-            else:
-                return QueryResult(
-                    found=True,
-                    data=data,
-                    confidence=0.95,  # Multiple matches (slightly lower confidence)
-                    query_time_ms=query_time_ms
-                )
+            query_time_ms = (time.perf_counter() - start_time) * 1000
+            return self._to_query_result(result, query_time_ms)
 
         except Exception as e:
-            query_time_ms = (time.time() - start_time) * 1000
+            query_time_ms = (time.perf_counter() - start_time) * 1000
             return QueryResult(
                 found=False,
                 data=None,
@@ -139,6 +1316,76 @@ class GraphTools:
                 error=str(e)
             )
 
+    def execute_batch(self, requests: List[ToolRequest]) -> List[QueryResult]:
+        """
+        Run several query functions in one network round trip.
+
+        All GRAPH.QUERY commands go out as a single Redis pipeline.
+        Each request's query_time_ms is its server execution time plus an
+        equal share of the round-trip overhead, so the per-query times add
+        up to the wall-clock time of the batch.
+
+        Args:
+            requests: List of (query function name, kwargs) tuples, e.g.
+                [("query_partnerships", {"partner_id": "nicolas"}),
+                 ("query_technical_context", {"term": "race condition"})]
+
+        Returns:
+            One QueryResult per request, in request order
+
+        Example:
+            results = tools.execute_batch([
+                ("query_partnerships", {"partner_id": "nicolas"}),
+                ("query_active_constraints", {}),
+            ])
+        """
+        if not requests:
+            return []
+
+        built = [self.build_query(tool, params) for tool, params in requests]
+
+        # Cache hits never leave the process
+        results = [self._cache_get(cypher, query_params) for cypher, query_params in built]
+        misses = [i for i, result in enumerate(results) if result is None]
+
+        if misses:
+            fresh = self._pipeline([built[i] for i in misses])
+            for i, result in zip(misses, fresh):
+                results[i] = result
+                self._cache_put(*built[i], result)
+
+        for (tool, _), (cypher, query_params), result in zip(requests, built, results):
+            self._record(tool, cypher, query_params, result)
+
+        return results
+
+    def _pipeline(self, built: List[Tuple[str, Dict[str, Any]]]) -> List[QueryResult]:
+        """Send (cypher, params) pairs as one pipeline; results in order."""
+        if len(built) == 1:
+            return [self._query_uncached(*built[0])]
+
+        start_time = time.perf_counter()
+
+        try:
+            pipe = self.db.connection.pipeline(transaction=False)
+            for command in self._graph_query_commands(built):
+                pipe.execute_command(*command)
+            responses = pipe.execute(raise_on_error=False)
+        except Exception as e:
+            return self._batch_failure(built, e, (time.perf_counter() - start_time) * 1000)
+
+        total_ms = (time.perf_counter() - start_time) * 1000
+
+        parsed = []
+        for response in responses:
+            try:
+                parsed.append(response if isinstance(response, Exception)
+                              else FalkorQueryResult(self.graph, response))
+            except Exception as e:
+                parsed.append(e)
+
+        return self._batch_results(built, parsed, total_ms)
+
     # ========================================================================
     # THE 8 QUERY FUNCTIONS
     # ========================================================================
@@ -158,16 +1405,7 @@ class GraphTools:
             result = tools.query_partnerships("nicolas")
             # Returns partnership context: trust_level, communication_style, shared_history
         """
-        cypher = """
-        MATCH (p:Partnership {citizen: $citizen})
-        WHERE toLower(p.partner_name) = toLower($partner_id)
-        RETURN p
-        """
-
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "partner_id": partner_id
-        })
+        return self._execute_query(*self._build_query_partnerships(partner_id, citizen), tool="query_partnerships")
 
     def query_conversations(
         self,
@@ -192,30 +1430,7 @@ class GraphTools:
             result = tools.query_conversations("nicolas", ["race condition", "bug"])
             # Returns conversation history about race conditions
         """
-        if keywords:
-            # Filter by keywords
-            cypher = """
-            MATCH (conv:Conversation_Memory {citizen: $citizen, partner: $partner_id})
-            WHERE ANY(kw IN $keywords WHERE toLower(conv.topic) CONTAINS toLower(kw))
-            RETURN conv
-            ORDER BY conv.timestamp DESC
-            LIMIT $limit
-            """
-        else:
-            # No keywords - return all conversations with partner
-            cypher = """
-            MATCH (conv:Conversation_Memory {citizen: $citizen, partner: $partner_id})
-            RETURN conv
-            ORDER BY conv.timestamp DESC
-            LIMIT $limit
-            """
-
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "partner_id": partner_id,
-            "keywords": keywords or [],
-            "limit": limit
-        })
+        return self._execute_query(*self._build_query_conversations(partner_id, keywords, citizen, limit), tool="query_conversations")
 
     def query_technical_context(
         self,
@@ -240,34 +1455,37 @@ class GraphTools:
             result = tools.query_technical_context("stimulus_integrator", "race condition")
             # Returns technical context about race condition in stimulus_integrator
         """
-        if issue_type:
-            # Filter by issue type
-            cypher = """
-            MATCH (t:Technical_Context {citizen: $citizen})
-            WHERE (toLower(t.component) CONTAINS toLower($term)
-                   OR toLower(t.description) CONTAINS toLower($term))
-              AND toLower(t.issue_type) = toLower($issue_type)
-            RETURN t
-            ORDER BY t.updated_at DESC
-            LIMIT $limit
-            """
-        else:
-            # No issue type filter
-            cypher = """
-            MATCH (t:Technical_Context {citizen: $citizen})
-            WHERE toLower(t.component) CONTAINS toLower($term)
-               OR toLower(t.description) CONTAINS toLower($term)
-            RETURN t
-            ORDER BY t.updated_at DESC
-            LIMIT $limit
-            """
+        return self._execute_query(*self._build_query_technical_context(term, issue_type, citizen, limit), tool="query_technical_context")
 
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "term": term,
-            "issue_type": issue_type or "",
-            "limit": limit
-        })
+    def query_technical_context_many(
+        self,
+        terms: List[str],
+        issue_type: Optional[str] = None,
+        citizen: str = "felix",
+        limit: int = 5
+    ) -> QueryResult:
+        """
+        Find technical information matching any of several terms, in one query.
+
+        Each node comes back once, ranked by how many terms it matched, then
+        by recency (updated_at). result.matched_terms[i] lists the terms row i
+        matched.
+
+        Args:
+            terms: Search terms (duplicates, ignoring case, count once)
+            issue_type: Optional filter (e.g., "race condition")
+            citizen: AI citizen name
+            limit: Max results to return across all terms (default: 5)
+
+        Returns:
+            QueryResult containing list of Technical_Context nodes
+
+        Example:
+            result = tools.query_technical_context_many(["stimulus_integrator", "race condition"])
+            # Nodes matching both terms first; result.matched_terms says which hit
+        """
+        return self._execute_query(*self._build_query_technical_context_many(terms, issue_type, citizen, limit),
+                                   tool="query_technical_context_many")
 
     def query_emotional_state(
         self,
@@ -292,32 +1510,7 @@ class GraphTools:
             result = tools.query_emotional_state("bug recurrence", "frustration")
             # Returns emotional patterns for recurring bugs
         """
-        if emotion:
-            # Filter by specific emotion
-            cypher = """
-            MATCH (e:Emotional_State {citizen: $citizen})
-            WHERE toLower(e.context) CONTAINS toLower($context_similar_to)
-              AND toLower(e.emotion) = toLower($emotion)
-            RETURN e
-            ORDER BY e.intensity DESC
-            LIMIT $limit
-            """
-        else:
-            # No emotion filter
-            cypher = """
-            MATCH (e:Emotional_State {citizen: $citizen})
-            WHERE toLower(e.context) CONTAINS toLower($context_similar_to)
-            RETURN e
-            ORDER BY e.intensity DESC
-            LIMIT $limit
-            """
-
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "context_similar_to": context_similar_to,
-            "emotion": emotion or "",
-            "limit": limit
-        })
+        return self._execute_query(*self._build_query_emotional_state(context_similar_to, emotion, citizen, limit), tool="query_emotional_state")
 
     def query_strategy_patterns(
         self,
@@ -342,21 +1535,7 @@ class GraphTools:
             result = tools.query_strategy_patterns("race conditions", min_success_rate=0.7)
             # Returns strategies with >70% success for race conditions
         """
-        cypher = """
-        MATCH (s:Strategy_Pattern {citizen: $citizen})
-        WHERE toLower(s.applicability) CONTAINS toLower($situation_type)
-          AND s.success_rate >= $min_success_rate
-        RETURN s
-        ORDER BY s.success_rate DESC
-        LIMIT $limit
-        """
-
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "situation_type": situation_type,
-            "min_success_rate": min_success_rate,
-            "limit": limit
-        })
+        return self._execute_query(*self._build_query_strategy_patterns(situation_type, min_success_rate, citizen, limit), tool="query_strategy_patterns")
 
     def query_related_code(
         self,
@@ -381,29 +1560,7 @@ class GraphTools:
             result = tools.query_related_code("stimulus_integrator.py")
             # Returns code reference + files it depends on
         """
-        if include_dependencies:
-            # Return file + dependencies
-            cypher = """
-            MATCH (cr:Code_Reference {citizen: $citizen})
-            WHERE toLower(cr.file_path) CONTAINS toLower($filename)
-            OPTIONAL MATCH (cr)-[:DEPENDS_ON]->(dep:Code_Reference)
-            RETURN cr, collect(dep) AS dependencies
-            LIMIT $limit
-            """
-        else:
-            # Just the file
-            cypher = """
-            MATCH (cr:Code_Reference {citizen: $citizen})
-            WHERE toLower(cr.file_path) CONTAINS toLower($filename)
-            RETURN cr
-            LIMIT $limit
-            """
-
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "filename": filename,
-            "limit": limit
-        })
+        return self._execute_query(*self._build_query_related_code(filename, citizen, include_dependencies, limit), tool="query_related_code")
 
     def query_failed_attempts(
         self,
@@ -426,27 +1583,15 @@ class GraphTools:
             result = tools.query_failed_attempts("race condition")
             # Returns past failed attempts to fix race conditions
         """
-        cypher = """
-        MATCH (f:Failed_Attempt {citizen: $citizen})
-        WHERE toLower(f.context) CONTAINS toLower($context)
-           OR toLower(f.approach) CONTAINS toLower($context)
-        RETURN f
-        ORDER BY f.timestamp DESC
-        LIMIT $limit
-        """
-
-        return self._execute_query(cypher, {
-            "citizen": citizen,
-            "context": context,
-            "limit": limit
-        })
+        return self._execute_query(*self._build_query_failed_attempts(context, citizen, limit), tool="query_failed_attempts")
 
     def query_active_constraints(
         self,
         constraint_type: Optional[str] = None,
         min_severity: str = "medium",
         citizen: str = "felix",
-        limit: int = 10
+        limit: int = 10,
+        component: Optional[str] = None
     ) -> QueryResult:
         """
         Find active pressures and deadlines.
@@ -456,79 +1601,128 @@ class GraphTools:
             min_severity: Minimum severity ("low", "medium", "high", "critical")
             citizen: AI citizen name
             limit: Max results to return (default: 10)
+            component: Optional component; keeps only constraints whose
+                description mentions it (all qualifying ones if none do)
 
         Returns:
-            QueryResult containing list of Constraint nodes
+            QueryResult containing list of Constraint nodes, most severe first
 
         Example:
             result = tools.query_active_constraints("deadline", "critical")
             # Returns critical deadlines
         """
-        # Severity ranking
-        severity_rank = {
-            "low": 0,
-            "medium": 1,
-            "high": 2,
-            "critical": 3
-        }
+        return self._execute_query(*self._build_query_active_constraints(
+            constraint_type, min_severity, citizen, limit, component
+        ), tool="query_active_constraints")
 
-        min_rank = severity_rank.get(min_severity.lower(), 1)
+    # ========================================================================
+    # NEIGHBORHOOD + TERM VOCABULARY + CONTEXT BUNDLE
+    # ========================================================================
 
-        if constraint_type:
-            # Filter by type
-            cypher = """
-            MATCH (c:Constraint {citizen: $citizen, status: "active"})
-            WHERE toLower(c.constraint_type) = toLower($constraint_type)
-            RETURN c
-            ORDER BY
-                CASE c.severity
-                    WHEN 'critical' THEN 3
-                    WHEN 'high' THEN 2
-                    WHEN 'medium' THEN 1
-                    ELSE 0
-                END DESC,
-                c.deadline ASC
-            LIMIT $limit
-            """
-        else:
-            # No type filter
-            cypher = """
-            MATCH (c:Constraint {citizen: $citizen, status: "active"})
-            RETURN c
-            ORDER BY
-                CASE c.severity
-                    WHEN 'critical' THEN 3
-                    WHEN 'high' THEN 2
-                    WHEN 'medium' THEN 1
-                    ELSE 0
-                END DESC,
-                c.deadline ASC
-            LIMIT $limit
-            """
+    def query_neighborhood(
+        self,
+        sender: str,
+        citizen: str = "felix",
+        max_depth: int = 2,
+        limit: int = 200,
+        relationships: Optional[List[str]] = None
+    ) -> QueryResult:
+        """
+        Memories connected to the sender, by walking typed relationships.
 
-        # Filter results by severity in Python (since Cypher doesn't support dynamic WHERE on CASE)
-        result = self._execute_query(cypher, {
-            "citizen": citizen,
-            "constraint_type": constraint_type or "",
-            "limit": limit
-        })
+        Anchors on the sender's Partnership and Person nodes and follows
+        NEIGHBORHOOD_RELATIONSHIPS (either direction) up to max_depth hops.
+        Cost follows the size of the local neighborhood, not the number of
+        nodes per label.
 
-        if result.found and result.data:
-            # Filter by severity
-            data_list = result.data if isinstance(result.data, list) else [result.data]
-            filtered = [
-                item for item in data_list
-                if severity_rank.get(item.get('severity', 'low').lower(), 0) >= min_rank
-            ]
+        Args:
+            sender: Partner id (e.g., "nicolas")
+            citizen: AI citizen name
+            max_depth: Max hops from an anchor (default: 2)
+            limit: Max nodes returned, nearest first (default: 200)
+            relationships: Relationship types to follow (default: NEIGHBORHOOD_RELATIONSHIPS)
 
-            if filtered:
-                result.data = filtered if len(filtered) > 1 else filtered[0]
-            else:
-                result.found = False
-                result.data = None
-                result.confidence = 0.0
+        Returns:
+            QueryResult with rows {"label", "node", "depth"} (anchors have depth 0)
 
-        return result
+        Example:
+            result = tools.query_neighborhood("nicolas", max_depth=2)
+            # Partnership, Person, their Conversation_Memory nodes and the
+            # Technical_Context those conversations are about
+        """
+        return self._execute_query(*self._build_query_neighborhood(
+            sender, citizen, max_depth, limit, relationships
+        ), tool="query_neighborhood")
+
+    def query_term_vocabulary(self, citizen: str = "felix") -> QueryResult:
+        """
+        Component names and file paths the graph knows, for term extraction.
+
+        Args:
+            citizen: AI citizen name
+
+        Returns:
+            QueryResult with one row {"components": [...], "file_paths": [...]}
+            (distinct Technical_Context.component / Code_Reference.file_path)
+
+        Example:
+            result = tools.query_term_vocabulary()
+            # {"components": ["stimulus_integrator.py", ...],
+            #  "file_paths": ["orchestration/stimulus_integrator.py", ...]}
+        """
+        return self._execute_query(*self._build_query_term_vocabulary(citizen), tool="query_term_vocabulary")
+
+    def query_context_bundle(
+        self,
+        sender: str,
+        keywords: Optional[List[str]] = None,
+        terms: Optional[List[str]] = None,
+        citizen: str = "felix",
+        content: str = ""
+    ) -> Dict[str, LensPayload]:
+        """
+        Fetch the data for all 8 lenses in one Cypher statement (one round trip).
+
+        Each lens's payload lists the query function calls it answers, with the
+        same QueryResults those calls would return. Lenses that depend on other
+        lenses (emotional, strategic, ...) get their parameters derived in
+        Cypher from the technical and historical rows, the way the lenses
+        derive them. A lens with no payload request made no query.
+
+        Args:
+            sender: Partner id (relational/historical lenses)
+            keywords: Conversation topic keywords (historical lens)
+            terms: Technical terms, in priority order (technical lens)
+            citizen: AI citizen name
+            content: Stimulus text (fallback situation/context)
+
+        Returns:
+            Dict of lens name -> LensPayload (every payload carries the error
+            if the statement failed)
+
+        Example:
+            bundle = tools.query_context_bundle("nicolas", ["race"], ["race condition"])
+            bundle["relational"].results[0].data  # Partnership properties
+        """
+        cypher, params = self._build_context_bundle(sender, keywords, terms, citizen, content)
+        start_time = time.perf_counter()
+
+        try:
+            result = self.graph.query(cypher, params)
+        except Exception as e:
+            self._record("query_context_bundle", cypher, params, QueryResult(
+                found=False, data=None, confidence=0.0,
+                query_time_ms=(time.perf_counter() - start_time) * 1000, error=str(e)
+            ))
+            return self._bundle_failure(e)
+
+        query_time_ms = (time.perf_counter() - start_time) * 1000
+        payloads = self._bundle_payloads(self._bundle_row(result), params, query_time_ms)
+        if self.metrics is not None:
+            # One row per lens answer that found something
+            answers = [r.data for payload in payloads.values() for r in payload.results if r.found]
+            self._record("query_context_bundle", cypher, params, rows_to_query_result(answers, query_time_ms))
+        return payloads
 
 
 # ============================================================================
@@ -0,0 +1,87 @@
+"""
+Graph Version Counter
+
+Purpose: One integer per graph that every write path bumps
+Owner: Felix (Physics/Runtime Engineer)
+Version: 1.0
+Date: 2024-11-20
+
+Anything derived from graph data (query cache, upwelling cache, summaries)
+stores the version it was computed at and is stale once the version moves.
+
+The counter lives in FalkorDB itself (a plain Redis key next to the graph),
+so writers in any process invalidate readers in every process. Readers cache
+the value for check_interval_s to avoid a round trip per lookup; writes made
+through the same GraphVersion are visible immediately.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+
+
+# Redis key holding the version of a graph
+VERSION_KEY_PREFIX = "strange_loop:graph_version:"
+
+# How long a read version is trusted before re-reading (seconds)
+DEFAULT_CHECK_INTERVAL_S = 1.0
+
+
+def version_key(graph_name: str) -> str:
+    """Redis key for a graph's version counter."""
+    return f"{VERSION_KEY_PREFIX}{graph_name}"
+
+
+def bump_graph_version(connection: Any, graph_name: str) -> int:
+    """
+    Increment a graph's version after writing to it.
+
+    Args:
+        connection: Redis client (e.g. FalkorDB(...).connection)
+        graph_name: Graph that was written
+
+    Returns:
+        New version number
+    """
+    return int(connection.incr(version_key(graph_name)))
+
+
+class GraphVersion:
+    """
+    Cached reader (and bumper) of one graph's version counter.
+
+    Thread-safe. current() costs at most one GET per check_interval_s.
+    """
+
+    def __init__(self, connection: Any, graph_name: str, check_interval_s: float = DEFAULT_CHECK_INTERVAL_S):
+        """
+        Args:
+            connection: Redis client for the FalkorDB server
+            graph_name: Graph whose version is tracked
+            check_interval_s: Max age of the cached version (0 = always re-read)
+        """
+        self.connection = connection
+        self.graph_name = graph_name
+        self.check_interval_s = check_interval_s
+
+        self._version: Optional[int] = None
+        self._read_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> int:
+        """Current version (0 if the graph was never bumped)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._version is None or now - self._read_at >= self.check_interval_s:
+                raw = self.connection.get(version_key(self.graph_name))
+                self._version = int(raw) if raw is not None else 0
+                self._read_at = now
+            return self._version
+
+    def bump(self) -> int:
+        """Increment the version; visible to this reader immediately."""
+        version = bump_graph_version(self.connection, self.graph_name)
+        with self._lock:
+            self._version = version
+            self._read_at = time.monotonic()
+        return version
@@ -73,7 +73,7 @@ class ManualLoop:
         # Initialize components
         self.display = create_display(verbose=verbose, width=70)
         self.graph_tools = GraphTools(host=graph_host, port=graph_port)
-        self.dreamer = DreamerAgent(port=graph_port, citizen=citizen)
+        self.dreamer = DreamerAgent(port=graph_port, citizen=citizen, tools=self.graph_tools)
         # self.driver = DriverAgent()  # V1: Manual handoff, no automated driver
         
         # Track act results
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Dreamer Benchmark - Latency Percentiles Across Graph Sizes
+
+Purpose: Tell whether a change made Dreamer latency (our SLO) better or worse
+Owner: Victor "The Resurrector" (Operations)
+Version: 1.0
+Date: 2024-11-25
+
+For each graph size, runs a corpus of stimuli through:
+- explore:    LensExplorer.explore_all()
+- synthesize: synthesize_context_object() on those findings
+- dream:      DreamerAgent.dream() end to end
+and reports p50/p95/p99 per phase and per lens (Finding.query_time_ms),
+plus the round trips each exploration took.
+
+With --bundled the explore phase runs LensExplorer.explore_all_bundled()
+(one query_context_bundle statement) instead: run once without and once with
+--baseline to A/B it, over the stand-in to see the round trips it saves.
+--check-bundle first verifies, on every graph and on the graph/seed_data.py
+graph (memory/standin backends), that explore_all_bundled() finds exactly
+what explore_all() finds, in one round trip whenever the bundle answers
+every request.
+
+Graphs come from graph/synthetic.py (same seed = same graph):
+- --backend memory (default): InMemoryGraphTools over a synthetic snapshot,
+  no FalkorDB needed - measures the Python side (lenses, synthesis)
+- --backend falkordb: synthetic graphs written to FalkorDB, one graph per
+  size (strange_loop_bench_<size>), queried through GraphTools
+- --backend standin: GraphTools against graph/standin.py started in process,
+  with injected --rtt-ms/--command-ms/--jitter-ms - round-trip-sensitive
+  changes (pipelining, pooling) under WAN-like latency, no FalkorDB needed
+
+Results are written as JSON. With --baseline, every percentile is compared
+to a stored run and regressions beyond --threshold are flagged.
+
+Exit codes:
+- 0: No regression (or no baseline given)
+- 1: Regression against the baseline, or --check-bundle found a difference
+- 2: Benchmark could not run
+
+Usage:
+    python scripts/benchmark.py --sizes 1000,100000 --output bench.json
+    python scripts/benchmark.py --sizes 1000,100000 --baseline bench.json
+    python scripts/benchmark.py --backend falkordb --port 6380 --sizes 1000,100000,1000000
+    python scripts/benchmark.py --backend standin --rtt-ms 40 --jitter-ms 10 --sizes 1000
+    python scripts/benchmark.py --backend standin --rtt-ms 40 --sizes 1000 --output per_lens.json
+    python scripts/benchmark.py --backend standin --rtt-ms 40 --sizes 1000 --bundled --check-bundle \
+        --baseline per_lens.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, '/home/mind-protocol/strange-loop')
+
+from dreamer.lenses import LensExplorer, LENS_ORDER
+from dreamer.synthesis import synthesize_context_object
+from dreamer.agent import DreamerAgent, Stimulus
+from graph.memory_tools import GraphSnapshot, InMemoryGraphTools
+from graph.seed_data import SEED_NODES, SEED_RELATIONSHIPS
+from graph.synthetic import SyntheticConfig, SyntheticGraph, generate
+from graph.standin import LatencyProfile, StandInServer
+
+
+# Reported percentiles
+PERCENTILES = (50, 95, 99)
+
+# Regression rule: slower than baseline by more than threshold AND min_delta_ms
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_MIN_DELTA_MS = 0.5
+
+# Stimuli corpus: B01 plus variations over the synthetic vocabulary
+DEFAULT_CORPUS = [
+    {"sender": "nicolas", "content": "The stimulus_integrator race condition is back. Third time this month."},
+    {"sender": "nicolas", "content": "Can you look at the memory leak in working_memory before the launch deadline?"},
+    {"sender": "ada", "content": "graph_physics tests are flaky again, timeout on CI"},
+    {"sender": "yann", "content": "How is the deadlock in falkordb_pool going?"},
+    {"sender": "sofia", "content": "Performance regression in traversal after the last refactor"},
+    {"sender": "nicolas", "content": "hey, quick question about the schema drift in session_store"},
+    {"sender": "unknown_partner", "content": "Hello, who is working on the energy_diffusion module?"},
+    {"sender": "mira", "content": "data corruption in link_strengthener, we need a fix today"},
+]
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+def percentile(values: List[float], p: float) -> float:
+    """p-th percentile with linear interpolation between closest ranks."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Percentiles, mean and count of a latency sample (ms)."""
+    summary = {f"p{p}": round(percentile(values, p), 3) for p in PERCENTILES}
+    summary["mean"] = round(sum(values) / len(values), 3) if values else 0.0
+    summary["count"] = len(values)
+    return summary
+
+
+@dataclass
+class Samples:
+    """Raw latencies (ms) for one graph size."""
+    phases: Dict[str, List[float]] = field(default_factory=dict)
+    lenses: Dict[str, List[float]] = field(default_factory=dict)
+    round_trips: List[float] = field(default_factory=list)
+    failures: int = 0
+
+    def add(self, group: Dict[str, List[float]], name: str, value_ms: float):
+        group.setdefault(name, []).append(value_ms)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "phases": {name: summarize(values) for name, values in self.phases.items()},
+            "lenses": {name: summarize(self.lenses[name]) for name in LENS_ORDER if name in self.lenses},
+            "round_trips": summarize(self.round_trips),
+            "failures": self.failures
+        }
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _timed(fn: Callable) -> tuple:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_size(tools, corpus: List[Dict], iterations: int, warmup: int, speculative: bool = False,
+             bundled: bool = False) -> Samples:
+    """Run the corpus `warmup + iterations` times against one graph."""
+    explorer = LensExplorer(tools=tools, speculative=speculative)
+    explore = explorer.explore_all_bundled if bundled else explorer.explore_all
+    dreamer = DreamerAgent(tools=tools, speculative=speculative)
+    samples = Samples()
+
+    for i in range(warmup + iterations):
+        measure = i >= warmup
+        for entry in corpus:
+            stimulus = Stimulus(sender=entry["sender"], content=entry["content"], channel="benchmark")
+            stimulus_dict = stimulus.to_dict()
+
+            exploration, explore_ms = _timed(lambda: explore(stimulus_dict))
+            _, synthesize_ms = _timed(lambda: synthesize_context_object(exploration.findings, stimulus_dict))
+            upwelling, dream_ms = _timed(lambda: dreamer.dream(stimulus))
+
+            if not measure:
+                continue
+            if not exploration.success or not upwelling.success:
+                samples.failures += 1
+
+            samples.add(samples.phases, "explore", explore_ms)
+            samples.add(samples.phases, "synthesize", synthesize_ms)
+            samples.add(samples.phases, "dream", dream_ms)
+            samples.round_trips.append(exploration.round_trips)
+            for lens, finding in exploration.findings.items():
+                samples.add(samples.lenses, lens, finding.query_time_ms)
+
+    return samples
+
+
+def _finding_key(finding: Optional[Any]) -> tuple:
+    """What a lens found, without its timing."""
+    if finding is None:
+        return ()
+    return (finding.lens, finding.data, finding.synthesis, finding.confidence,
+            finding.needs_deeper_exploration, finding.related_findings, finding.timed_out, finding.error)
+
+
+def check_bundle(tools, corpus: List[Dict], name: str) -> List[str]:
+    """
+    Problems with bundled exploration on one graph: explore_all_bundled()
+    must find what explore_all() finds, and take one round trip when the
+    bundle answers every request (replay() on its answers succeeds).
+    """
+    explorer = LensExplorer(tools=tools)
+    problems, consistent, one_trip = [], 0, 0
+
+    for entry in corpus:
+        stimulus = Stimulus(sender=entry["sender"], content=entry["content"], channel="benchmark").to_dict()
+        expected = explorer.explore_all(stimulus)
+        bundled = explorer.explore_all_bundled(stimulus)
+        label = f"{name}: {entry['sender']}: \"{entry['content'][:40]}\""
+
+        differing = [lens for lens in LENS_ORDER
+                     if _finding_key(expected.findings.get(lens)) != _finding_key(bundled.findings.get(lens))]
+        if [_finding_key(f) for f in expected.threads] != [_finding_key(f) for f in bundled.threads]:
+            differing.append("threads")
+        if differing:
+            problems.append(f"{label}: bundled findings differ ({', '.join(differing)})")
+        else:
+            consistent += 1
+
+        answers = {tools.request_key(*request): result for request, result in explorer.bundle_answers(stimulus)}
+        if explorer.replay(stimulus, answers) is not None:
+            one_trip += 1
+            if bundled.round_trips != 1:
+                problems.append(f"{label}: bundle answers every request, "
+                                f"but took {bundled.round_trips} round trips")
+
+    status = "✗" if problems else "✓"
+    print(f"  {status} bundle check ({name}): {consistent}/{len(corpus)} stimuli identical, "
+          f"{one_trip} answered in one round trip")
+    return problems
+
+
+def build_tools(backend: str, size: int, args, standin: StandInServer = None) -> tuple:
+    """Tools over a synthetic graph of ~size nodes: (tools, actual node count)."""
+    config = SyntheticConfig.for_nodes(size, args.citizens, args.partners, seed=args.seed)
+    graph_name = f"strange_loop_bench_{size}"
+
+    if backend == "memory":
+        tools = InMemoryGraphTools(SyntheticGraph(config).snapshot(graph_name))
+        return tools, len(tools)
+
+    from graph.tools import GraphTools
+
+    if backend == "standin":
+        snapshot = SyntheticGraph(config).snapshot(graph_name)
+        standin.add_graph(snapshot)
+        return GraphTools(host=standin.host, port=standin.port, graph_name=graph_name), len(snapshot.nodes)
+
+    if not args.reuse:
+        generate(config, args.host, args.port, graph_name)
+    return GraphTools(host=args.host, port=args.port, graph_name=graph_name), config.node_count
+
+
+def seed_tools(backend: str, standin: StandInServer = None):
+    """Tools over the graph/seed_data.py graph (memory or stand-in backend)."""
+    snapshot = GraphSnapshot.from_records(SEED_NODES, SEED_RELATIONSHIPS)
+    if backend == "memory":
+        return InMemoryGraphTools(snapshot)
+
+    from graph.tools import GraphTools
+
+    standin.add_graph(snapshot, "strange_loop_bench_seed")
+    return GraphTools(host=standin.host, port=standin.port, graph_name="strange_loop_bench_seed")
+
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[Dict[str, Any]]:
+    """
+    Percentiles slower than the baseline by more than threshold (relative)
+    and min_delta_ms (absolute). Sizes/metrics missing on either side are skipped.
+    """
+    regressions = []
+    for size, result in current["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if base is None:
+            continue
+        for group in ("phases", "lenses"):
+            for name, stats in result[group].items():
+                base_stats = base.get(group, {}).get(name)
+                if base_stats is None:
+                    continue
+                for p in PERCENTILES:
+                    key = f"p{p}"
+                    now, before = stats[key], base_stats.get(key, 0.0)
+                    if now - before > min_delta_ms and now > before * (1 + threshold):
+                        regressions.append({
+                            "size": size, "group": group, "name": name, "percentile": key,
+                            "baseline_ms": before, "current_ms": now,
+                            "change": round(now / before - 1, 3) if before else None
+                        })
+    return regressions
+
+
+def print_report(report: Dict):
+    for size, result in report["sizes"].items():
+        print(f"\n=== {size} nodes (requested) / {result['nodes']} nodes (actual) ===")
+        print(f"  {'':<14}" + "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'mean':>10}")
+        for group in ("phases", "lenses"):
+            for name, stats in result[group].items():
+                print(f"  {name:<14}" + "".join(f"{stats[f'p{p}']:>10.3f}" for p in PERCENTILES)
+                      + f"{stats['mean']:>10.3f}")
+        trips = result["round_trips"]
+        print(f"  {'round trips':<14}" + "".join(f"{trips[f'p{p}']:>10.1f}" for p in PERCENTILES)
+              + f"{trips['mean']:>10.1f}")
+        if result["failures"]:
+            print(f"  WARNING: {result['failures']} failed explorations/dreams")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Dreamer latency benchmark across graph sizes")
+    parser.add_argument("--backend", choices=("memory", "falkordb", "standin"), default="memory",
+                        help="InMemoryGraphTools (no server), FalkorDB, or the local FalkorDB stand-in")
+    parser.add_argument("--host", default="localhost", help="FalkorDB host")
+    parser.add_argument("--port", type=int, default=6380, help="FalkorDB port")
+    parser.add_argument("--sizes", default="1000,100000", help="Comma-separated graph sizes (nodes)")
+    parser.add_argument("--citizens", type=int, default=1, help="Citizens per synthetic graph")
+    parser.add_argument("--partners", type=int, default=16, help="Partners per citizen")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic graph seed")
+    parser.add_argument("--reuse", action="store_true", help="FalkorDB: reuse existing bench graphs")
+    parser.add_argument("--rtt-ms", type=float, default=0.0, help="Stand-in: round trip per burst of commands")
+    parser.add_argument("--command-ms", type=float, default=0.0, help="Stand-in: server time per command")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Stand-in: random extra delay per burst (max)")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Start the technical lens alongside historical (see LensExplorer)")
+    parser.add_argument("--bundled", action="store_true",
+                        help="Explore with one context bundle statement (explore_all_bundled)")
+    parser.add_argument("--check-bundle", action="store_true",
+                        help="First check explore_all_bundled() against explore_all() (exit 1 on a difference)")
+    parser.add_argument("--corpus", help="JSON file with a list of {sender, content} stimuli")
+    parser.add_argument("--iterations", type=int, default=5, help="Measured passes over the corpus")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured passes first")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", help="Report JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown flagged as regression (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this (ms)")
+    args = parser.parse_args()
+
+    corpus = DEFAULT_CORPUS
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = json.load(f)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "backend": args.backend,
+            "python": platform.python_version(),
+            "corpus_size": len(corpus),
+            "iterations": args.iterations,
+            "bundled": args.bundled,
+            "seed": args.seed,
+            "latency": {"rtt_ms": args.rtt_ms, "command_ms": args.command_ms, "jitter_ms": args.jitter_ms}
+            if args.backend == "standin" else None
+        },
+        "sizes": {}
+    }
+
+    standin = None
+    problems = []
+    try:
+        if args.backend == "standin":
+            latency = LatencyProfile(args.rtt_ms, args.command_ms, args.jitter_ms, args.seed)
+            standin = StandInServer(port=0, latency=latency).start()
+        if args.check_bundle and args.backend != "falkordb":
+            print("\n[BENCH] bundle check on the seed graph")
+            problems += check_bundle(seed_tools(args.backend, standin), corpus, "seed")
+        for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            print(f"\n[BENCH] {size} nodes ({args.backend})")
+            tools, nodes = build_tools(args.backend, size, args, standin)
+            if args.check_bundle:
+                problems += check_bundle(tools, corpus, str(size))
+            samples = run_size(tools, corpus, args.iterations, args.warmup, args.speculative, args.bundled)
+            report["sizes"][str(size)] = {"nodes": nodes, **samples.report()}
+    except Exception as e:
+        print(f"\n✗ Benchmark failed: {e}")
+        if args.backend == "falkordb":
+            print("\nMake sure FalkorDB is running:")
+            print(f"  docker run -p {args.port}:6379 falkordb/falkordb")
+        sys.exit(2)
+    finally:
+        if standin is not None:
+            standin.stop()
+
+    print_report(report)
+
+    exit_code = 0
+    if problems:
+        exit_code = 1
+        report["bundle_problems"] = problems
+        print("\n" + "-" * 60)
+        print("BUNDLE CHECK FAILED:")
+        for problem in problems:
+            print(f"  [FAIL] {problem}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        report["regressions"] = regressions
+
+        print("\n" + "-" * 60)
+        if regressions:
+            exit_code = 1
+            print(f"REGRESSIONS vs {args.baseline}:")
+            for r in regressions:
+                print(f"  [FAIL] {r['size']} {r['group']}/{r['name']} {r['percentile']}: "
+                      f"{r['baseline_ms']:.3f}ms -> {r['current_ms']:.3f}ms")
+        else:
+            print(f"✓ No regressions vs {args.baseline} (threshold {args.threshold:.0%})")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
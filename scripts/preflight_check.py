@@ -12,8 +12,10 @@ Checks:
 - Graph "strange_loop" exists
 - Seed data present (11 nodes, 12 relationships expected)
 - Node type distribution
+- Derived properties backfilled (python graph/migrations.py)
 - Query latency baseline (<100ms)
 - All 8 query functions operational
+- Query plans use the graph/schema.cypher indices (warning only)
 
 Exit codes:
 - 0: All checks passed
@@ -109,8 +111,10 @@ class PreflightChecker:
                 self._check_seed_data()
                 self._check_node_types()
                 self._check_relationships()
+                self._check_migrations()
                 self._check_query_latency()
                 self._check_query_functions()
+                self._check_query_plans()
 
         return self._summarize_results()
 
@@ -316,6 +320,46 @@ class PreflightChecker:
             ))
             print(f"  [FAIL] Query failed: {e}")
 
+    def _check_migrations(self):
+        """Check no node misses a derived property the queries filter on."""
+        check_name = "Migrations (derived properties)"
+        print(f"\n[CHECK] {check_name}")
+
+        try:
+            from graph.migrations import MIGRATION_COMMAND, pending_migrations
+
+            pending = pending_migrations(self.graph)
+            for name, count in pending.items():
+                print(f"  Missing {name}: {count} nodes")
+
+            passed = not pending
+            message = ("All derived properties present" if passed else
+                       f"{sum(pending.values())} nodes need migrating - "
+                       f"queries filtering on their derived properties won't find them")
+
+            self.results.append(CheckResult(
+                name=check_name,
+                passed=passed,
+                message=message,
+                details={'pending': pending},
+                is_critical=True  # Lenses silently return "not found"
+            ))
+
+            status = "[PASS]" if passed else "[FAIL]"
+            print(f"  {status} {message}")
+            if not passed:
+                print(f"  Run: {MIGRATION_COMMAND} {self.host} {self.port} {self.graph_name}")
+
+        except Exception as e:
+            self.results.append(CheckResult(
+                name=check_name,
+                passed=False,
+                message=f"Migration check failed: {e}",
+                details={'error': str(e)},
+                is_critical=True
+            ))
+            print(f"  [FAIL] Migration check failed: {e}")
+
     def _check_query_latency(self):
         """Check baseline query latency."""
         check_name = "Query Latency Baseline"
@@ -455,6 +499,54 @@ class PreflightChecker:
             ))
             print(f"  [FAIL] Error: {e}")
 
+    def _check_query_plans(self):
+        """Check the query templates use indices (GRAPH.EXPLAIN, no writes)."""
+        check_name = "Query Plans (schema.cypher indices)"
+        print(f"\n[CHECK] {check_name}")
+
+        try:
+            from graph.query_plans import check_query_plans, missing_indices
+
+            missing = missing_indices(self.graph)["range"]
+            for label, prop in missing:
+                print(f"  Missing index: {label}.{prop}")
+
+            reports = check_query_plans(self.db, self.graph_name)
+            degraded = [r for r in reports if not r.ok]
+            for report in degraded:
+                scans = report.label_scans or [report.error]
+                print(f"  {report.status}: {report.name} ({'; '.join(scans)})")
+
+            passed = not missing and not degraded
+            message = (f"{len(reports) - len(degraded)}/{len(reports)} templates use indices, "
+                       f"{len(missing)} missing indices")
+
+            self.results.append(CheckResult(
+                name=check_name,
+                passed=passed,
+                message=message,
+                details={
+                    'missing_indices': [f"{label}.{prop}" for label, prop in missing],
+                    'degraded_templates': [r.name for r in degraded]
+                },
+                is_critical=False  # Full scans are slow, not wrong
+            ))
+
+            status = "[PASS]" if passed else "[WARN]"
+            print(f"  {status} {message}")
+            if not passed:
+                print(f"  Create missing indices: python graph/query_plans.py {self.host} {self.port} {self.graph_name}")
+
+        except Exception as e:
+            self.results.append(CheckResult(
+                name=check_name,
+                passed=False,
+                message=f"Plan check failed: {e}",
+                details={'error': str(e)},
+                is_critical=False
+            ))
+            print(f"  [WARN] Plan check failed: {e}")
+
     def _summarize_results(self) -> Tuple[bool, bool]:
         """
         Summarize all check results.